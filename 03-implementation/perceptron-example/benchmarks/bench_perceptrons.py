@@ -0,0 +1,190 @@
+"""
+Benchmarks for the training and inference hot paths.
+
+Times fit and predict of both perceptron classes across dataset sizes, layer
+widths, depths and dtypes, and run_experiment end to end. Timings are compared
+against a local baseline (benchmarks/baseline.json); the script exits with
+status 1 when a benchmark is slower than the baseline by more than the
+threshold.
+
+    python benchmarks/bench_perceptrons.py --save-baseline  # record a baseline
+    python benchmarks/bench_perceptrons.py                  # compare to the baseline
+    python benchmarks/bench_perceptrons.py -k "mlp.fit"     # a subset
+
+Baselines are only comparable on the machine they were recorded on, so they
+are not committed: record one before a change and compare after it.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import numpy as np
+from typing import Any, Callable, Dict, Optional
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.single_layer_perceptron import SingleLayerPerceptron
+from src.multi_layer_perceptron import MultiLayerPerceptron
+from src.data_utils import generate_logic_gate_data
+from src.evaluation import run_experiment
+from src.profiling import FitProfiler
+from src.benchmark import (compare_to_baseline, format_report, format_time, load_baseline,
+                           run_benchmarks, save_baseline)
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+DTYPES = (np.float32, np.float64)
+N_FEATURES = 8
+FIT_EPOCHS = 10
+
+
+def _training_data(n_samples: int, n_features: int, dtype: type):
+    """
+    Random training data that no model can fit perfectly.
+
+    Every input appears twice with opposite labels, so accuracy never reaches
+    100% and early stopping never shortens a timed fit.
+    """
+    rng = np.random.default_rng(0)
+    X = rng.standard_normal((n_samples // 2, n_features)).astype(dtype)
+    y = rng.integers(0, 2, n_samples // 2).astype(dtype)
+    return np.vstack([X, X]), np.concatenate([y, 1 - y])
+
+
+def _slp_fit(n_samples: int, dtype: type, update_rule: str) -> Callable[[], Any]:
+    X, y = _training_data(n_samples, N_FEATURES, dtype)
+    # A fresh model per call, so that every call trains the same epochs from the
+    # same initial state (refitting one model would keep extending its history)
+    return lambda: SingleLayerPerceptron(N_FEATURES, random_seed=0, update_rule=update_rule,
+                                         dtype=dtype).fit(X, y, epochs=FIT_EPOCHS)
+
+
+def _slp_predict(n_samples: int, dtype: type) -> Callable[[], Any]:
+    X, _ = _training_data(n_samples, N_FEATURES, dtype)
+    model = SingleLayerPerceptron(N_FEATURES, random_seed=0, dtype=dtype)
+    return lambda: model.predict(X)
+
+
+def _mlp_layers(width: int, depth: int) -> list:
+    return [N_FEATURES] + [width] * depth + [1]
+
+
+def _mlp_fit(n_samples: int, width: int, depth: int, dtype: type,
+             batch_size: Optional[int] = None, profiled: bool = False) -> Callable[[], Any]:
+    X, y = _training_data(n_samples, N_FEATURES, dtype)
+    layer_sizes = _mlp_layers(width, depth)
+    profiler = FitProfiler() if profiled else None
+    # A fresh model per call, as in _slp_fit
+    return lambda: MultiLayerPerceptron(layer_sizes, random_seed=0, dtype=dtype).fit(
+        X, y, epochs=FIT_EPOCHS, batch_size=batch_size, profiler=profiler)
+
+
+def _mlp_predict(n_samples: int, width: int, depth: int, dtype: type) -> Callable[[], Any]:
+    X, _ = _training_data(n_samples, N_FEATURES, dtype)
+    model = MultiLayerPerceptron(_mlp_layers(width, depth), random_seed=0, dtype=dtype)
+    return lambda: model.predict(X)
+
+
+def _run_experiment(model_class: type, model_params: dict, batched: bool) -> Callable[[], Any]:
+    X, y = generate_logic_gate_data('XOR')
+    return lambda: run_experiment(model_class, model_params, X, y, X, y, {'epochs': 500},
+                                  n_runs=10, batched=batched)
+
+
+def _bind(factory: Callable[..., Callable[[], Any]], *args: Any) -> Callable[[], Callable[[], Any]]:
+    return lambda: factory(*args)
+
+
+def build_suite() -> Dict[str, Callable[[], Callable[[], Any]]]:
+    """All benchmarks by name, in the order they are run."""
+    suite = {}
+    for n, dtype in itertools.product((64, 4096, 65536), DTYPES):
+        suite[f'slp.fit[batch-n={n}-{np.dtype(dtype).name}]'] = _bind(_slp_fit, n, dtype, 'batch')
+    # Rosenblatt's rule updates after every sample, a Python-level loop
+    for n, dtype in itertools.product((64, 1024), DTYPES):
+        suite[f'slp.fit[online-n={n}-{np.dtype(dtype).name}]'] = _bind(_slp_fit, n, dtype, 'online')
+    for n, dtype in itertools.product((4096, 262144), DTYPES):
+        suite[f'slp.predict[n={n}-{np.dtype(dtype).name}]'] = _bind(_slp_predict, n, dtype)
+
+    for n, width, depth, dtype in itertools.product((64, 4096), (8, 64), (1, 3), DTYPES):
+        name = f'n={n}-width={width}-depth={depth}-{np.dtype(dtype).name}'
+        suite[f'mlp.fit[{name}]'] = _bind(_mlp_fit, n, width, depth, dtype)
+    for dtype in DTYPES:
+        suite[f'mlp.fit[minibatch=256-n=4096-width=64-depth=1-{np.dtype(dtype).name}]'] = \
+            _bind(_mlp_fit, 4096, 64, 1, dtype, 256)
+    # Overhead of the per-phase profiler on small, call-bound epochs
+    suite['mlp.fit[profiled-n=64-width=8-depth=1-float64]'] = \
+        _bind(_mlp_fit, 64, 8, 1, np.float64, None, True)
+    for n, width, depth, dtype in itertools.product((4096, 262144), (8, 64), (1, 3), DTYPES):
+        name = f'n={n}-width={width}-depth={depth}-{np.dtype(dtype).name}'
+        suite[f'mlp.predict[{name}]'] = _bind(_mlp_predict, n, width, depth, dtype)
+
+    suite['run_experiment[slp-xor]'] = _bind(_run_experiment, SingleLayerPerceptron, {}, False)
+    suite['run_experiment[mlp-xor]'] = _bind(
+        _run_experiment, MultiLayerPerceptron, {'layer_sizes': [2, 4, 1]}, False)
+    suite['run_experiment[mlp-xor-batched]'] = _bind(
+        _run_experiment, MultiLayerPerceptron, {'layer_sizes': [2, 4, 1]}, True)
+    return suite
+
+
+def main(argv=None) -> int:
+    """Run the benchmarks and compare them with (or store them as) the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', dest='pattern', default=None,
+                        help='regular expression selecting the benchmarks to run')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='number of timed repeats per benchmark')
+    parser.add_argument('--min-time', type=float, default=0.05,
+                        help='minimum duration of one repeat in seconds')
+    parser.add_argument('--baseline', default=BASELINE_PATH,
+                        help='baseline file to compare with or to write')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='slowdown ratio above which a benchmark is a regression')
+    parser.add_argument('--save-baseline', action='store_true',
+                        help='store the timings as the new baseline')
+    parser.add_argument('--list', action='store_true', help='list the benchmarks and exit')
+    args = parser.parse_args(argv)
+
+    suite = build_suite()
+    if args.list:
+        print('\n'.join(suite))
+        return 0
+
+    baseline = None
+    if not args.save_baseline and os.path.exists(args.baseline):
+        baseline = load_baseline(args.baseline)
+
+    width = max(len(name) for name in suite)
+
+    def progress(name: str, timing: Dict[str, float]) -> None:
+        print(next(iter(format_report({name: timing}, baseline, width))), flush=True)
+
+    results = run_benchmarks(suite, args.pattern, args.repeat, args.min_time, progress)
+    if not results:
+        print(f"No benchmark matches {args.pattern!r}")
+        return 1
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results)
+        print(f"\nStored {len(results)} baseline timings in {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, args.threshold)
+    if not regressions:
+        print(f"\nNo regressions (threshold {args.threshold:.2f}x)")
+        return 0
+    print(f"\n{len(regressions)} regression(s) above {args.threshold:.2f}x:")
+    for name, before, after, ratio in regressions:
+        print(f"  {name}: {format_time(before)} -> {format_time(after)} ({ratio:.2f}x)")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,14 +7,29 @@ to investigate the XOR problem and test our research hypotheses.
 
 from .single_layer_perceptron import SingleLayerPerceptron
 from .multi_layer_perceptron import MultiLayerPerceptron
-from .data_utils import generate_logic_gate_data, visualize_decision_boundary
+from .ensemble import MLPEnsemble, average_parameters
+from .data_utils import (generate_logic_gate_data, generate_boolean_data, generate_parity_data,
+                         iter_boolean_data, visualize_decision_boundary,
+                         visualize_decision_boundaries)
 from .evaluation import evaluate_model, run_experiment
+from .history import TrainingHistory
+from .profiling import FitProfiler
+from .sequential import SequentialTest
 
 __all__ = [
     'SingleLayerPerceptron',
     'MultiLayerPerceptron',
+    'MLPEnsemble',
+    'average_parameters',
     'generate_logic_gate_data',
+    'generate_boolean_data',
+    'generate_parity_data',
+    'iter_boolean_data',
     'visualize_decision_boundary',
+    'visualize_decision_boundaries',
     'evaluate_model',
-    'run_experiment'
+    'run_experiment',
+    'TrainingHistory',
+    'FitProfiler',
+    'SequentialTest'
 ]
@@ -0,0 +1,242 @@
+"""
+Decision-Boundary Animation over Training
+
+Renders the weight snapshots recorded by ``SingleLayerPerceptron.fit`` as an
+animation. All snapshots are evaluated on the decision mesh in vectorized
+blocks (the weight history stacked into a matrix), a single figure is updated
+by redrawing only its animated artists over a cached background (blitting),
+and every frame is streamed to a writer as soon as it is drawn, so memory use
+does not grow with the number of epochs.
+"""
+
+import os
+import shutil
+import subprocess
+import numpy as np
+from collections.abc import Mapping
+from typing import Any, Iterator, Tuple, Union
+
+from .data_utils import DEFAULT_BOUNDS, DEFAULT_STEP, decision_mesh
+
+
+class PNGFrameWriter:
+    """Writes every frame as a numbered PNG file in a directory."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.n_frames = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, frame: np.ndarray) -> None:
+        """Write one RGBA frame of shape (height, width, 4)."""
+        from PIL import Image
+
+        # Fast compression: encoding, not drawing, dominates at higher levels
+        Image.fromarray(frame, 'RGBA').save(
+            os.path.join(self.directory, f"frame_{self.n_frames:06d}.png"), compress_level=1)
+        self.n_frames += 1
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> 'PNGFrameWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class FFmpegFrameWriter:
+    """Pipes raw RGBA frames to an ffmpeg process encoding a video file."""
+
+    def __init__(self, path: str, size: Tuple[int, int], fps: int = 30):
+        """
+        Start the encoder.
+
+        Args:
+            path: Output video path (the format follows its extension)
+            size: Frame (width, height) in pixels
+            fps: Frames per second
+        """
+        executable = shutil.which('ffmpeg')
+        if executable is None:
+            raise RuntimeError("ffmpeg is required to write video files; "
+                               "pass a directory to write PNG frames instead")
+        width, height = size
+        self.n_frames = 0
+        self._process = subprocess.Popen(
+            [executable, '-y', '-loglevel', 'error',
+             '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(fps),
+             '-i', '-',
+             # Even dimensions are required by yuv420p, the widely playable format
+             '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', path],
+            stdin=subprocess.PIPE)
+
+    def write(self, frame: np.ndarray) -> None:
+        """Write one RGBA frame of shape (height, width, 4)."""
+        self._process.stdin.write(np.ascontiguousarray(frame).tobytes())
+        self.n_frames += 1
+
+    def close(self) -> None:
+        self._process.stdin.close()
+        if self._process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {self._process.returncode}")
+
+    def __enter__(self) -> 'FFmpegFrameWriter':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _snapshots(source: Union[Mapping, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Stack the recorded weights, biases and epoch indices of a model or history."""
+    history = source if isinstance(source, Mapping) else source.history
+    if not len(history.get('weights', [])):
+        raise ValueError("The history contains no weight snapshots")
+    weights = np.asarray(history['weights'], dtype=float)
+    biases = np.asarray(history['bias'], dtype=float)
+    # A strided TrainingHistory records the index of every snapshot
+    epochs = np.asarray(history.get('epochs', np.arange(len(weights))))
+    return weights, biases, epochs
+
+
+def boundary_frames(weights: np.ndarray, biases: np.ndarray,
+                    bounds: Tuple[float, float, float, float] = DEFAULT_BOUNDS,
+                    step: float = DEFAULT_STEP,
+                    frames_per_batch: int = 64) -> Iterator[np.ndarray]:
+    """
+    Evaluate linear decision functions on the decision mesh, block by block.
+
+    Each block of snapshots is one matrix product grid @ W.T, so only
+    frames_per_batch mesh evaluations are held at a time.
+
+    Args:
+        weights: Weight snapshots of shape (n_frames, 2)
+        biases: Bias snapshots of shape (n_frames,)
+        bounds: (x_min, x_max, y_min, y_max) of the plotted region
+        step: Distance between neighbouring mesh points
+        frames_per_batch: Number of snapshots evaluated per matrix product
+
+    Yields:
+        Binary predictions on the mesh, one (ny, nx) array per snapshot
+    """
+    xx, _, grid = decision_mesh(tuple(bounds), step)
+    for start in range(0, len(weights), frames_per_batch):
+        block = slice(start, start + frames_per_batch)
+        Z = (grid @ weights[block].T + biases[block] > 0).T
+        for frame in Z:
+            yield frame.reshape(xx.shape)
+
+
+def _boundary_line(w: np.ndarray, b: float,
+                   bounds: Tuple[float, float, float, float]) -> Tuple[list, list]:
+    """End points of the line w·x + b = 0 across the plotted region."""
+    x_min, x_max, y_min, y_max = bounds
+    if abs(w[1]) >= abs(w[0]) and w[1] != 0:
+        xs = [x_min, x_max]
+        return xs, [-(w[0] * x + b) / w[1] for x in xs]
+    if w[0] != 0:
+        ys = [y_min, y_max]
+        return [-(w[1] * y + b) / w[0] for y in ys], ys
+    return [], []
+
+
+def animate_training(source: Union[Mapping, Any],
+                     X: np.ndarray,
+                     y: np.ndarray,
+                     save_path: str,
+                     fps: int = 30,
+                     stride: int = 1,
+                     title: str = "Decision Boundary during Training",
+                     figsize: Tuple[float, float] = (6, 5),
+                     dpi: int = 100,
+                     bounds: Tuple[float, float, float, float] = DEFAULT_BOUNDS,
+                     step: float = DEFAULT_STEP,
+                     frames_per_batch: int = 64) -> int:
+    """
+    Animate the decision boundary of a single-layer perceptron over training.
+
+    Args:
+        source: Trained SingleLayerPerceptron or its history (dictionary or
+            TrainingHistory recording the weights and bias)
+        X: Input data points (2 features)
+        y: Target labels
+        save_path: Video file (encoded with ffmpeg), or a directory without a
+            file extension to receive numbered PNG frames
+        fps: Frames per second of the video
+        stride: Render every stride-th recorded snapshot (the last is always included)
+        title: Plot title
+        figsize: Figure size in inches
+        dpi: Resolution of the frames
+        bounds: (x_min, x_max, y_min, y_max) of the plotted region
+        step: Distance between neighbouring mesh points
+        frames_per_batch: Number of snapshots evaluated per matrix product
+
+    Returns:
+        Number of frames written
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    weights, biases, recorded_epochs = _snapshots(source)
+    rows = np.arange(0, len(weights), stride)
+    if rows[-1] != len(weights) - 1:
+        rows = np.append(rows, len(weights) - 1)
+    weights, biases, epochs = weights[rows], biases[rows], recorded_epochs[rows]
+
+    # One figure for the whole animation; the Agg canvas needs no display
+    fig = Figure(figsize=figsize, dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    x_min, x_max, y_min, y_max = bounds
+
+    # The two class colors are looked up into a reused RGBA buffer, which is
+    # cheaper to draw than colormapping a float image on every frame
+    import matplotlib
+    colors = np.round(matplotlib.colormaps['RdYlBu']([0.0, 1.0], alpha=0.3) * 255).astype(np.uint8)
+    mesh_shape = decision_mesh(tuple(bounds), step)[0].shape
+    pixels = np.zeros(mesh_shape + (4,), dtype=np.uint8)
+    region = ax.imshow(pixels, extent=bounds, origin='lower', aspect='auto',
+                       interpolation='nearest', animated=True)
+    line, = ax.plot([], [], color='black', linewidth=2, linestyle='--', animated=True)
+    label = ax.text(0.02, 0.98, '', transform=ax.transAxes, fontsize=10,
+                    verticalalignment='top', animated=True,
+                    bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+
+    points = ax.scatter(X[:, 0], X[:, 1], c=y, s=200, cmap='RdYlBu', edgecolors='black',
+                        linewidth=2, animated=True)
+    ax.set_xlim(x_min, x_max)
+    ax.set_ylim(y_min, y_max)
+    ax.set_xlabel('Input 1', fontsize=12)
+    ax.set_ylabel('Input 2', fontsize=12)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    ax.grid(True, alpha=0.3)
+    fig.tight_layout()
+
+    # Static artists are drawn once and restored under every frame
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+    size = canvas.get_width_height()
+
+    if os.path.splitext(save_path)[1]:
+        writer = FFmpegFrameWriter(save_path, size, fps)
+    else:
+        writer = PNGFrameWriter(save_path)
+
+    with writer:
+        frames = boundary_frames(weights, biases, bounds, step, frames_per_batch)
+        for epoch, w, b, Z in zip(epochs, weights, biases, frames):
+            np.take(colors, Z.view(np.uint8), axis=0, out=pixels)
+            region.set_data(pixels)
+            line.set_data(*_boundary_line(w, b, bounds))
+            label.set_text(f'Epoch {epoch + 1}')
+
+            canvas.restore_region(background)
+            ax.draw_artist(region)
+            ax.draw_artist(points)
+            ax.draw_artist(line)
+            ax.draw_artist(label)
+            writer.write(np.asarray(canvas.buffer_rgba()))
+
+    return len(epochs)
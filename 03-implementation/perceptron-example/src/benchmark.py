@@ -0,0 +1,181 @@
+"""
+Benchmark Harness
+
+Times callables in the style of ``timeit`` (the best of several repeats of a
+calibrated number of calls, measured with ``time.perf_counter``), stores the
+results as a JSON baseline and compares later runs against it, so that a
+change slowing down a hot path is reported as a regression.
+"""
+
+import json
+import os
+import platform
+import re
+import time
+import numpy as np
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+BASELINE_VERSION = 1
+
+# A benchmark is a setup function returning the operation to time; the setup
+# (data generation, model construction) is not included in the timings
+Benchmark = Callable[[], Callable[[], Any]]
+
+
+def time_callable(func: Callable[[], Any], repeat: int = 5,
+                  min_time: float = 0.05) -> Dict[str, float]:
+    """
+    Time a callable.
+
+    The number of calls per repeat is doubled until one repeat takes at least
+    min_time, so that short operations are not dominated by timer resolution.
+
+    Args:
+        func: Operation to time
+        repeat: Number of timed repeats
+        min_time: Minimum duration of one repeat in seconds
+
+    Returns:
+        Dictionary with the best ('min') and 'median' time per call in seconds,
+        and the 'number' of calls per repeat
+    """
+    number = 1
+    while True:
+        elapsed = _time_calls(func, number)
+        if elapsed >= min_time:
+            break
+        number *= 2
+
+    # The calibration run also warms up caches and workspaces
+    times = [elapsed] + [_time_calls(func, number) for _ in range(repeat - 1)]
+    per_call = np.array(times) / number
+    return {'min': float(per_call.min()), 'median': float(np.median(per_call)),
+            'number': number}
+
+
+def _time_calls(func: Callable[[], Any], number: int) -> float:
+    """Duration of number consecutive calls of func."""
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def run_benchmarks(benchmarks: Dict[str, Benchmark], pattern: Optional[str] = None,
+                   repeat: int = 5, min_time: float = 0.05,
+                   progress: Optional[Callable[[str, Dict[str, float]], None]] = None
+                   ) -> Dict[str, Dict[str, float]]:
+    """
+    Run a suite of benchmarks.
+
+    Args:
+        benchmarks: Mapping of benchmark names to setup functions
+        pattern: Regular expression selecting the benchmarks to run (by name)
+        repeat: Number of timed repeats per benchmark
+        min_time: Minimum duration of one repeat in seconds
+        progress: Called with the name and timings of every finished benchmark
+
+    Returns:
+        Timings of every benchmark that was run, by name
+    """
+    results = {}
+    for name, setup in benchmarks.items():
+        if pattern is not None and not re.search(pattern, name):
+            continue
+        results[name] = time_callable(setup(), repeat, min_time)
+        if progress is not None:
+            progress(name, results[name])
+    return results
+
+
+def machine_info() -> Dict[str, Any]:
+    """Description of the machine and library versions the timings were taken on."""
+    return {
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__
+    }
+
+
+def save_baseline(path: str, results: Dict[str, Dict[str, float]],
+                  merge: bool = True) -> None:
+    """
+    Store benchmark timings as a baseline.
+
+    Args:
+        path: JSON file to write
+        results: Timings returned by run_benchmarks
+        merge: Keep the baseline entries of benchmarks that were not run
+    """
+    stored = {}
+    if merge and os.path.exists(path):
+        stored = load_baseline(path)
+    stored.update(results)
+
+    baseline = {'version': BASELINE_VERSION, 'machine': machine_info(),
+                'results': dict(sorted(stored.items()))}
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(baseline, f, indent=2)
+        f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def load_baseline(path: str) -> Dict[str, Dict[str, float]]:
+    """Load the timings stored by save_baseline."""
+    with open(path) as f:
+        baseline = json.load(f)
+    if baseline.get('version') != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version: {baseline.get('version')}")
+    return baseline['results']
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]],
+                        baseline: Dict[str, Dict[str, float]],
+                        threshold: float = 1.25) -> List[Tuple[str, float, float, float]]:
+    """
+    Find the benchmarks that became slower than their baseline.
+
+    Best times are compared, as they are the least affected by other load on
+    the machine.
+
+    Args:
+        results: Timings returned by run_benchmarks
+        baseline: Timings returned by load_baseline
+        threshold: Largest accepted ratio of the new time to the baseline time
+
+    Returns:
+        (name, baseline time, new time, ratio) of every regression, slowest first
+    """
+    regressions = []
+    for name, timing in results.items():
+        if name not in baseline:
+            continue
+        ratio = timing['min'] / baseline[name]['min']
+        if ratio > threshold:
+            regressions.append((name, baseline[name]['min'], timing['min'], ratio))
+    return sorted(regressions, key=lambda regression: -regression[3])
+
+
+def format_time(seconds: float) -> str:
+    """Format a duration with a unit suited to its magnitude."""
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def format_report(results: Dict[str, Dict[str, float]],
+                  baseline: Optional[Dict[str, Dict[str, float]]] = None,
+                  width: Optional[int] = None) -> Iterable[str]:
+    """Yield one line per benchmark with its time and its change against the baseline."""
+    if width is None:
+        width = max((len(name) for name in results), default=0)
+    for name, timing in results.items():
+        line = f"{name:<{width}}  {format_time(timing['min']):>10}"
+        if baseline is not None and name in baseline:
+            line += f"  {timing['min'] / baseline[name]['min']:6.2f}x baseline"
+        yield line
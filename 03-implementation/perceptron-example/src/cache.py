@@ -0,0 +1,256 @@
+"""
+On-Disk Result Cache for Experiments
+
+Stores the record of every (model, data, seed) training run under a
+content-addressed key, so that rerunning an experiment only trains the runs
+whose inputs or model code changed. Entries are evicted least recently used
+first once a count or size limit is exceeded.
+"""
+
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import tempfile
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+
+def _canonical(value: Any) -> Any:
+    """Convert a parameter value into a stable, hashable description."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _canonical(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(v) for v in value)
+    if isinstance(value, np.ndarray):
+        return ('ndarray', value.dtype.str, value.shape,
+                hashlib.sha256(np.ascontiguousarray(value).tobytes()).hexdigest())
+    if isinstance(value, type):
+        return ('type', value.__module__, value.__qualname__)
+    if isinstance(value, (np.generic, np.dtype)):
+        return repr(value)
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    # Objects such as optimizers or schedules are described by their attributes
+    # (their default repr contains a memory address)
+    try:
+        attributes = {k: v for k, v in vars(value).items() if not k.startswith('_')}
+    except TypeError:
+        return ('object', type(value).__module__, type(value).__qualname__, repr(value))
+    return ('object', type(value).__module__, type(value).__qualname__, _canonical(attributes))
+
+
+def _source_hash(model_class: type) -> str:
+    """
+    Hash of the source code model_class depends on (changes invalidate its entries).
+
+    Models call into sibling modules (optimizers, history, ...), so a class
+    defined in a package is hashed with every source file of that package; a
+    class from a top-level module only with that module.
+    """
+    module = sys.modules.get(model_class.__module__)
+    digest = hashlib.sha256()
+    try:
+        path = inspect.getsourcefile(module)
+        directory = os.path.dirname(path)
+        if getattr(module, '__package__', None):
+            paths = sorted(os.path.join(root, name)
+                           for root, _, names in os.walk(directory)
+                           for name in names if name.endswith('.py'))
+        else:
+            paths = [path]
+        for path in paths:
+            with open(path, 'rb') as f:
+                digest.update(os.path.relpath(path, directory).encode() + b'\0')
+                digest.update(f.read())
+    except (TypeError, OSError):
+        return 'unknown'
+    return digest.hexdigest()
+
+
+def run_key(model_class: type, model_params: dict,
+            X_train: np.ndarray, y_train: np.ndarray,
+            X_test: np.ndarray, y_test: np.ndarray,
+            training_params: dict, seed: int) -> str:
+    """
+    Compute the content-addressed key of a single experimental run.
+
+    Args:
+        model_class: Class of the model
+        model_params: Parameters for model initialization
+        X_train: Training data
+        y_train: Training labels
+        X_test: Test data
+        y_test: Test labels
+        training_params: Parameters for the fit method
+        seed: Random seed of the run
+
+    Returns:
+        Hex digest identifying the run
+    """
+    description = (
+        _canonical(model_class),
+        _source_hash(model_class),
+        _canonical(model_params),
+        _canonical(training_params),
+        _canonical([np.asarray(X_train), np.asarray(y_train),
+                    np.asarray(X_test), np.asarray(y_test)]),
+        repr(seed)
+    )
+    return hashlib.sha256(repr(description).encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Content-addressed cache of experiment run records.
+
+    Each entry is one pickled run record (metrics, training time, epochs and
+    history) stored as ``<key>.pkl`` in ``directory``. Reading an entry refreshes
+    its modification time, which orders entries for LRU eviction. The number
+    and size of the entries are tracked as they are written, so the directory
+    is only scanned when a limit appears to be exceeded.
+    """
+
+    def __init__(self, directory: str,
+                 max_entries: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        """
+        Open (and create if necessary) a cache directory.
+
+        Args:
+            directory: Directory holding the cache entries
+            max_entries: Maximum number of entries to keep (None for no limit)
+            max_bytes: Maximum total size of the entries in bytes (None for no limit)
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        # Totals of the entries, counted on the first eviction check
+        self._count: Optional[int] = None
+        self._bytes = 0
+
+    def key(self, model_class: type, model_params: dict,
+            X_train: np.ndarray, y_train: np.ndarray,
+            X_test: np.ndarray, y_test: np.ndarray,
+            training_params: dict, seed: int) -> str:
+        """Compute the cache key of a single run (see run_key)."""
+        return run_key(model_class, model_params, X_train, y_train, X_test, y_test,
+                       training_params, seed)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a run record.
+
+        Args:
+            key: Key from ResultCache.key
+
+        Returns:
+            Cached run record, or None if the run is not cached
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                record = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            # Missing or truncated entries are simply recomputed
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another process since it was read
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        """
+        Store a run record and evict old entries if a limit is exceeded.
+
+        Args:
+            key: Key from ResultCache.key
+            record: Run record to store
+        """
+        path = self._path(key)
+        try:
+            replaced_size = os.stat(path).st_size
+        except FileNotFoundError:
+            replaced_size = None
+
+        # Write to a temporary file first so that readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(record, f, protocol=pickle.HIGHEST_PROTOCOL)
+                size = f.tell()
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        if self._count is not None:
+            if replaced_size is None:
+                self._count += 1
+            else:
+                self._bytes -= replaced_size
+            self._bytes += size
+        self._evict()
+
+    def _entries(self) -> List[os.DirEntry]:
+        with os.scandir(self.directory) as it:
+            return [entry for entry in it if entry.name.endswith('.pkl')]
+
+    def _exceeds_limits(self, count: int, total: int) -> bool:
+        return ((self.max_entries is not None and count > self.max_entries) or
+                (self.max_bytes is not None and total > self.max_bytes))
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until both limits hold."""
+        if self.max_entries is None and self.max_bytes is None:
+            return
+        if self._count is not None and not self._exceeds_limits(self._count, self._bytes):
+            return
+
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # Removed by another process during the scan
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        entries.sort(reverse=True)
+
+        count = 0
+        total = 0
+        for i, (_, size, _) in enumerate(entries):
+            if self._exceeds_limits(count + 1, total + size):
+                for _, _, path in entries[i:]:
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass
+                break
+            count += 1
+            total += size
+        self._count = count
+        self._bytes = total
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        for entry in self._entries():
+            os.unlink(entry.path)
+        self._count = 0
+        self._bytes = 0
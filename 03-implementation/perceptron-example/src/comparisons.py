@@ -0,0 +1,310 @@
+"""
+Multiple-Comparison Statistics for Configuration Sweeps
+
+Compares many configurations (e.g. the architectures of compare_architectures)
+at once from a results matrix with one row per seed and one column per
+configuration. Every pair of columns is tested in one batched pass: the
+differences of all pairs are a single (n_runs, n_pairs) array, and the test
+statistics, p-values and effect sizes are column reductions of it. The
+family-wise (Holm) or false-discovery-rate (Benjamini-Hochberg) correction of
+the pairwise p-values and the omnibus rank tests (Friedman, Kruskal-Wallis)
+are vectorized as well, so a sweep of hundreds of configurations costs a few
+numpy operations instead of a Python loop over every pair.
+
+run_experiment trains every configuration on the same seeds, so row i of the
+matrix holds results obtained from the same seed and paired tests apply.
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def results_matrix(results: Dict[str, Dict[str, Any]],
+                   metric: str = 'accuracies') -> Tuple[List[str], np.ndarray]:
+    """
+    Stack the per-run values of a metric into a results matrix.
+
+    Args:
+        results: Mapping of configuration names to run_experiment results, as
+            returned by compare_architectures
+        metric: Per-run list of the results to compare
+
+    Returns:
+        The configuration names and the matrix, shape (n_runs, n_configurations)
+    """
+    names = list(results)
+    columns = [np.asarray(results[name][metric], dtype=float) for name in names]
+    if len({len(column) for column in columns}) > 1:
+        raise ValueError("Every configuration needs the same number of runs")
+    return names, np.column_stack(columns)
+
+
+def _ranks(values: np.ndarray, axis: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Average ranks along an axis (ties share the mean of their ranks), and the
+    tie correction sum(t^3 - t) of every slice, t being the sizes of its
+    groups of tied values.
+    """
+    moved = np.moveaxis(values, axis, -1)
+    rows = moved.reshape(-1, moved.shape[-1])
+    m, n = rows.shape
+    order = np.argsort(rows, axis=1, kind='stable')
+    ordered = np.take_along_axis(rows, order, axis=1)
+
+    # Number the groups of tied values of all rows consecutively
+    new_group = np.ones((m, n), dtype=bool)
+    new_group[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    group = np.cumsum(new_group).reshape(m, n) - 1
+    positions = np.broadcast_to(np.arange(1, n + 1, dtype=float), (m, n))
+    counts = np.bincount(group.ravel())
+    mean_ranks = np.bincount(group.ravel(), weights=positions.ravel()) / counts
+
+    ranks = np.empty((m, n))
+    np.put_along_axis(ranks, order, mean_ranks[group], axis=1)
+    first_of_row = group[:, 0]
+    tie_sums = np.add.reduceat(counts.astype(float) ** 3 - counts, first_of_row)
+    return (np.moveaxis(ranks.reshape(moved.shape), -1, axis),
+            tie_sums.reshape(moved.shape[:-1]))
+
+
+def _p_values(statistic: np.ndarray, df: np.ndarray, difference: np.ndarray,
+              alternative: str) -> np.ndarray:
+    """
+    p-values of t statistics; a statistic without variance (e.g. every run of
+    both configurations at 100%) is decided by the sign of the difference.
+    """
+    # Imported here so that worker processes running experiments skip scipy
+    from scipy.special import stdtr
+
+    with np.errstate(invalid='ignore'):
+        if alternative == 'greater':
+            p = stdtr(df, -statistic)
+        elif alternative == 'less':
+            p = stdtr(df, statistic)
+        else:
+            p = 2 * stdtr(df, -np.abs(statistic))
+
+    degenerate = ~np.isfinite(statistic)
+    if np.any(degenerate):
+        d = difference[degenerate]
+        if alternative == 'greater':
+            decided = d > 0
+        elif alternative == 'less':
+            decided = d < 0
+        else:
+            decided = d != 0
+        p[degenerate] = np.where(decided, 0.0, 1.0)
+    return p
+
+
+def adjust_p_values(p_values: Sequence[float], method: str = 'holm') -> np.ndarray:
+    """
+    Correct p-values for multiple comparisons.
+
+    Args:
+        p_values: p-values of a family of tests
+        method: 'holm' (controls the family-wise error rate), 'bh'
+            (Benjamini-Hochberg, controls the false discovery rate) or
+            'bonferroni'
+
+    Returns:
+        Adjusted p-values, in the order of p_values
+    """
+    p = np.asarray(p_values, dtype=float)
+    m = p.size
+    if method == 'bonferroni':
+        return np.minimum(p * m, 1.0)
+
+    order = np.argsort(p, kind='stable')
+    ordered = p[order]
+    if method == 'holm':
+        adjusted = np.maximum.accumulate(ordered * (m - np.arange(m)))
+    elif method == 'bh':
+        adjusted = np.minimum.accumulate((ordered * m / np.arange(1, m + 1))[::-1])[::-1]
+    else:
+        raise ValueError(f"Unknown correction method: {method}")
+
+    result = np.empty(m)
+    # Rounding of p * m / m must not push a p-value below its unadjusted value
+    result[order] = np.clip(adjusted, ordered, 1.0)
+    return result
+
+
+def pairwise_tests(matrix: np.ndarray, paired: bool = True,
+                   alternative: str = 'two-sided') -> Dict[str, np.ndarray]:
+    """
+    t-tests and effect sizes of every pair of configurations.
+
+    Args:
+        matrix: Results matrix, shape (n_runs, n_configurations)
+        paired: Paired t-test on the per-seed differences; otherwise Welch's
+            t-test for independent samples
+        alternative: 'two-sided', 'greater' or 'less' (first configuration of
+            each pair relative to the second)
+
+    Returns:
+        Dictionary of arrays with one entry per pair: the column indices
+        'first' and 'second' (first < second), 'mean_diff', the t 'statistic',
+        'df', 'p_value', 'cohens_d' (difference over the root mean of the two
+        variances, as in statistical_hypothesis_test) and 'cliffs_delta'
+        (P(first > second) - P(first < second) over all pairs of runs)
+    """
+    if alternative not in ('two-sided', 'greater', 'less'):
+        raise ValueError(f"Unknown alternative: {alternative}")
+    matrix = np.asarray(matrix, dtype=float)
+    n, k = matrix.shape
+    if n < 2:
+        raise ValueError("Pairwise tests need at least two runs")
+    first, second = np.triu_indices(k, 1)
+    a, b = matrix[:, first], matrix[:, second]
+
+    means = matrix.mean(axis=0)
+    variances = matrix.var(axis=0, ddof=1)
+    mean_diff = means[first] - means[second]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if paired:
+            standard_error = (a - b).std(axis=0, ddof=1) / np.sqrt(n)
+            df = np.full(len(first), n - 1.0)
+        else:
+            v1, v2 = variances[first] / n, variances[second] / n
+            standard_error = np.sqrt(v1 + v2)
+            # Welch-Satterthwaite degrees of freedom
+            df = (v1 + v2) ** 2 / ((v1 ** 2 + v2 ** 2) / (n - 1))
+        statistic = mean_diff / standard_error
+        population_variances = matrix.var(axis=0)
+        pooled_std = np.sqrt((population_variances[first] + population_variances[second]) / 2)
+        cohens_d = np.where(pooled_std > 0, mean_diff / pooled_std, 0.0)
+
+    # Cliff's delta from the Mann-Whitney U of each pair: ranks of the 2n runs
+    ranks, _ = _ranks(np.concatenate([a, b]), axis=0)
+    u = ranks[:n].sum(axis=0) - n * (n + 1) / 2
+    cliffs_delta = 2 * u / n ** 2 - 1
+
+    return {
+        'first': first,
+        'second': second,
+        'mean_diff': mean_diff,
+        'statistic': statistic,
+        'df': df,
+        'p_value': _p_values(statistic, df, mean_diff, alternative),
+        'cohens_d': cohens_d,
+        'cliffs_delta': cliffs_delta
+    }
+
+
+def friedman_test(matrix: np.ndarray) -> Dict[str, float]:
+    """
+    Friedman test that all configurations perform alike, with seeds as blocks.
+
+    Args:
+        matrix: Results matrix, shape (n_runs, n_configurations)
+
+    Returns:
+        Dictionary with the tie-corrected chi-square 'statistic', its 'df',
+        the 'p_value' and the 'mean_ranks' of the configurations (rank 1 is
+        the lowest value within a seed)
+    """
+    # Imported here so that worker processes running experiments skip scipy
+    from scipy.special import chdtrc
+
+    matrix = np.asarray(matrix, dtype=float)
+    n, k = matrix.shape
+    ranks, ties = _ranks(matrix, axis=1)
+    rank_sums = ranks.sum(axis=0)
+    statistic = 12 / (n * k * (k + 1)) * np.sum(rank_sums ** 2) - 3 * n * (k + 1)
+    correction = 1 - ties.sum() / (n * (k ** 3 - k))
+    # Every seed tying every configuration leaves nothing to test
+    statistic = statistic / correction if correction > 0 else 0.0
+    return {'statistic': float(statistic), 'df': k - 1,
+            'p_value': float(chdtrc(k - 1, statistic)), 'mean_ranks': rank_sums / n}
+
+
+def kruskal_wallis_test(matrix: np.ndarray) -> Dict[str, float]:
+    """
+    Kruskal-Wallis test that all configurations perform alike, treating the
+    runs of different configurations as independent.
+
+    Args:
+        matrix: Results matrix, shape (n_runs, n_configurations)
+
+    Returns:
+        Dictionary with the tie-corrected H 'statistic', its 'df', the
+        'p_value' and the 'mean_ranks' of the configurations in the pooled runs
+    """
+    # Imported here so that worker processes running experiments skip scipy
+    from scipy.special import chdtrc
+
+    matrix = np.asarray(matrix, dtype=float)
+    n, k = matrix.shape
+    total = n * k
+    ranks, ties = _ranks(matrix.ravel(), axis=0)
+    rank_sums = ranks.reshape(n, k).sum(axis=0)
+    statistic = 12 / (total * (total + 1)) * np.sum(rank_sums ** 2 / n) - 3 * (total + 1)
+    correction = 1 - float(ties) / (total ** 3 - total)
+    statistic = statistic / correction if correction > 0 else 0.0
+    return {'statistic': float(statistic), 'df': k - 1,
+            'p_value': float(chdtrc(k - 1, statistic)), 'mean_ranks': rank_sums / n}
+
+
+def compare_configurations(results: Dict[str, Dict[str, Any]],
+                           metric: str = 'accuracies',
+                           paired: bool = True,
+                           correction: str = 'holm',
+                           alpha: float = 0.05) -> Dict[str, Any]:
+    """
+    All-pairs comparison of the configurations of a sweep.
+
+    Args:
+        results: Mapping of configuration names to run_experiment results, as
+            returned by compare_architectures
+        metric: Per-run list of the results to compare
+        paired: Treat runs with the same seed as paired (Friedman and paired
+            t-tests); otherwise Kruskal-Wallis and Welch's t-tests
+        correction: Multiple-comparison correction of the pairwise p-values
+            (see adjust_p_values)
+        alpha: Significance level of the corrected tests
+
+    Returns:
+        Dictionary with the configuration 'names', the 'omnibus' test, and the
+        'pairwise' tests (see pairwise_tests) extended with the names of each
+        pair, the corrected 'p_adjusted' and whether each pair is 'significant'
+    """
+    names, matrix = results_matrix(results, metric)
+    omnibus = friedman_test(matrix) if paired else kruskal_wallis_test(matrix)
+    omnibus['test'] = 'friedman' if paired else 'kruskal-wallis'
+
+    pairwise = pairwise_tests(matrix, paired)
+    pairwise['p_adjusted'] = adjust_p_values(pairwise['p_value'], correction)
+    pairwise['significant'] = pairwise['p_adjusted'] < alpha
+    pairwise['names'] = [(names[i], names[j])
+                         for i, j in zip(pairwise['first'], pairwise['second'])]
+
+    return {'names': names, 'omnibus': omnibus, 'pairwise': pairwise,
+            'correction': correction, 'alpha': alpha, 'metric': metric}
+
+
+def format_comparison(comparison: Dict[str, Any], limit: Optional[int] = None) -> str:
+    """
+    Format a comparison as Markdown: the omnibus test and a table of the
+    pairwise tests, most significant first.
+
+    Args:
+        comparison: Result of compare_configurations
+        limit: Largest number of pairs listed
+    """
+    omnibus = comparison['omnibus']
+    pairwise = comparison['pairwise']
+    lines = [f"{omnibus['test'].title()} test: statistic = {omnibus['statistic']:.3f}, "
+             f"df = {omnibus['df']}, p = {omnibus['p_value']:.4g}",
+             '',
+             f"| Pair | Mean Difference | p ({comparison['correction']}) | Cohen's d "
+             f"| Cliff's delta | Significant |",
+             '|------|-----------------|---|-----------|---------------|-------------|']
+    order = np.lexsort((-np.abs(pairwise['mean_diff']), pairwise['p_adjusted']))
+    for i in order[:limit]:
+        first, second = pairwise['names'][i]
+        lines.append(f"| {first} vs {second} | {pairwise['mean_diff'][i]:+.2%} "
+                     f"| {pairwise['p_adjusted'][i]:.4g} | {pairwise['cohens_d'][i]:.2f} "
+                     f"| {pairwise['cliffs_delta'][i]:+.2f} "
+                     f"| {'yes' if pairwise['significant'][i] else 'no'} |")
+    return '\n'.join(lines)
@@ -1,76 +1,278 @@
 """
 Data utilities for perceptron research.
 
-Provides functions to generate logic gate datasets and visualize decision boundaries.
+Provides functions to generate logic gate and n-input Boolean-function datasets
+and to visualize decision boundaries.
+Plotting libraries are imported by the plotting functions, so generating data
+does not load matplotlib or seaborn.
 """
 
+import functools
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import Tuple, Optional, Any
-import seaborn as sns
+from typing import Any, Iterator, List, Optional, Tuple, Union
 
 
-def generate_logic_gate_data(gate_type: str) -> Tuple[np.ndarray, np.ndarray]:
+# Named Boolean functions of any number of inputs, as labels of the row indices
+# (row r holds the binary digits of r, most significant input first)
+_NAMED_FUNCTIONS = ('AND', 'OR', 'XOR', 'NAND', 'NOR', 'PARITY')
+
+
+def generate_logic_gate_data(gate_type: str, dtype: type = float) -> Tuple[np.ndarray, np.ndarray]:
     """
     Generate data for logic gate functions.
     
     Args:
         gate_type: Type of gate ('AND', 'OR', 'XOR', 'NAND', 'NOR')
+        dtype: Data type of the returned arrays (e.g. np.float32)
         
     Returns:
         Tuple of (inputs, outputs) for the specified gate
     """
-    # All logic gates use same input combinations
-    X = np.array([[0, 0],
-                  [0, 1],
-                  [1, 0],
-                  [1, 1]], dtype=float)
-    
-    # Define outputs for each gate type
-    if gate_type.upper() == 'AND':
-        y = np.array([0, 0, 0, 1], dtype=float)
-    elif gate_type.upper() == 'OR':
-        y = np.array([0, 1, 1, 1], dtype=float)
-    elif gate_type.upper() == 'XOR':
-        y = np.array([0, 1, 1, 0], dtype=float)
-    elif gate_type.upper() == 'NAND':
-        y = np.array([1, 1, 1, 0], dtype=float)
-    elif gate_type.upper() == 'NOR':
-        y = np.array([1, 0, 0, 0], dtype=float)
-    else:
+    if gate_type.upper() not in _NAMED_FUNCTIONS or gate_type.upper() == 'PARITY':
         raise ValueError(f"Unknown gate type: {gate_type}")
     
-    return X, y
+    # All logic gates use same input combinations: [0, 0], [0, 1], [1, 0], [1, 1]
+    return generate_boolean_data(2, gate_type, dtype=dtype)
 
 
-def visualize_decision_boundary(model: Any, 
-                               X: np.ndarray, 
-                               y: np.ndarray,
-                               title: str = "Decision Boundary",
-                               save_path: Optional[str] = None) -> None:
+def _parity(rows: np.ndarray, n_inputs: int) -> np.ndarray:
+    """Parity of the set bits of each row index (XOR-folding the low n_inputs bits)."""
+    folded = rows.copy()
+    shifted = np.empty_like(rows)
+    for shift in (32, 16, 8, 4, 2, 1):
+        if shift < n_inputs:
+            np.right_shift(folded, np.uint64(shift), out=shifted)
+            folded ^= shifted
+    folded &= np.uint64(1)
+    return folded
+
+
+def _truth_table_bytes(n_inputs: int, function_index: int) -> np.ndarray:
+    """Truth table of a function index as bytes (bit r of the index is the output of row r)."""
+    n_rows = 1 << n_inputs
+    if function_index < 0 or function_index.bit_length() > n_rows:
+        raise ValueError(f"Function index must be in [0, 2**{n_rows}) for {n_inputs} inputs")
+    n_bytes = (n_rows + 7) // 8
+    return np.frombuffer(function_index.to_bytes(n_bytes, 'little'), dtype=np.uint8)
+
+
+def _boolean_labels(function: Union[str, np.ndarray], rows: np.ndarray, n_inputs: int) -> np.ndarray:
+    """Outputs of a named function or truth table (as bytes) for the given row indices."""
+    last = np.uint64((1 << n_inputs) - 1)
+    if isinstance(function, np.ndarray):
+        return (function[rows >> np.uint64(3)] >> (rows & np.uint64(7)).astype(np.uint8)) & 1
+    if function in ('XOR', 'PARITY'):
+        return _parity(rows, n_inputs)
+    if function == 'AND':
+        return rows == last
+    if function == 'OR':
+        return rows != 0
+    if function == 'NAND':
+        return rows != last
+    return rows == 0
+
+
+def iter_boolean_data(n_inputs: int,
+                      function: Union[str, int] = 'parity',
+                      chunk_size: int = 1 << 16,
+                      dtype: type = float,
+                      replicas: int = 1,
+                      noise_std: float = 0.0,
+                      flip_probability: float = 0.0,
+                      random_seed: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
     """
-    Visualize the decision boundary of a trained model.
+    Generate a Boolean-function dataset chunk by chunk.
+    
+    The dataset lists all 2^n input combinations in binary order, repeated
+    ``replicas`` times. Inputs are unpacked from the row indices with
+    ``np.unpackbits`` and labels are computed from the indices with bit
+    operations, so no chunk depends on the previous ones. Concatenating the
+    chunks gives exactly the arrays returned by generate_boolean_data.
     
     Args:
-        model: Trained model with predict method
-        X: Input data points
-        y: Target labels
-        title: Plot title
-        save_path: Optional path to save the figure
+        n_inputs: Number of Boolean inputs (1 to 63)
+        function: 'parity' (or 'xor'), 'and', 'or', 'nand', 'nor' on all n inputs,
+            or an integer truth table whose bit r is the output of row r
+        chunk_size: Maximum number of rows per chunk
+        dtype: Data type of the returned arrays (e.g. np.float32)
+        replicas: Number of copies of the truth table
+        noise_std: Standard deviation of Gaussian noise added to the inputs
+        flip_probability: Probability of flipping each label
+        random_seed: Random seed for the noise
+        
+    Yields:
+        Tuples of (inputs, outputs) with at most chunk_size rows
     """
-    # Set up the plot
-    fig, ax = plt.subplots(figsize=(8, 6))
+    if not 1 <= n_inputs <= 63:
+        raise ValueError(f"n_inputs must be between 1 and 63, got {n_inputs}")
+    if chunk_size < 1 or replicas < 1:
+        raise ValueError("chunk_size and replicas must be positive")
+    if not 0.0 <= flip_probability <= 1.0:
+        raise ValueError(f"flip_probability must be in [0, 1], got {flip_probability}")
+    
+    if isinstance(function, str):
+        function = function.upper()
+        if function not in _NAMED_FUNCTIONS:
+            raise ValueError(f"Unknown Boolean function: {function}")
+    else:
+        function = _truth_table_bytes(n_inputs, int(function))
+    
+    # Independent streams, so that chunk boundaries do not change the noise
+    input_seed, label_seed = np.random.SeedSequence(random_seed).spawn(2)
+    input_rng = np.random.default_rng(input_seed)
+    label_rng = np.random.default_rng(label_seed)
+    
+    row_mask = np.uint64((1 << n_inputs) - 1)
+    n_bytes = (n_inputs + 7) // 8
+    n_total = replicas << n_inputs
+    for start in range(0, n_total, chunk_size):
+        stop = min(start + chunk_size, n_total)
+        rows = np.arange(start, stop, dtype=np.uint64) & row_mask
+        
+        # Big-endian bytes put the most significant input first; only the bytes
+        # holding the n_inputs low bits are unpacked
+        row_bytes = rows.astype('>u8').view(np.uint8).reshape(-1, 8)[:, 8 - n_bytes:]
+        X = np.unpackbits(row_bytes, axis=1)[:, 8 * n_bytes - n_inputs:].astype(dtype)
+        y = _boolean_labels(function, rows, n_inputs).astype(dtype)
+        
+        if noise_std > 0:
+            X += noise_std * input_rng.standard_normal(X.shape)
+        if flip_probability > 0:
+            flips = label_rng.random(len(y)) < flip_probability
+            y[flips] = 1 - y[flips]
+        
+        yield X, y
+
+
+def generate_boolean_data(n_inputs: int,
+                          function: Union[str, int] = 'parity',
+                          dtype: type = float,
+                          replicas: int = 1,
+                          noise_std: float = 0.0,
+                          flip_probability: float = 0.0,
+                          random_seed: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generate the full dataset of an n-input Boolean function.
+    
+    See iter_boolean_data for the arguments; use it directly for datasets that
+    do not fit in memory.
+    
+    Returns:
+        Tuple of (inputs, outputs) with replicas * 2^n_inputs rows
+    """
+    n_total = replicas << n_inputs
+    return next(iter_boolean_data(n_inputs, function, chunk_size=max(n_total, 1), dtype=dtype,
+                                  replicas=replicas, noise_std=noise_std,
+                                  flip_probability=flip_probability, random_seed=random_seed))
+
+
+def generate_parity_data(n_inputs: int, **kwargs) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generate the n-bit parity dataset (XOR of all inputs).
+    
+    Args:
+        n_inputs: Number of input bits
+        **kwargs: Options of generate_boolean_data (dtype, replicas, noise, seed)
+        
+    Returns:
+        Tuple of (inputs, outputs) for n-bit parity
+    """
+    return generate_boolean_data(n_inputs, 'parity', **kwargs)
+
+
+# Default plotting region of the 2-input datasets and mesh step (200x200 points)
+DEFAULT_BOUNDS = (-0.5, 1.5, -0.5, 1.5)
+DEFAULT_STEP = 0.01
+
+
+@functools.lru_cache(maxsize=16)
+def decision_mesh(bounds: Tuple[float, float, float, float] = DEFAULT_BOUNDS,
+                  step: float = DEFAULT_STEP) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Mesh on which decision boundaries are evaluated (cached per bounds and step).
+    
+    Args:
+        bounds: (x_min, x_max, y_min, y_max) of the plotted region
+        step: Distance between neighbouring mesh points
+        
+    Returns:
+        Read-only (xx, yy, grid), where grid holds the mesh points as rows
+    """
+    x_min, x_max, y_min, y_max = bounds
+    xx, yy = np.meshgrid(np.arange(x_min, x_max, step),
+                         np.arange(y_min, y_max, step))
+    grid = np.empty((xx.size, 2))
+    grid[:, 0] = xx.ravel()
+    grid[:, 1] = yy.ravel()
+    for array in (xx, yy, grid):
+        array.flags.writeable = False
+    return xx, yy, grid
+
+
+def _predict_chunked(model: Any, X: np.ndarray, chunk_size: Optional[int]) -> np.ndarray:
+    """Binary predictions of one model, through its inference-only path when it has one."""
+    if hasattr(model, 'predict_batch'):
+        return (model.predict_batch(X, chunk_size=chunk_size) > 0.5).astype(int)
+    chunk_size = chunk_size or max(len(X), 1)
+    return np.concatenate([model.predict(X[start:start + chunk_size])
+                           for start in range(0, len(X), chunk_size)])
+
+
+def predict_decision_grids(models: List[Any],
+                           bounds: Tuple[float, float, float, float] = DEFAULT_BOUNDS,
+                           step: float = DEFAULT_STEP,
+                           chunk_size: Optional[int] = 4096) -> np.ndarray:
+    """
+    Evaluate several models on the shared decision mesh.
     
-    # Create a mesh grid for the decision boundary
-    h = 0.01  # Step size in the mesh
-    x_min, x_max = -0.5, 1.5
-    y_min, y_max = -0.5, 1.5
-    xx, yy = np.meshgrid(np.arange(x_min, x_max, h),
-                         np.arange(y_min, y_max, h))
+    Multi-layer perceptrons with a common architecture are evaluated in one
+    stacked prediction, single-layer perceptrons as one matrix product; other
+    models are evaluated one at a time.
     
-    # Predict on the mesh grid
-    Z = model.predict(np.c_[xx.ravel(), yy.ravel()])
-    Z = Z.reshape(xx.shape)
+    Args:
+        models: Trained models with a predict method
+        bounds: (x_min, x_max, y_min, y_max) of the plotted region
+        step: Distance between neighbouring mesh points
+        chunk_size: Maximum number of mesh points evaluated at once (None for all)
+        
+    Returns:
+        Binary predictions of shape (n_models, *xx.shape)
+    """
+    from .ensemble import predict_proba_stacked
+    from .multi_layer_perceptron import MultiLayerPerceptron
+    from .single_layer_perceptron import SingleLayerPerceptron
+    
+    xx, _, grid = decision_mesh(tuple(bounds), step)
+    
+    if len(models) > 1 and all(type(model) is MultiLayerPerceptron for model in models):
+        try:
+            Z = (predict_proba_stacked(models, grid, chunk_size) > 0.5).astype(int)
+            return Z.reshape((len(models),) + xx.shape)
+        except ValueError:
+            pass  # Mixed architectures are evaluated one by one
+    
+    if (len(models) > 1 and all(type(model) is SingleLayerPerceptron for model in models)
+            and len({model.dtype for model in models}) == 1):
+        dtype = models[0].dtype
+        weights = np.stack([model.weights for model in models])
+        biases = np.array([model.bias for model in models], dtype=dtype)
+        Z = (grid.astype(dtype) @ weights.T + biases > 0).T.astype(int)
+        return Z.reshape((len(models),) + xx.shape)
+    
+    return np.stack([_predict_chunked(model, grid, chunk_size).reshape(xx.shape)
+                     for model in models])
+
+
+def _draw_decision_boundary(model: Any, X: np.ndarray, y: np.ndarray, title: str,
+                            save_path: Optional[str], show: bool,
+                            xx: np.ndarray, yy: np.ndarray, Z: np.ndarray,
+                            bounds: Tuple[float, float, float, float]) -> None:
+    """Plot one precomputed decision boundary with the data points."""
+    import matplotlib.pyplot as plt
+    
+    # Set up the plot
+    fig, ax = plt.subplots(figsize=(8, 6))
+    x_min, x_max, y_min, y_max = bounds
     
     # Plot the decision boundary
     ax.contourf(xx, yy, Z, alpha=0.3, cmap='RdYlBu', levels=[0, 0.5, 1])
@@ -109,7 +311,74 @@ def visualize_decision_boundary(model: Any,
     if save_path:
         plt.savefig(save_path, dpi=300, bbox_inches='tight')
     
-    plt.show()
+    if show:
+        plt.show()
+    else:
+        # Headless rendering: release the figure instead of blocking on it
+        plt.close(fig)
+
+
+def visualize_decision_boundary(model: Any, 
+                               X: np.ndarray, 
+                               y: np.ndarray,
+                               title: str = "Decision Boundary",
+                               save_path: Optional[str] = None,
+                               show: bool = True,
+                               bounds: Tuple[float, float, float, float] = DEFAULT_BOUNDS,
+                               step: float = DEFAULT_STEP) -> None:
+    """
+    Visualize the decision boundary of a trained model.
+    
+    Args:
+        model: Trained model with predict method
+        X: Input data points
+        y: Target labels
+        title: Plot title
+        save_path: Optional path to save the figure
+        show: Whether to display the figure (False closes it after saving)
+        bounds: (x_min, x_max, y_min, y_max) of the plotted region
+        step: Distance between neighbouring mesh points
+    """
+    xx, yy, _ = decision_mesh(tuple(bounds), step)
+    Z = predict_decision_grids([model], bounds, step)[0]
+    _draw_decision_boundary(model, X, y, title, save_path, show, xx, yy, Z, bounds)
+
+
+def visualize_decision_boundaries(models: List[Any],
+                                  X: np.ndarray,
+                                  y: np.ndarray,
+                                  titles: Optional[List[str]] = None,
+                                  save_paths: Optional[List[Optional[str]]] = None,
+                                  show: bool = False,
+                                  bounds: Tuple[float, float, float, float] = DEFAULT_BOUNDS,
+                                  step: float = DEFAULT_STEP) -> np.ndarray:
+    """
+    Render the decision boundaries of many models on a shared mesh.
+    
+    All models are evaluated first with predict_decision_grids, then one figure
+    is drawn per model. Figures are closed after saving unless show is True.
+    
+    Args:
+        models: Trained models with predict method
+        X: Input data points
+        y: Target labels
+        titles: Optional plot title per model
+        save_paths: Optional save path per model (None entries are not saved)
+        show: Whether to display each figure
+        bounds: (x_min, x_max, y_min, y_max) of the plotted region
+        step: Distance between neighbouring mesh points
+        
+    Returns:
+        Binary predictions on the mesh, of shape (n_models, *xx.shape)
+    """
+    titles = titles or [f"Decision Boundary {i}" for i in range(len(models))]
+    save_paths = save_paths or [None] * len(models)
+    
+    xx, yy, _ = decision_mesh(tuple(bounds), step)
+    Z = predict_decision_grids(models, bounds, step)
+    for model, title, save_path, Z_model in zip(models, titles, save_paths, Z):
+        _draw_decision_boundary(model, X, y, title, save_path, show, xx, yy, Z_model, bounds)
+    return Z
 
 
 def plot_training_history(history: dict, 
@@ -119,13 +388,19 @@ def plot_training_history(history: dict,
     Plot training history (loss and accuracy over epochs).
     
     Args:
-        history: Dictionary with 'loss' and 'accuracy' lists
+        history: Dictionary with 'loss' and 'accuracy' lists, or a TrainingHistory
+            (plotted at its recorded 'epochs')
         title: Plot title
         save_path: Optional path to save the figure
     """
+    import matplotlib.pyplot as plt
+    
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
     
-    epochs = range(1, len(history['loss']) + 1)
+    if 'epochs' in history:
+        epochs = np.asarray(history['epochs']) + 1
+    else:
+        epochs = range(1, len(history['loss']) + 1)
     
     # Plot loss
     ax1.plot(epochs, history['loss'], 'b-', linewidth=2, label='Loss')
@@ -189,6 +464,9 @@ def plot_comparison_results(results: dict, save_path: Optional[str] = None) -> N
         results: Dictionary of gate -> model -> accuracy
         save_path: Optional path to save the figure
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    
     # Convert results to matrix format
     gates = list(results.keys())
     models = list(results[gates[0]].keys())
@@ -0,0 +1,342 @@
+"""
+Vectorized Seed-Ensemble Training
+
+Trains many independently seeded multi-layer perceptrons at once by stacking
+their parameters into 3-D arrays and using batched matrix products. This removes
+the Python overhead that dominates when each run only multiplies tiny matrices.
+"""
+
+import copy
+import numpy as np
+from typing import List, Optional, Tuple, Union
+
+from .history import TrainingHistory, record_epoch
+from .multi_layer_perceptron import MultiLayerPerceptron
+from .optimizers import Optimizer
+
+
+class MLPEnsemble:
+    """
+    Ensemble of multi-layer perceptrons trained in lockstep.
+
+    Member i is initialized exactly like ``MultiLayerPerceptron(..., random_seed=seeds[i])``
+    and follows the same training procedure as ``MultiLayerPerceptron.fit``, including
+    its own early stopping and history, so the trained members are identical to
+    models trained one after another.
+    """
+
+    def __init__(self,
+                 layer_sizes: List[int],
+                 random_seeds: List[int],
+                 activation: str = 'sigmoid',
+                 learning_rate: float = 0.5,
+                 optimizer: Union[str, Optimizer] = 'sgd',
+                 optimizer_params: Optional[dict] = None,
+                 dtype: type = np.float64,
+                 history: Optional[TrainingHistory] = None):
+        """
+        Initialize the ensemble members.
+
+        Args:
+            layer_sizes: List of layer sizes [input_size, hidden1, ..., output_size]
+            random_seeds: One random seed per ensemble member
+            activation: Activation function ('sigmoid', 'tanh', 'relu')
+            learning_rate: Learning rate for backpropagation
+            optimizer: Optimizer name or instance (see MultiLayerPerceptron)
+            optimizer_params: Additional parameters for a named optimizer
+            dtype: Floating point type of the parameters and computations
+            history: Recorder configuring every member's history (see TrainingHistory)
+        """
+        self.layer_sizes = layer_sizes
+        self.n_layers = len(layer_sizes)
+        self.random_seeds = list(random_seeds)
+        self.learning_rate = learning_rate
+        self.activation_name = activation
+        self.dtype = np.dtype(dtype)
+
+        self.members = [MultiLayerPerceptron(layer_sizes, activation=activation,
+                                             learning_rate=learning_rate,
+                                             random_seed=seed,
+                                             optimizer=optimizer,
+                                             optimizer_params=optimizer_params,
+                                             dtype=dtype,
+                                             history=history)
+                        for seed in self.random_seeds]
+
+        # Optimizer updates are elementwise, so a single optimizer acting on the
+        # stacked parameters performs every member's update at once
+        self._optimizer = copy.deepcopy(self.members[0].optimizer)
+
+    def __len__(self) -> int:
+        return len(self.members)
+
+    def _stack_parameters(self) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Stack member weights into arrays of shape (n_members, fan_in, fan_out)."""
+        weights = [np.stack([m.weights[i] for m in self.members])
+                   for i in range(self.n_layers - 1)]
+        biases = [np.stack([m.biases[i] for m in self.members])
+                  for i in range(self.n_layers - 1)]
+        return weights, biases
+
+    def _stack_optimizer_state(self) -> None:
+        """Continue from the members' optimizer state (empty for fresh members)."""
+        iterations = {member.optimizer.iterations for member in self.members}
+        if len(iterations) > 1:
+            raise ValueError("Ensemble members are at different optimizer steps "
+                             "and can no longer be trained in lockstep")
+
+        reference = self.members[0].optimizer
+        self._optimizer.reset()
+        self._optimizer.iterations = reference.iterations
+        self._optimizer.state = {
+            name: [np.stack([member.optimizer.state[name][i] for member in self.members])
+                   for i in range(len(arrays))]
+            for name, arrays in reference.state.items()
+        }
+
+    def _forward(self, X: np.ndarray, weights: List[np.ndarray],
+                 biases: List[np.ndarray]) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+        """Batched forward propagation; mirrors MultiLayerPerceptron.forward_propagation."""
+        reference = self.members[0]
+        activations = [X]
+        weighted_inputs = []
+
+        for i in range(self.n_layers - 1):
+            z = np.matmul(activations[-1], weights[i]) + biases[i]
+            weighted_inputs.append(z)
+
+            if i < self.n_layers - 2:
+                a = reference.activation(z)
+            else:
+                a = reference._sigmoid(z)
+
+            activations.append(a)
+
+        return activations, weighted_inputs
+
+    def _backward(self, X: np.ndarray, y: np.ndarray,
+                  activations: List[np.ndarray], weighted_inputs: List[np.ndarray],
+                  weights: List[np.ndarray], biases: List[np.ndarray]) -> None:
+        """Batched backpropagation; mirrors MultiLayerPerceptron.backward_propagation."""
+        reference = self.members[0]
+        m = X.shape[0]
+        y_reshaped = y.reshape(-1, 1)
+
+        deltas = [activations[-1] - y_reshaped]
+        for i in range(self.n_layers - 2, 0, -1):
+            error = np.matmul(deltas[0], np.swapaxes(weights[i], -1, -2))
+            deltas.insert(0, error * reference.activation_derivative(weighted_inputs[i-1]))
+
+        params = []
+        gradients = []
+        for i in range(self.n_layers - 1):
+            params += [weights[i], biases[i]]
+            gradients.append(np.matmul(np.swapaxes(activations[i], -1, -2), deltas[i]))
+            gradients.append(np.sum(deltas[i], axis=-2, keepdims=True) / m)
+
+        # Weight gradients are batch sums, divided by m in the optimizer step
+        self._optimizer.step(params, gradients, [m, 1] * (self.n_layers - 1))
+
+    @staticmethod
+    def _output_metrics(output: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-member loss and accuracy; mirrors MultiLayerPerceptron._output_metrics."""
+        predictions = output[..., 0]
+        epsilon = 1e-7
+        loss = -np.mean(y * np.log(predictions + epsilon) +
+                        (1 - y) * np.log(1 - predictions + epsilon), axis=-1)
+        accuracy = np.mean((predictions > 0.5).astype(int) == y, axis=-1)
+        return loss, accuracy
+
+    def fit(self, X: np.ndarray, y: np.ndarray,
+            epochs: int = 1000, verbose: bool = False,
+            metric_mode: str = 'fused') -> 'MLPEnsemble':
+        """
+        Train all members simultaneously.
+
+        Members that meet the early stopping criterion are written back and dropped
+        from the stacked arrays, so the remaining work shrinks as the ensemble converges.
+
+        Args:
+            X: Training data of shape (n_samples, n_features)
+            y: Target labels of shape (n_samples,)
+            epochs: Maximum number of training epochs
+            verbose: Whether to print when members converge
+            metric_mode: When to measure loss/accuracy ('fused' or 'pre_update')
+
+        Returns:
+            Self for method chaining
+        """
+        if metric_mode not in ('fused', 'pre_update'):
+            raise ValueError(f"Unknown metric mode: {metric_mode}")
+
+        X = np.asarray(X, dtype=self.dtype)
+        y = np.asarray(y, dtype=self.dtype)
+        weights, biases = self._stack_parameters()
+        self._stack_optimizer_state()
+        active = np.arange(len(self.members))
+        activations, weighted_inputs = self._forward(X, weights, biases)
+
+        def record(epoch: int) -> np.ndarray:
+            """Record metrics for the active members and return the mask of those still training."""
+            loss, accuracy = self._output_metrics(activations[-1], y)
+            keep = np.ones(len(active), dtype=bool)
+            for k, member_index in enumerate(active):
+                member = self.members[member_index]
+                record_epoch(member.history, loss=loss[k], accuracy=accuracy[k])
+                if accuracy[k] == 1.0 and loss[k] < 0.01:
+                    keep[k] = False
+                    if verbose:
+                        print(f"Member {member_index} (seed {self.random_seeds[member_index]}) "
+                              f"converged at epoch {epoch}")
+            return keep
+
+        for epoch in range(epochs):
+            if metric_mode == 'pre_update':
+                keep = record(epoch)
+                if not keep.all():
+                    weights, biases, activations, weighted_inputs, active = self._retire(
+                        keep, active, weights, biases, activations, weighted_inputs)
+                    if len(active) == 0:
+                        break
+
+            self._backward(X, y, activations, weighted_inputs, weights, biases)
+
+            if metric_mode == 'fused' or epoch < epochs - 1:
+                activations, weighted_inputs = self._forward(X, weights, biases)
+
+            if metric_mode == 'fused':
+                keep = record(epoch)
+                if not keep.all():
+                    weights, biases, activations, weighted_inputs, active = self._retire(
+                        keep, active, weights, biases, activations, weighted_inputs)
+                    if len(active) == 0:
+                        break
+
+        self._write_back(active, weights, biases)
+        return self
+
+    def _retire(self, keep: np.ndarray, active: np.ndarray,
+                weights: List[np.ndarray], biases: List[np.ndarray],
+                activations: List[np.ndarray], weighted_inputs: List[np.ndarray]):
+        """Write back converged members and drop them from the stacked arrays."""
+        self._write_back(active[~keep], [w[~keep] for w in weights], [b[~keep] for b in biases])
+
+        weights = [w[keep] for w in weights]
+        biases = [b[keep] for b in biases]
+        self._optimizer.state = {name: [a[keep] for a in arrays]
+                                 for name, arrays in self._optimizer.state.items()}
+        # The input layer is shared by all members and is not stacked
+        activations = [activations[0]] + [a[keep] for a in activations[1:]]
+        weighted_inputs = [z[keep] for z in weighted_inputs]
+        return weights, biases, activations, weighted_inputs, active[keep]
+
+    def _write_back(self, members: np.ndarray,
+                    weights: List[np.ndarray], biases: List[np.ndarray]) -> None:
+        """Copy stacked parameters and optimizer state back into the member models."""
+        for k, member_index in enumerate(members):
+            member = self.members[member_index]
+            member._store_parameters([w[k].copy() for w in weights], [b[k].copy() for b in biases])
+            member.optimizer.iterations = self._optimizer.iterations
+            member.optimizer.state = {name: [a[k].copy() for a in arrays]
+                                      for name, arrays in self._optimizer.state.items()}
+
+    def parameter_matrix(self) -> np.ndarray:
+        """
+        Return the flat parameter vectors of all members.
+
+        Returns:
+            Array of shape (n_members, n_params)
+        """
+        return np.stack([member.get_params() for member in self.members])
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict probabilities for every member.
+
+        Args:
+            X: Input data of shape (n_samples, n_features)
+
+        Returns:
+            Predicted probabilities of shape (n_members, n_samples)
+        """
+        weights, biases = self._stack_parameters()
+        activations, _ = self._forward(np.asarray(X, dtype=self.dtype), weights, biases)
+        return activations[-1][..., 0]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Make binary predictions for every member.
+
+        Args:
+            X: Input data of shape (n_samples, n_features)
+
+        Returns:
+            Binary predictions of shape (n_members, n_samples)
+        """
+        return (self.predict_proba(X) > 0.5).astype(int)
+
+
+def average_parameters(models: List[MultiLayerPerceptron]) -> np.ndarray:
+    """
+    Average the parameters of several models with the same architecture.
+
+    Args:
+        models: Trained models (e.g. the members of an MLPEnsemble)
+
+    Returns:
+        Flat mean parameter vector, usable with MultiLayerPerceptron.set_params
+    """
+    return np.mean(np.stack([model.get_params() for model in models]), axis=0)
+
+
+def predict_proba_stacked(models: List[MultiLayerPerceptron], X: np.ndarray,
+                          chunk_size: Optional[int] = 4096) -> np.ndarray:
+    """
+    Predict probabilities of several models with the same architecture at once.
+
+    The models' parameters are stacked so that each layer is one batched matrix
+    product for all models. Like MultiLayerPerceptron.predict_batch, layers
+    alternate between two scratch buffers and chunks of X bound their size.
+
+    Args:
+        models: Models sharing layer sizes, activation and dtype
+        X: Input data of shape (n_samples, n_features)
+        chunk_size: Maximum number of samples evaluated at once (None for all)
+
+    Returns:
+        Predicted probabilities of shape (n_models, n_samples)
+    """
+    reference = models[0]
+    if any(model.layer_sizes != reference.layer_sizes or
+           model.activation_name != reference.activation_name or
+           model.dtype != reference.dtype for model in models):
+        raise ValueError("Stacked prediction requires models with the same architecture")
+
+    dtype = reference.dtype
+    X = np.asarray(X, dtype=dtype)
+    n_models = len(models)
+    n_layers = len(reference.weights)
+    weights = [np.stack([model.weights[i] for model in models]) for i in range(n_layers)]
+    biases = [np.stack([model.biases[i] for model in models]) for i in range(n_layers)]
+
+    chunk_size = min(chunk_size or len(X), len(X)) or 1
+    width = max(reference.layer_sizes[1:])
+    buffers = (np.empty(n_models * chunk_size * width, dtype=dtype),
+               np.empty(n_models * chunk_size * width, dtype=dtype))
+    probabilities = np.empty((n_models, len(X)), dtype=dtype)
+
+    for start in range(0, len(X), chunk_size):
+        a = X[start:start + chunk_size]
+        n = len(a)
+        for i in range(n_layers):
+            fan_out = weights[i].shape[2]
+            z = buffers[i % 2][:n_models * n * fan_out].reshape(n_models, n, fan_out)
+            np.matmul(a, weights[i], out=z)
+            z += biases[i]
+            if i < n_layers - 1:
+                reference._activation_into(z, z)
+                a = z
+            else:
+                reference._sigmoid_into(z, z)
+                probabilities[:, start:start + n] = z[..., 0]
+    return probabilities
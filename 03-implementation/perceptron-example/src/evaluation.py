@@ -5,33 +5,69 @@ Provides functions for systematic evaluation and statistical analysis.
 """
 
 import numpy as np
-from typing import Dict, List, Tuple, Any, Optional
+from typing import Dict, List, Tuple, Any, Optional, Callable
 import time
-from scipy import stats
+import os
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
 
+from .cache import ResultCache
+from .ensemble import MLPEnsemble
+from .history import epochs_trained, history_record
+from .multi_layer_perceptron import MultiLayerPerceptron
+from .sequential import SequentialTest
+from .streaming import RunningStatistics
 
-def evaluate_model(model: Any, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+
+# Environment variables honoured by the common BLAS/OpenMP backends
+_BLAS_THREAD_VARIABLES = (
+    'OMP_NUM_THREADS',
+    'OPENBLAS_NUM_THREADS',
+    'MKL_NUM_THREADS',
+    'VECLIB_MAXIMUM_THREADS',
+    'NUMEXPR_NUM_THREADS'
+)
+
+# Seeds trained at a time by run_experiment(keep_runs=False)
+_STREAM_BLOCK_SIZE = 256
+
+
+def evaluate_model(model: Any, X: np.ndarray, y: np.ndarray,
+                   chunk_size: Optional[int] = None) -> Dict[str, float]:
     """
     Evaluate a model's performance on given data.
     
     Args:
         model: Trained model with predict method
         X: Input data
-        y: Target labels
+        y: Target labels (0 or 1)
+        chunk_size: Optional number of samples predicted at a time, so that a
+            large test set is evaluated in bounded memory
         
     Returns:
         Dictionary of evaluation metrics
     """
-    predictions = model.predict(X)
+    y = np.asarray(y)
+    n_samples = len(y)
+    step = chunk_size or max(n_samples, 1)
     
-    # Calculate metrics
-    accuracy = np.mean(predictions == y)
+    # Confusion counts in one pass: 2 * label + prediction indexes
+    # [TN, FP, FN, TP]
+    counts = np.zeros(4, dtype=np.int64)
+    for start in range(0, n_samples, step):
+        predictions = np.ravel(model.predict(X[start:start + step]))
+        labels = y[start:start + step].ravel()
+        for name, values in (('Labels', labels), ('Predictions', predictions)):
+            if not np.all((values == 0) | (values == 1)):
+                raise ValueError(f"{name} must be binary (0 or 1), got values "
+                                 f"{np.unique(values)[:5].tolist()}")
+        codes = 2 * labels.astype(np.intp) + predictions.astype(np.intp)
+        counts += np.bincount(codes, minlength=4)
+    true_negatives, false_positives, false_negatives, true_positives = counts
     
-    # Calculate confusion matrix elements
-    true_positives = np.sum((predictions == 1) & (y == 1))
-    true_negatives = np.sum((predictions == 0) & (y == 0))
-    false_positives = np.sum((predictions == 1) & (y == 0))
-    false_negatives = np.sum((predictions == 0) & (y == 1))
+    # Calculate metrics
+    accuracy = (true_positives + true_negatives) / n_samples
     
     # Calculate additional metrics
     precision = true_positives / (true_positives + false_positives) if (true_positives + false_positives) > 0 else 0
@@ -58,10 +94,39 @@ def run_experiment(model_class: type,
                   y_test: np.ndarray,
                   training_params: dict,
                   n_runs: int = 10,
-                  random_seeds: Optional[List[int]] = None) -> Dict[str, Any]:
+                  random_seeds: Optional[List[int]] = None,
+                  batched: bool = False,
+                  n_jobs: Optional[int] = None,
+                  executor: Optional[Executor] = None,
+                  cache: Optional[ResultCache] = None,
+                  sequential: Optional[SequentialTest] = None,
+                  keep_runs: bool = True) -> Dict[str, Any]:
     """
     Run multiple experimental trials with different random seeds.
     
+    Seeds can be spread across processes with ``n_jobs`` (-1 uses every core) or
+    a caller-supplied ``executor``. Results are returned in seed order with the
+    same structure as a serial run.
+    
+    With ``batched=True`` all seeds of a MultiLayerPerceptron experiment are
+    trained together by an MLPEnsemble. The trained models are identical to the
+    sequential ones; each run is assigned an equal share of the total training time.
+    
+    With a ``cache``, runs whose model, parameters, data, seed and model source are
+    unchanged are loaded from it (including their recorded training time) and only
+    the remaining seeds are trained.
+    
+    With a ``sequential`` test, seeds are trained in batches and the sweep stops
+    as soon as the test's hypothesis (e.g. mean accuracy > 0.9) is settled; the
+    results then cover the completed runs only, and ``results['sequential']``
+    records the decision and the stopping reason.
+    
+    The statistics are aggregated run by run (see RunningStatistics). With
+    ``keep_runs=False`` the per-run lists and histories are not stored and seeds
+    are trained in blocks of ``_STREAM_BLOCK_SIZE``, so a sweep of any length is
+    summarised in constant memory (sequential sweeps still keep the runs they
+    test).
+    
     Args:
         model_class: Class of the model to instantiate
         model_params: Parameters for model initialization
@@ -72,12 +137,21 @@ def run_experiment(model_class: type,
         training_params: Parameters for fit method
         n_runs: Number of experimental runs
         random_seeds: Optional list of random seeds
+        batched: Whether to train all seeds at once as a vectorized ensemble
+        n_jobs: Number of worker processes (None or 1 runs serially, -1 uses all cores);
+            with an executor, the number of its workers (by default the number of cores),
+            which sets how batched seeds are split into tasks
+        executor: Optional executor to submit runs to instead of a new process pool
+        cache: Optional store of per-seed run records with ``key``/``get``/``put``
+            methods, such as a ResultCache or an ExperimentJournal
+        sequential: Optional SequentialTest allowing the sweep to stop early
+        keep_runs: Whether to return the per-run lists alongside the statistics
         
     Returns:
         Dictionary containing experimental results and statistics
     """
     if random_seeds is None:
-        random_seeds = list(range(42, 42 + n_runs))
+        random_seeds = range(42, 42 + n_runs)
     
     results = {
         'accuracies': [],
@@ -90,56 +164,282 @@ def run_experiment(model_class: type,
         'histories': []
     }
     
-    for seed in random_seeds[:n_runs]:
-        # Initialize model with seed
-        params = model_params.copy()
-        params['random_seed'] = seed
-        model = model_class(**params)
+    seeds = random_seeds[:n_runs]
+    
+    def collect(seeds: List[int]) -> List[Dict[str, Any]]:
+        """Run records of the given seeds, in seed order, from the cache or training."""
+        cached_runs = {}
+        if cache is not None:
+            keys = {seed: cache.key(model_class, model_params, X_train, y_train, X_test, y_test,
+                                    training_params, seed)
+                    for seed in seeds}
+            for seed in seeds:
+                record = cache.get(keys[seed])
+                if record is not None:
+                    cached_runs[seed] = record
+        missing_seeds = [seed for seed in seeds if seed not in cached_runs]
         
-        # Train model
-        start_time = time.time()
-        model.fit(X_train, y_train, **training_params)
-        training_time = time.time() - start_time
+        # Store every run as soon as it is available, so an interrupted experiment
+        # resumes from its last completed seed
+        on_run = None if cache is None else lambda run: cache.put(keys[run['seed']], run)
         
-        # Evaluate on test set
-        metrics = evaluate_model(model, X_test, y_test)
+        if not missing_seeds:
+            new_runs = []
+        elif n_jobs in (None, 1) and executor is None:
+            new_runs = _run_seeds(model_class, model_params, X_train, y_train, X_test, y_test,
+                                  training_params, missing_seeds, batched, on_run)
+        else:
+            new_runs = _run_seeds_in_parallel(model_class, model_params, X_train, y_train,
+                                              X_test, y_test, training_params, missing_seeds,
+                                              batched, n_jobs, executor, on_run)
+        
+        new_runs = iter(new_runs)
+        return [cached_runs[seed] if seed in cached_runs else next(new_runs) for seed in seeds]
+    
+    accuracy = RunningStatistics()
+    training_time = RunningStatistics(quantiles=())
+    converged = RunningStatistics(quantiles=())
+    final_epochs = RunningStatistics(quantiles=())
+    
+    def record(run: Dict[str, Any]) -> None:
+        metrics = run['metrics']
+        accuracy.update(metrics['accuracy'])
+        training_time.update(run['training_time'])
+        converged.update(metrics['accuracy'] == 1.0)
+        final_epochs.update(run['final_epochs'])
         
         # Store results
-        results['accuracies'].append(metrics['accuracy'])
-        results['precisions'].append(metrics['precision'])
-        results['recalls'].append(metrics['recall'])
-        results['f1_scores'].append(metrics['f1_score'])
-        results['training_times'].append(training_time)
-        results['final_epochs'].append(len(model.history['accuracy']))
-        results['converged'].append(metrics['accuracy'] == 1.0)
-        results['histories'].append(model.history)
+        if keep_runs:
+            results['accuracies'].append(metrics['accuracy'])
+            results['precisions'].append(metrics['precision'])
+            results['recalls'].append(metrics['recall'])
+            results['f1_scores'].append(metrics['f1_score'])
+            results['training_times'].append(run['training_time'])
+            results['final_epochs'].append(run['final_epochs'])
+            results['converged'].append(metrics['accuracy'] == 1.0)
+            results['histories'].append(run['history'])
+    
+    if sequential is not None:
+        runs, results['sequential'] = _run_sequentially(sequential, collect, seeds)
+        for run in runs:
+            record(run)
+    else:
+        block_size = len(seeds) if keep_runs else _STREAM_BLOCK_SIZE
+        for start in range(0, len(seeds), max(block_size, 1)):
+            for run in collect(seeds[start:start + block_size]):
+                record(run)
     
     # Calculate statistics
     results['statistics'] = {
-        'accuracy': {
-            'mean': np.mean(results['accuracies']),
-            'std': np.std(results['accuracies']),
-            'min': np.min(results['accuracies']),
-            'max': np.max(results['accuracies']),
-            'median': np.median(results['accuracies'])
-        },
-        'training_time': {
-            'mean': np.mean(results['training_times']),
-            'std': np.std(results['training_times']),
-            'min': np.min(results['training_times']),
-            'max': np.max(results['training_times'])
-        },
-        'convergence_rate': np.mean(results['converged']),
-        'avg_epochs_to_converge': np.mean(results['final_epochs'])
+        'accuracy': accuracy.summary(),
+        'training_time': training_time.summary(),
+        'convergence_rate': converged.mean,
+        'avg_epochs_to_converge': final_epochs.mean
     }
     
     return results
 
 
+def _run_sequentially(test: SequentialTest,
+                      collect: Callable[[List[int]], List[Dict[str, Any]]],
+                      seeds: List[int]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Collect runs batch by batch until the sequential test reaches a decision.
+    
+    Returns:
+        The completed runs and a record of the test's looks and stopping reason
+    """
+    looks = test.looks(len(seeds))
+    runs = []
+    intervals = []
+    for end in looks:
+        runs += collect(seeds[len(runs):end])
+        outcome = test.evaluate([run['metrics'][test.metric] for run in runs], len(looks))
+        intervals.append((outcome['low'], outcome['high']))
+        if outcome['decision'] is not None:
+            break
+    
+    interval = (f"{outcome['confidence']:.1%} interval "
+                f"[{outcome['low']:.4g}, {outcome['high']:.4g}]")
+    if outcome['decision'] is None:
+        reason = f"all {len(runs)} runs completed without a decision ({interval})"
+    else:
+        reason = f"{test.describe()} {outcome['decision']} after {len(runs)} runs ({interval})"
+    
+    return runs, {
+        'hypothesis': test.describe(),
+        'decision': outcome['decision'],
+        'stopped_early': len(runs) < len(seeds),
+        'reason': reason,
+        'looks': looks[:len(intervals)],
+        'intervals': intervals,
+        'planned_runs': len(seeds)
+    }
+
+
+def _run_seeds(model_class: type,
+               model_params: dict,
+               X_train: np.ndarray,
+               y_train: np.ndarray,
+               X_test: np.ndarray,
+               y_test: np.ndarray,
+               training_params: dict,
+               seeds: List[int],
+               batched: bool = False,
+               on_run: Optional[Callable[[Dict[str, Any]], None]] = None) -> List[Dict[str, Any]]:
+    """
+    Train and evaluate one model per seed.
+    
+    This is also the unit of work executed by worker processes, so it only
+    returns plain run records (no model objects). ``on_run`` is called with each
+    record as soon as its model has been trained.
+    
+    Returns:
+        One record per seed with its metrics, training time, epochs and history
+    """
+    if batched:
+        trained_models = _train_ensemble(model_class, model_params, X_train, y_train,
+                                         training_params, seeds)
+    else:
+        trained_models = _train_sequentially(model_class, model_params, X_train, y_train,
+                                             training_params, seeds)
+    
+    runs = []
+    for seed, (model, training_time) in zip(seeds, trained_models):
+        # Evaluate on test set
+        runs.append({
+            'seed': seed,
+            'metrics': evaluate_model(model, X_test, y_test),
+            'training_time': training_time,
+            'final_epochs': epochs_trained(model.history),
+            'history': history_record(model.history)
+        })
+        if on_run is not None:
+            on_run(runs[-1])
+    
+    return runs
+
+
+def _run_seeds_in_parallel(model_class: type,
+                           model_params: dict,
+                           X_train: np.ndarray,
+                           y_train: np.ndarray,
+                           X_test: np.ndarray,
+                           y_test: np.ndarray,
+                           training_params: dict,
+                           seeds: List[int],
+                           batched: bool,
+                           n_jobs: Optional[int],
+                           executor: Optional[Executor],
+                           on_run: Optional[Callable[[Dict[str, Any]], None]] = None
+                           ) -> List[Dict[str, Any]]:
+    """
+    Spread seeds across worker processes, returning run records in seed order.
+    
+    Unbatched runs are submitted one seed per task; batched runs are split into
+    one contiguous ensemble per worker. ``on_run`` is called in the parent process
+    with each record as its task completes.
+    """
+    if n_jobs == -1 or (n_jobs is None and executor is not None):
+        n_workers = os.cpu_count() or 1
+    else:
+        n_workers = n_jobs
+    if not isinstance(n_workers, int) or n_workers < 1:
+        raise ValueError(f"n_jobs must be a positive integer or -1, got {n_jobs}")
+    
+    if batched:
+        tasks = [list(chunk) for chunk in np.array_split(seeds, min(n_workers, len(seeds)))]
+        tasks = [[int(seed) for seed in chunk] for chunk in tasks if len(chunk) > 0]
+    else:
+        tasks = [[seed] for seed in seeds]
+    
+    def collect(pool: Executor) -> List[Dict[str, Any]]:
+        futures = [pool.submit(_run_seeds, model_class, model_params, X_train, y_train,
+                               X_test, y_test, training_params, task, batched)
+                   for task in tasks]
+        if on_run is not None:
+            for future in as_completed(futures):
+                for run in future.result():
+                    on_run(run)
+        # Futures are collected in submission order, so results stay deterministic
+        return [run for future in futures for run in future.result()]
+    
+    if executor is not None:
+        return collect(executor)
+    
+    with _single_threaded_blas():
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks)),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            return collect(pool)
+
+
+@contextmanager
+def _single_threaded_blas():
+    """
+    Pin BLAS/OpenMP libraries to one thread in worker processes started inside this block.
+    
+    The variables must be set before a worker imports numpy, so they are exported
+    in the parent while workers are spawned (spawned workers inherit the environment).
+    """
+    saved = {name: os.environ.get(name) for name in _BLAS_THREAD_VARIABLES}
+    os.environ.update({name: '1' for name in _BLAS_THREAD_VARIABLES})
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _train_sequentially(model_class: type,
+                        model_params: dict,
+                        X_train: np.ndarray,
+                        y_train: np.ndarray,
+                        training_params: dict,
+                        seeds: List[int]):
+    """Train one model per seed, yielding (model, training_time) pairs."""
+    for seed in seeds:
+        # Initialize model with seed
+        params = model_params.copy()
+        params['random_seed'] = seed
+        model = model_class(**params)
+        
+        # Train model
+        start_time = time.perf_counter()
+        model.fit(X_train, y_train, **training_params)
+        training_time = time.perf_counter() - start_time
+        
+        yield model, training_time
+
+
+def _train_ensemble(model_class: type,
+                    model_params: dict,
+                    X_train: np.ndarray,
+                    y_train: np.ndarray,
+                    training_params: dict,
+                    seeds: List[int]) -> List[Tuple[Any, float]]:
+    """Train all seeds at once, returning (model, training_time) pairs."""
+    if model_class is not MultiLayerPerceptron:
+        raise ValueError(f"Batched training is only supported for MultiLayerPerceptron, "
+                         f"not {model_class.__name__}")
+    
+    start_time = time.perf_counter()
+    ensemble = MLPEnsemble(random_seeds=seeds, **model_params)
+    ensemble.fit(X_train, y_train, **training_params)
+    training_time = (time.perf_counter() - start_time) / len(seeds)
+    
+    return [(model, training_time) for model in ensemble.members]
+
+
 def compare_architectures(architectures: Dict[str, List[int]],
                          X: np.ndarray,
                          y: np.ndarray,
-                         n_runs: int = 10) -> Dict[str, Any]:
+                         n_runs: int = 10,
+                         batched: bool = False,
+                         n_jobs: Optional[int] = None,
+                         cache: Optional[ResultCache] = None) -> Dict[str, Any]:
     """
     Compare different multi-layer perceptron architectures.
     
@@ -148,12 +448,13 @@ def compare_architectures(architectures: Dict[str, List[int]],
         X: Input data
         y: Target labels
         n_runs: Number of runs per architecture
+        batched: Whether to train the seeds of each architecture as one vectorized ensemble
+        n_jobs: Number of worker processes per architecture (see run_experiment)
+        cache: Optional ResultCache shared by all architectures
         
     Returns:
         Comparison results
     """
-    from .multi_layer_perceptron import MultiLayerPerceptron
-    
     results = {}
     
     for arch_name, layer_sizes in architectures.items():
@@ -167,7 +468,10 @@ def compare_architectures(architectures: Dict[str, List[int]],
             X_test=X,
             y_test=y,
             training_params={'epochs': 1000, 'verbose': False},
-            n_runs=n_runs
+            n_runs=n_runs,
+            batched=batched,
+            n_jobs=n_jobs,
+            cache=cache
         )
         
         results[arch_name] = exp_results
@@ -189,6 +493,9 @@ def statistical_hypothesis_test(results1: List[float],
     Returns:
         Dictionary with test statistics and p-value
     """
+    # Imported here so that worker processes running experiments skip scipy
+    from scipy import stats
+    
     if test_type == 'paired':
         # Paired t-test for dependent samples
         statistic, p_value = stats.ttest_rel(results1, results2)
@@ -0,0 +1,164 @@
+"""
+Compact Training History Recording
+
+By default the models record their history as a dictionary of Python lists,
+one entry per epoch. Passing a TrainingHistory to a model instead records the
+selected fields into preallocated numpy arrays that grow geometrically, every
+``stride``-th epoch, or only the final values in summary mode.
+"""
+
+import numpy as np
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Optional, Sequence, Union
+
+
+class TrainingHistory(Mapping):
+    """
+    Per-epoch training metrics stored in growable numpy arrays.
+
+    Reads like the models' history dictionary: ``history['loss']`` is an array
+    of the recorded values. The values of the last epoch are always included,
+    even when it does not fall on the stride, and ``history['epochs']`` holds
+    the epoch index of every recorded row.
+    """
+
+    def __init__(self, fields: Optional[Sequence[str]] = None, stride: int = 1,
+                 summary_only: bool = False, capacity: int = 64):
+        """
+        Create an empty recorder.
+
+        Args:
+            fields: Names of the fields to record (e.g. ['loss']); None records all
+            stride: Record every stride-th epoch (epoch 0, stride, 2*stride, ...)
+            summary_only: Keep only the values of the last epoch
+            capacity: Number of rows allocated before the first growth
+        """
+        if stride < 1 or capacity < 1:
+            raise ValueError("stride and capacity must be positive")
+        self.fields = None if fields is None else tuple(fields)
+        self.stride = stride
+        self.summary_only = summary_only
+        self.capacity = capacity
+        self.n_epochs = 0
+        self.metadata: Dict[str, Any] = {}
+
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._epochs = np.empty(capacity, dtype=np.int64)
+        self._size = 0
+        self._last: Dict[str, Any] = {}
+
+    def empty(self) -> 'TrainingHistory':
+        """Return an empty recorder with the same configuration."""
+        return TrainingHistory(self.fields, self.stride, self.summary_only, self.capacity)
+
+    def record(self, **values: Any) -> None:
+        """
+        Record the values of one epoch.
+
+        Args:
+            **values: Field values (scalars or arrays of a fixed shape)
+        """
+        epoch = self.n_epochs
+        self.n_epochs += 1
+        if self.fields is not None:
+            values = {name: v for name, v in values.items() if name in self.fields}
+
+        if self.summary_only or epoch % self.stride:
+            # Kept aside so that the last epoch can always be reported
+            self._last = {name: np.array(v) for name, v in values.items()}
+            return
+
+        self._last = {}
+        if self._size == len(self._epochs):
+            self._grow()
+        for name, value in values.items():
+            array = self._arrays.get(name)
+            if array is None:
+                value = np.asarray(value)
+                # Floating values keep their precision (float32 weights stay float32)
+                dtype = value.dtype if np.issubdtype(value.dtype, np.floating) else np.float64
+                array = self._arrays[name] = np.empty((len(self._epochs),) + value.shape,
+                                                      dtype=dtype)
+            array[self._size] = value
+        self._epochs[self._size] = epoch
+        self._size += 1
+
+    def _grow(self) -> None:
+        """Double the capacity of every array."""
+        capacity = 2 * len(self._epochs)
+        for name, array in self._arrays.items():
+            grown = np.empty((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:self._size] = array[:self._size]
+            self._arrays[name] = grown
+        epochs = np.empty(capacity, dtype=np.int64)
+        epochs[:self._size] = self._epochs[:self._size]
+        self._epochs = epochs
+
+    @property
+    def epochs(self) -> np.ndarray:
+        """Epoch index of every recorded row."""
+        if self._last:
+            return np.append(self._epochs[:self._size], self.n_epochs - 1)
+        return self._epochs[:self._size]
+
+    def __getitem__(self, name: str) -> Any:
+        if name in self.metadata:
+            return self.metadata[name]
+        if name == 'epochs' and (self._size or self._last):
+            return self.epochs
+        if name not in self._arrays and name not in self._last:
+            raise KeyError(name)
+        if name not in self._arrays:
+            return self._last[name][np.newaxis]
+        values = self._arrays[name][:self._size]
+        if self._last:
+            return np.concatenate([values, self._last[name][np.newaxis]])
+        return values
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        """Store a constant (e.g. the update rule) alongside the recorded fields."""
+        self.metadata[name] = value
+
+    def __iter__(self) -> Iterator[str]:
+        names = list(self._arrays) + list(self._last)
+        if names:
+            names.append('epochs')
+        return iter(dict.fromkeys(names + list(self.metadata)))
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dictionary of the recorded arrays, the epoch indices and the constants."""
+        history = {name: np.array(self[name]) for name in self if name not in self.metadata}
+        history.update(self.metadata)
+        return history
+
+
+def record_epoch(history: Union[Dict[str, list], TrainingHistory], **values: Any) -> None:
+    """
+    Append the values of one epoch to a history dictionary or a TrainingHistory.
+
+    Arrays are copied, since models pass their live parameter arrays.
+    """
+    if isinstance(history, TrainingHistory):
+        history.record(**values)
+        return
+    for name, value in values.items():
+        if isinstance(value, np.ndarray):
+            value = value.copy()
+        history.setdefault(name, []).append(value)
+
+
+def epochs_trained(history: Union[Dict[str, list], TrainingHistory]) -> int:
+    """Number of epochs a model has been trained for, whatever its history format."""
+    if isinstance(history, TrainingHistory):
+        return history.n_epochs
+    return len(history['accuracy'])
+
+
+def history_record(history: Union[Dict[str, list], TrainingHistory]) -> Dict[str, Any]:
+    """History in the plain dictionary form stored in run records."""
+    if isinstance(history, TrainingHistory):
+        return history.to_dict()
+    return history
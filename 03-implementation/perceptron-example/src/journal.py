@@ -0,0 +1,133 @@
+"""
+Append-Only Experiment Journal
+
+Records every completed experimental run as one JSON line, flushed to disk
+before the next run starts. Reopening the journal after a crash or preemption
+replays it, so ``run_experiment(..., cache=journal)`` only trains the runs that
+had not finished.
+"""
+
+import json
+import os
+from typing import Any, Dict, Optional
+
+from .cache import ResultCache, run_key
+from .serialization import to_json
+
+
+class ExperimentJournal:
+    """
+    Append-only JSON Lines log of completed runs.
+
+    Each line holds the run key, the experiment name and the run record. A
+    truncated last line (from a process killed mid-write) is ignored on replay
+    and its run is trained again. An optional ResultCache is consulted for runs
+    that are not yet journaled (unless the journal is fresh) and receives every
+    new run.
+    """
+
+    def __init__(self, path: str, experiment: str = '',
+                 cache: Optional[ResultCache] = None,
+                 fresh: bool = False):
+        """
+        Open a journal, replaying the runs it already contains.
+
+        Args:
+            path: Path of the journal file (created if missing)
+            experiment: Name stored with every entry
+            cache: Optional ResultCache shared with other journals
+            fresh: Discard the existing journal and ignore the runs stored in
+                the cache, so that every run is trained again (new runs still
+                replace their cache entries)
+        """
+        self.path = path
+        self.experiment = experiment
+        self.cache = cache
+        self.fresh = fresh
+        self.hits = 0
+        self.misses = 0
+        self._records: Dict[str, Dict[str, Any]] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if fresh and os.path.exists(path):
+            os.remove(path)
+
+        self._replay()
+
+    def _replay(self) -> None:
+        """Load the completed runs from the journal file."""
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        valid_bytes = 0
+        for line in data.splitlines(keepends=True):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            if not line.endswith(b'\n'):
+                break
+            self._records[entry['key']] = entry['record']
+            valid_bytes += len(line)
+
+        if valid_bytes < len(data):
+            # Drop the partial entry so that new entries start on a fresh line
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_bytes)
+
+    def key(self, *args, **kwargs) -> str:
+        """Compute the key of a single run (see cache.run_key)."""
+        return run_key(*args, **kwargs)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a completed run.
+
+        Args:
+            key: Run key
+
+        Returns:
+            Run record, or None if the run has not been completed
+        """
+        record = self._records.get(key)
+        if record is None and self.cache is not None and not self.fresh:
+            record = self.cache.get(key)
+            if record is not None:
+                # Journal it so that the log alone describes the experiment
+                self._append(key, record)
+
+        if record is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return record
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        """
+        Journal a completed run.
+
+        Args:
+            key: Run key
+            record: Run record
+        """
+        self._append(key, record)
+        if self.cache is not None:
+            self.cache.put(key, record)
+
+    def _append(self, key: str, record: Dict[str, Any]) -> None:
+        line = json.dumps({'key': key, 'experiment': self.experiment, 'record': record},
+                          default=to_json)
+        with open(self.path, 'a') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        # Keep the in-memory copy identical to what a replay would load
+        self._records[key] = json.loads(line)['record']
+
+    def __len__(self) -> int:
+        return len(self._records)
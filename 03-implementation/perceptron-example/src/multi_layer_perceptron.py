@@ -5,8 +5,183 @@ This implements a multi-layer neural network with backpropagation,
 solving the limitations of the single-layer perceptron.
 """
 
+import copy
+import time
 import numpy as np
-from typing import List, Tuple, Optional, Callable
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+
+from .history import TrainingHistory, record_epoch
+from .optimizers import Optimizer, make_optimizer
+from .profiling import FitProfiler
+
+
+def _parameter_shapes(layer_sizes: List[int]) -> List[Tuple[int, int]]:
+    """Shapes of the network parameters in storage order [W0, b0, W1, b1, ...]."""
+    shapes = []
+    for i in range(len(layer_sizes) - 1):
+        shapes.append((layer_sizes[i], layer_sizes[i+1]))
+        shapes.append((1, layer_sizes[i+1]))
+    return shapes
+
+
+def _split_flat(flat: np.ndarray, shapes: List[Tuple[int, int]]) -> List[np.ndarray]:
+    """Split a flat vector into zero-copy views with the given shapes."""
+    views = []
+    offset = 0
+    for shape in shapes:
+        size = shape[0] * shape[1]
+        views.append(flat[offset:offset + size].reshape(shape))
+        offset += size
+    return views
+
+
+def _column_sums(a: np.ndarray, out: np.ndarray) -> None:
+    """
+    Column sums of a 2-D array into out, without temporary arrays.
+    
+    The additions happen in the same order as in np.sum(a, axis=0), so bias
+    gradients (and training histories) match the original np.mean exactly:
+    a single column uses NumPy's pairwise reduction (which needs no buffer),
+    wider arrays are summed row by row by einsum (np.sum would allocate a
+    reduction buffer for them).
+    """
+    if a.shape[1] == 1:
+        np.add.reduce(a, axis=0, out=out)
+    else:
+        np.einsum('ij->j', a, out=out)
+
+
+class _WorkspaceViews:
+    """Buffers of a TrainingWorkspace restricted to the first n_samples rows."""
+    
+    def __init__(self, workspace: 'TrainingWorkspace', n_samples: int):
+        self.n_samples = n_samples
+        # Slot 0 holds the input batch and is filled in on every forward pass
+        self.activations = [None] + [a[:n_samples] for a in workspace.activations]
+        self.weighted_inputs = [z[:n_samples] for z in workspace.weighted_inputs]
+        self.deltas = [d[:n_samples] for d in workspace.deltas]
+        self.derivatives = [d[:n_samples] for d in workspace.derivatives]
+        self.metric_buffers = [b[:n_samples] for b in workspace.metric_buffers]
+        self.hits = [h[:n_samples] for h in workspace.hits]
+
+
+class TrainingWorkspace:
+    """
+    Preallocated buffers for forward and backward propagation.
+    
+    The buffers are sized from the layer sizes and the largest batch they must hold,
+    and are reused across epochs, so steady-state training writes every intermediate
+    result with ``out=`` ufunc calls instead of allocating new arrays. Batches smaller
+    than the capacity use cached views of the leading rows.
+    """
+    
+    def __init__(self, layer_sizes: List[int], capacity: int, dtype: type = np.float64):
+        """
+        Allocate the buffers.
+        
+        Args:
+            layer_sizes: List of layer sizes [input_size, hidden1, ..., output_size]
+            capacity: Maximum number of samples per batch
+            dtype: Floating point type of the buffers
+        """
+        self.layer_sizes = list(layer_sizes)
+        self.capacity = capacity
+        self.dtype = np.dtype(dtype)
+        
+        self.activations = [np.empty((capacity, n), dtype=dtype) for n in layer_sizes[1:]]
+        self.weighted_inputs = [np.empty((capacity, n), dtype=dtype) for n in layer_sizes[1:]]
+        self.deltas = [np.empty((capacity, n), dtype=dtype) for n in layer_sizes[1:]]
+        # Activation derivatives of the hidden layers
+        self.derivatives = [np.empty((capacity, n), dtype=dtype) for n in layer_sizes[1:-1]]
+        # Scratch space for the loss and accuracy of the output layer
+        self.metric_buffers = np.empty((3, capacity), dtype=dtype)
+        self.hits = np.empty((2, capacity), dtype=bool)
+        
+        # Gradients share one flat buffer laid out like the parameters
+        shapes = _parameter_shapes(layer_sizes)
+        self.gradient = np.zeros(sum(r * c for r, c in shapes), dtype=dtype)
+        self.gradients = _split_flat(self.gradient, shapes)
+        self.weight_gradients = self.gradients[0::2]
+        self.bias_gradients = self.gradients[1::2]
+        # Weight gradients are left as sums over the batch and divided by the
+        # batch size in the optimizer step (bias gradients are already means)
+        self.divisor = np.ones_like(self.gradient)
+        self.divisors = _split_flat(self.divisor, shapes)
+        self.batch_size = 1
+        
+        self._views = {}
+    
+    def fits(self, layer_sizes: List[int], n_samples: int, dtype: type = np.float64) -> bool:
+        """Whether this workspace can hold a batch of n_samples for the given network."""
+        return (list(layer_sizes) == self.layer_sizes and n_samples <= self.capacity
+                and np.dtype(dtype) == self.dtype)
+    
+    def views(self, n_samples: int) -> _WorkspaceViews:
+        """Return (cached) buffer views for a batch of n_samples."""
+        views = self._views.get(n_samples)
+        if views is None:
+            if n_samples > self.capacity:
+                raise ValueError(f"Batch of {n_samples} samples exceeds workspace "
+                                 f"capacity of {self.capacity}")
+            if len(self._views) >= 8:
+                # Streams with ever-changing chunk sizes must not grow the cache
+                self._views.clear()
+            views = self._views[n_samples] = _WorkspaceViews(self, n_samples)
+        return views
+    
+    def set_batch_size(self, n_samples: int) -> None:
+        """Divide the weight gradients by n_samples in the next optimizer step."""
+        if n_samples != self.batch_size:
+            for divisor in self.divisors[0::2]:
+                divisor.fill(n_samples)
+            self.batch_size = n_samples
+
+
+def _inference_chunk_size(layer_sizes: List[int], n_samples: int, dtype: np.dtype,
+                          chunk_size: Optional[int], max_memory: Optional[int]) -> int:
+    """Rows per chunk so that the two inference buffers fit in max_memory bytes."""
+    if chunk_size is not None and chunk_size < 1:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
+    
+    rows = chunk_size or max(n_samples, 1)
+    if max_memory is not None:
+        row_bytes = 2 * max(layer_sizes[1:]) * dtype.itemsize
+        if max_memory < row_bytes:
+            raise ValueError(f"max_memory of {max_memory} bytes cannot hold a single sample "
+                             f"({row_bytes} bytes)")
+        rows = min(rows, max_memory // row_bytes)
+    return rows
+
+
+def _predict_proba_into(X: np.ndarray, weights: List[np.ndarray], biases: List[np.ndarray],
+                        activation_into: Callable[[np.ndarray, np.ndarray], None],
+                        sigmoid_into: Callable[[np.ndarray, np.ndarray], None],
+                        out: np.ndarray, chunk_size: int) -> None:
+    """
+    Inference-only forward pass writing output probabilities into out.
+    
+    Layers alternate between two flat buffers sized for the widest layer, so
+    no per-layer activations or pre-activations are kept.
+    """
+    width = max(w.shape[1] for w in weights)
+    buffers = (np.empty(chunk_size * width, dtype=out.dtype),
+               np.empty(chunk_size * width, dtype=out.dtype))
+    n_layers = len(weights)
+    
+    for start in range(0, len(X), chunk_size):
+        a = X[start:start + chunk_size]
+        n = len(a)
+        for i in range(n_layers):
+            fan_out = weights[i].shape[1]
+            # Contiguous views (np.dot requires a C-contiguous output array)
+            z = buffers[i % 2][:n * fan_out].reshape(n, fan_out)
+            np.dot(a, weights[i], out=z)
+            z += biases[i]
+            if i < n_layers - 1:
+                activation_into(z, z)
+                a = z
+            else:
+                sigmoid_into(z, out[start:start + n].reshape(n, 1))
 
 
 class MultiLayerPerceptron:
@@ -21,7 +196,12 @@ class MultiLayerPerceptron:
                  layer_sizes: List[int],
                  activation: str = 'sigmoid',
                  learning_rate: float = 0.5,
-                 random_seed: Optional[int] = None):
+                 random_seed: Optional[int] = None,
+                 optimizer: Union[str, Optimizer] = 'sgd',
+                 optimizer_params: Optional[dict] = None,
+                 flat_params: bool = False,
+                 dtype: type = np.float64,
+                 history: Optional[TrainingHistory] = None):
         """
         Initialize the multi-layer perceptron.
         
@@ -30,52 +210,96 @@ class MultiLayerPerceptron:
             activation: Activation function ('sigmoid', 'tanh', 'relu')
             learning_rate: Learning rate for backpropagation
             random_seed: Random seed for reproducibility
+            optimizer: Optimizer name ('sgd', 'momentum', 'nesterov', 'rmsprop', 'adam')
+                or an Optimizer instance, which is copied so that it can configure
+                several models (its own learning rate is used)
+            optimizer_params: Additional parameters for a named optimizer
+                (e.g. {'momentum': 0.9, 'schedule': StepDecay(500)})
+            flat_params: Keep all parameters in one contiguous vector (``self.params``)
+                with ``weights[i]``/``biases[i]`` as zero-copy views of it, so that
+                optimizer updates act on the whole vector at once
+            dtype: Floating point type of the parameters and of all training
+                computations (e.g. np.float32); inputs are converted to it
+            history: Recorder configuring which epochs and fields are kept (see
+                TrainingHistory); None keeps every epoch in lists
         """
+        self.dtype = np.dtype(dtype)
+        if not np.issubdtype(self.dtype, np.floating):
+            raise ValueError(f"dtype must be a floating point type, got {self.dtype}")
+        
+        # Largest |x| for which exp(x) is finite in this dtype (500 for float64)
+        self._sigmoid_clip = min(500.0, float(np.floor(np.log(np.finfo(self.dtype).max))))
+        
         self.layer_sizes = layer_sizes
         self.n_layers = len(layer_sizes)
         self.learning_rate = learning_rate
         self.activation_name = activation
+        self.history_template = history
+        
+        if isinstance(optimizer, Optimizer):
+            self.optimizer = copy.deepcopy(optimizer)
+        else:
+            self.optimizer = make_optimizer(optimizer, learning_rate, **(optimizer_params or {}))
         
         if random_seed is not None:
             np.random.seed(random_seed)
         
+        # A seeded model draws its weights from its own legacy generator, which
+        # produces the same values as the seeded global state but is not disturbed
+        # by models created concurrently in other threads
+        self._init_random = np.random.RandomState(random_seed) if random_seed is not None else None
+        
+        # Per-model generator for mini-batch shuffling (independent of the global state)
+        self.rng = np.random.default_rng(random_seed)
+        
         # Initialize weights and biases for each layer
-        self.weights = []
-        self.biases = []
+        shapes = _parameter_shapes(layer_sizes)
+        self.params = (np.empty(sum(r * c for r, c in shapes), dtype=self.dtype)
+                       if flat_params else None)
+        weights = []
+        biases = []
         
         for i in range(self.n_layers - 1):
             # Xavier/Glorot initialization for better convergence
-            w = np.random.randn(layer_sizes[i], layer_sizes[i+1]) * np.sqrt(2.0 / layer_sizes[i])
-            b = np.zeros((1, layer_sizes[i+1]))
-            self.weights.append(w)
-            self.biases.append(b)
+            # (drawn in float64 so that a seed gives the same network in every dtype)
+            w = self._random_source().randn(layer_sizes[i], layer_sizes[i+1]) * np.sqrt(2.0 / layer_sizes[i])
+            w = w.astype(self.dtype, copy=False)
+            b = np.zeros((1, layer_sizes[i+1]), dtype=self.dtype)
+            weights.append(w)
+            biases.append(b)
+        
+        self._store_parameters(weights, biases)
         
         # Set activation functions
         self._set_activation_functions(activation)
         
         # Track training history
-        self.history = {
-            'loss': [],
-            'accuracy': []
-        }
+        self.history = self._new_history()
     
     def _set_activation_functions(self, activation: str) -> None:
         """Set the activation function and its derivative."""
         if activation == 'sigmoid':
             self.activation = self._sigmoid
             self.activation_derivative = self._sigmoid_derivative
+            self._activation_into = self._sigmoid_into
+            self._derivative_from_output = self._sigmoid_derivative_from_output
         elif activation == 'tanh':
             self.activation = self._tanh
             self.activation_derivative = self._tanh_derivative
+            self._activation_into = self._tanh_into
+            self._derivative_from_output = self._tanh_derivative_from_output
         elif activation == 'relu':
             self.activation = self._relu
             self.activation_derivative = self._relu_derivative
+            self._activation_into = self._relu_into
+            self._derivative_from_output = self._relu_derivative_from_output
         else:
             raise ValueError(f"Unknown activation: {activation}")
     
     def _sigmoid(self, x: np.ndarray) -> np.ndarray:
         """Sigmoid activation function."""
-        return 1 / (1 + np.exp(-np.clip(x, -500, 500)))  # Clip to prevent overflow
+        clip = self._sigmoid_clip  # Clip to prevent overflow
+        return 1 / (1 + np.exp(-np.clip(x, -clip, clip)))
     
     def _sigmoid_derivative(self, x: np.ndarray) -> np.ndarray:
         """Derivative of sigmoid function."""
@@ -96,68 +320,231 @@ class MultiLayerPerceptron:
     
     def _relu_derivative(self, x: np.ndarray) -> np.ndarray:
         """Derivative of ReLU function."""
-        return (x > 0).astype(float)
+        return (x > 0).astype(x.dtype)
     
-    def forward_propagation(self, X: np.ndarray) -> Tuple[List[np.ndarray], List[np.ndarray]]:
+    # In-place variants used with a TrainingWorkspace. The derivatives are computed
+    # from the cached activations instead of re-evaluating the activation function.
+    
+    def _sigmoid_into(self, x: np.ndarray, out: np.ndarray) -> None:
+        """Write sigmoid(x) into out."""
+        np.clip(x, -self._sigmoid_clip, self._sigmoid_clip, out=out)
+        np.negative(out, out=out)
+        np.exp(out, out=out)
+        out += 1
+        np.divide(1, out, out=out)
+    
+    def _sigmoid_derivative_from_output(self, s: np.ndarray, out: np.ndarray) -> None:
+        """Write s * (1 - s) into out, where s = sigmoid(x)."""
+        np.subtract(1, s, out=out)
+        out *= s
+    
+    def _tanh_into(self, x: np.ndarray, out: np.ndarray) -> None:
+        """Write tanh(x) into out."""
+        np.tanh(x, out=out)
+    
+    def _tanh_derivative_from_output(self, a: np.ndarray, out: np.ndarray) -> None:
+        """Write 1 - a**2 into out, where a = tanh(x)."""
+        np.multiply(a, a, out=out)
+        np.subtract(1, out, out=out)
+    
+    def _relu_into(self, x: np.ndarray, out: np.ndarray) -> None:
+        """Write max(0, x) into out."""
+        np.maximum(x, 0, out=out)
+    
+    def _relu_derivative_from_output(self, a: np.ndarray, out: np.ndarray) -> None:
+        """Write the ReLU derivative into out, where a = relu(x) >= 0."""
+        np.sign(a, out=out)
+    
+    def _get_workspace(self, n_samples: int) -> TrainingWorkspace:
+        """Return the model's cached workspace, reallocating it if it is too small."""
+        workspace = getattr(self, '_workspace', None)
+        if workspace is None or not workspace.fits(self.layer_sizes, n_samples, self.dtype):
+            workspace = self._workspace = TrainingWorkspace(self.layer_sizes, n_samples,
+                                                            self.dtype)
+        return workspace
+    
+    def __getstate__(self) -> dict:
+        # Workspaces are scratch space; don't ship them to worker processes or caches
+        state = self.__dict__.copy()
+        state.pop('_workspace', None)
+        if self.params is not None:
+            # Views would be pickled as independent copies; rebuild them instead
+            state.pop('weights')
+            state.pop('biases')
+        return state
+    
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        if self.params is not None:
+            views = _split_flat(self.params, _parameter_shapes(self.layer_sizes))
+            self.weights = views[0::2]
+            self.biases = views[1::2]
+    
+    def _store_parameters(self, weights: List[np.ndarray], biases: List[np.ndarray]) -> None:
+        """Install new parameter values, copying them into the flat vector if there is one."""
+        if self.params is None:
+            self.weights = weights
+            self.biases = biases
+            return
+        
+        views = _split_flat(self.params, _parameter_shapes(self.layer_sizes))
+        for view, value in zip(views, [p for pair in zip(weights, biases) for p in pair]):
+            view[...] = value
+        self.weights = views[0::2]
+        self.biases = views[1::2]
+    
+    def get_params(self) -> np.ndarray:
+        """
+        Return a copy of all parameters as one flat vector.
+        
+        Returns:
+            Vector in storage order [W0, b0, W1, b1, ...] (row-major within each array)
+        """
+        if self.params is not None:
+            return self.params.copy()
+        return np.concatenate([p.ravel() for p in self.parameters()])
+    
+    def set_params(self, params: np.ndarray) -> None:
+        """
+        Set all parameters from a flat vector (as returned by get_params).
+        
+        Args:
+            params: Parameter vector in storage order
+        """
+        params = np.asarray(params)
+        shapes = _parameter_shapes(self.layer_sizes)
+        if params.shape != (sum(r * c for r, c in shapes),):
+            raise ValueError(f"Expected a parameter vector of length "
+                             f"{sum(r * c for r, c in shapes)}, got shape {params.shape}")
+        
+        if self.params is not None:
+            self.params[...] = params
+        else:
+            for view, value in zip(self.parameters(), _split_flat(params, shapes)):
+                view[...] = value
+    
+    def save_params(self, path: str) -> None:
+        """Save the flat parameter vector to a .npy file."""
+        np.save(path, self.params if self.params is not None else self.get_params())
+    
+    def load_params(self, path: str) -> None:
+        """Load parameters saved with save_params."""
+        self.set_params(np.load(path))
+    
+    def gradient_norm(self) -> float:
+        """
+        Euclidean norm of the most recent training gradient.
+        
+        Returns:
+            Norm of the full gradient vector of the last update
+        """
+        workspace = getattr(self, '_workspace', None)
+        if workspace is None:
+            raise ValueError("No gradient has been computed yet")
+        return float(np.linalg.norm(workspace.gradient))
+    
+    def forward_propagation(self, X: np.ndarray,
+                            workspace: Optional[TrainingWorkspace] = None
+                            ) -> Tuple[List[np.ndarray], List[np.ndarray]]:
         """
         Perform forward propagation through the network.
         
         Args:
             X: Input data of shape (n_samples, n_features)
+            workspace: Optional workspace to write the results into. The returned
+                arrays are then views of its buffers and are overwritten by the
+                next pass that uses the same workspace.
             
         Returns:
             Tuple of (activations, weighted_inputs) for each layer
         """
-        activations = [X]
-        weighted_inputs = []
+        if workspace is None:
+            workspace = TrainingWorkspace(self.layer_sizes, len(X), self.dtype)
+        views = workspace.views(len(X))
+        activations = views.activations
+        weighted_inputs = views.weighted_inputs
+        activations[0] = np.asarray(X, dtype=self.dtype)
         
         for i in range(self.n_layers - 1):
-            z = np.dot(activations[-1], self.weights[i]) + self.biases[i]
-            weighted_inputs.append(z)
+            z = weighted_inputs[i]
+            np.dot(activations[i], self.weights[i], out=z)
+            # A broadcasting in-place add would allocate an iteration buffer, so the
+            # bias rows are first copied into the delta buffer (unused until backward)
+            bias_rows = views.deltas[i]
+            np.copyto(bias_rows, self.biases[i])
+            z += bias_rows
             
             # Apply activation function (except for output layer)
             if i < self.n_layers - 2:
-                a = self.activation(z)
+                self._activation_into(z, activations[i+1])
             else:
                 # Output layer uses sigmoid for binary classification
-                a = self._sigmoid(z)
-            
-            activations.append(a)
+                self._sigmoid_into(z, activations[i+1])
         
         return activations, weighted_inputs
     
     def backward_propagation(self, X: np.ndarray, y: np.ndarray,
                            activations: List[np.ndarray], 
-                           weighted_inputs: List[np.ndarray]) -> None:
+                           weighted_inputs: List[np.ndarray],
+                           workspace: Optional[TrainingWorkspace] = None) -> None:
         """
         Perform backward propagation to update weights.
         
         Implements the backpropagation algorithm discovered by Rumelhart, Hinton & Williams (1986).
+        Activation derivatives are computed from the cached activations, and the
+        resulting gradients are applied by the model's optimizer.
         
         Args:
             X: Input data
             y: Target labels
             activations: Activations from forward pass
             weighted_inputs: Weighted inputs from forward pass
+            workspace: Optional workspace holding the delta and gradient buffers
         """
+        if workspace is None:
+            workspace = TrainingWorkspace(self.layer_sizes, X.shape[0], self.dtype)
+        self._compute_gradients(X, y, activations, workspace)
+        self._apply_gradients(workspace)
+    
+    def _compute_gradients(self, X: np.ndarray, y: np.ndarray,
+                           activations: List[np.ndarray],
+                           workspace: TrainingWorkspace) -> None:
+        """Backpropagate the output error into the workspace gradient buffers."""
         m = X.shape[0]
-        y_reshaped = y.reshape(-1, 1)
+        views = workspace.views(m)
+        deltas = views.deltas
         
         # Calculate output layer error
-        deltas = [activations[-1] - y_reshaped]
+        np.subtract(activations[-1], np.asarray(y, dtype=self.dtype).reshape(-1, 1),
+                    out=deltas[-1])
         
         # Backpropagate errors through hidden layers
         for i in range(self.n_layers - 2, 0, -1):
-            if i < self.n_layers - 1:
-                # Hidden layer error
-                error = np.dot(deltas[0], self.weights[i].T)
-                delta = error * self.activation_derivative(weighted_inputs[i-1])
-            deltas.insert(0, delta)
+            np.dot(deltas[i], self.weights[i].T, out=deltas[i-1])
+            self._derivative_from_output(activations[i], views.derivatives[i-1])
+            deltas[i-1] *= views.derivatives[i-1]
         
-        # Update weights and biases
+        # Gradients of the mean loss (the optimizer divides the weight sums by m)
+        workspace.set_batch_size(m)
         for i in range(self.n_layers - 1):
-            self.weights[i] -= self.learning_rate * np.dot(activations[i].T, deltas[i]) / m
-            self.biases[i] -= self.learning_rate * np.mean(deltas[i], axis=0, keepdims=True)
+            np.dot(activations[i].T, deltas[i], out=workspace.weight_gradients[i])
+            _column_sums(deltas[i], workspace.bias_gradients[i].reshape(-1))
+            workspace.bias_gradients[i] /= m
+    
+    def _apply_gradients(self, workspace: TrainingWorkspace) -> None:
+        """Update weights and biases (in a single vectorized step with flat parameters)."""
+        if self.params is not None:
+            self.optimizer.step([self.params], [workspace.gradient], [workspace.divisor])
+        else:
+            self.optimizer.step(self.parameters(), workspace.gradients, workspace.divisors)
+    
+    def parameters(self) -> List[np.ndarray]:
+        """Return the parameter arrays in storage order [W0, b0, W1, b1, ...]."""
+        params = []
+        for w, b in zip(self.weights, self.biases):
+            params.append(w)
+            params.append(b)
+        return params
     
     def predict_proba(self, X: np.ndarray) -> np.ndarray:
         """
@@ -169,8 +556,39 @@ class MultiLayerPerceptron:
         Returns:
             Predicted probabilities of shape (n_samples,)
         """
-        activations, _ = self.forward_propagation(X)
-        return activations[-1].flatten()
+        return self.predict_batch(X)
+    
+    def predict_batch(self, X: np.ndarray, chunk_size: Optional[int] = None,
+                      max_memory: Optional[int] = None) -> np.ndarray:
+        """
+        Predict probabilities with an inference-only forward pass.
+        
+        Only two scratch buffers are used, whatever the depth of the network, and
+        large inputs can be evaluated in chunks to bound their size.
+        
+        Args:
+            X: Input data of shape (n_samples, n_features)
+            chunk_size: Maximum number of samples evaluated at once (default: all)
+            max_memory: Optional cap in bytes on the size of the scratch buffers
+            
+        Returns:
+            Predicted probabilities of shape (n_samples,)
+        """
+        X = np.asarray(X, dtype=self.dtype)
+        rows = _inference_chunk_size(self.layer_sizes, len(X), self.dtype, chunk_size, max_memory)
+        probabilities = np.empty(len(X), dtype=self.dtype)
+        _predict_proba_into(X, self.weights, self.biases, self._activation_into,
+                            self._sigmoid_into, probabilities, rows)
+        return probabilities
+    
+    def compile(self) -> 'CompiledMLP':
+        """
+        Freeze the current parameters into an inference-only model.
+        
+        Returns:
+            CompiledMLP that is unaffected by further training of this model
+        """
+        return CompiledMLP(self)
     
     def predict(self, X: np.ndarray) -> np.ndarray:
         """
@@ -196,65 +614,400 @@ class MultiLayerPerceptron:
         Returns:
             Mean loss value
         """
-        predictions = self.predict_proba(X)
+        return self._output_metrics(self.forward_propagation(X)[0][-1], y)[0]
+    
+    def _output_metrics(self, output: np.ndarray, y: np.ndarray,
+                        workspace: Optional[TrainingWorkspace] = None) -> Tuple[float, float]:
+        """
+        Compute loss and accuracy from an already computed output layer.
+        
+        Args:
+            output: Output activations of shape (n_samples, 1)
+            y: Target labels
+            workspace: Optional workspace providing scratch buffers
+            
+        Returns:
+            Tuple of (binary cross-entropy loss, accuracy)
+        """
         epsilon = 1e-7  # Small value to prevent log(0)
-        loss = -np.mean(y * np.log(predictions + epsilon) + 
-                        (1 - y) * np.log(1 - predictions + epsilon))
-        return loss
+        y = np.asarray(y, dtype=output.dtype)
+        
+        if workspace is None:
+            predictions = output.flatten()
+            loss = -np.mean(y * np.log(predictions + epsilon) + 
+                            (1 - y) * np.log(1 - predictions + epsilon))
+            accuracy = np.mean((predictions > 0.5).astype(int) == y)
+            return loss, accuracy
+        
+        # Same computation without temporaries
+        views = workspace.views(len(y))
+        predictions = output.reshape(-1)
+        positive, negative, scratch = views.metric_buffers
+        
+        np.add(predictions, epsilon, out=positive)
+        np.log(positive, out=positive)
+        positive *= y
+        
+        np.subtract(1, predictions, out=negative)
+        negative += epsilon
+        np.log(negative, out=negative)
+        np.subtract(1, y, out=scratch)
+        negative *= scratch
+        
+        positive += negative
+        loss = -np.mean(positive)
+        
+        # Compare boolean arrays so that no casting buffers are needed (binary targets)
+        predicted, positive_targets = views.hits
+        np.greater(predictions, 0.5, out=predicted)
+        np.equal(y, 1, out=positive_targets)
+        np.equal(predicted, positive_targets, out=predicted)
+        accuracy = np.count_nonzero(predicted) / len(y)
+        return loss, accuracy
+    
+    def _record_epoch(self, epoch: int, epochs: int, loss: float, accuracy: float,
+                      verbose: bool, **extra: float) -> bool:
+        """
+        Store the metrics of one epoch and check the early stopping criterion.
+        
+        Args:
+            **extra: Additional metrics of the epoch (e.g. samples_per_sec)
+        
+        Returns:
+            True if training has converged and should stop
+        """
+        record_epoch(self.history, loss=loss, accuracy=accuracy, **extra)
+        
+        if verbose and (epoch % 100 == 0 or epoch == epochs - 1):
+            print(f"Epoch {epoch:4d}: Loss = {loss:.4f}, Accuracy = {accuracy:.2%}")
+        
+        # Early stopping if perfect accuracy
+        if accuracy == 1.0 and loss < 0.01:
+            if verbose:
+                print(f"Converged at epoch {epoch}")
+            return True
+        return False
     
     def fit(self, X: np.ndarray, y: np.ndarray, 
-            epochs: int = 1000, verbose: bool = False) -> 'MultiLayerPerceptron':
+            epochs: int = 1000, verbose: bool = False,
+            metric_mode: str = 'fused',
+            batch_size: Optional[int] = None,
+            shuffle: bool = True,
+            profiler: Optional[FitProfiler] = None) -> 'MultiLayerPerceptron':
         """
         Train the multi-layer perceptron using backpropagation.
         
+        Every epoch performs a single forward pass; loss and accuracy are derived
+        from activations that are computed anyway for the weight update:
+        
+        - 'fused': metrics for epoch k are taken from the forward pass that feeds
+          the update of epoch k+1, so they describe the weights *after* the
+          update of epoch k (identical to recomputing them, at no extra cost).
+        - 'pre_update': metrics for epoch k are taken from the forward pass used
+          for the update of epoch k, i.e. they describe the weights *before*
+          that update. Training stops before updating once converged.
+        
+        With ``batch_size`` set, each epoch performs one update per mini-batch
+        (in an order drawn from ``self.rng`` when shuffling). Epoch metrics are then
+        the sample-weighted averages of the pre-update metrics of each mini-batch,
+        and the throughput is recorded in ``history['samples_per_sec']``.
+        
         Args:
             X: Training data of shape (n_samples, n_features)
             y: Target labels of shape (n_samples,)
             epochs: Number of training epochs
             verbose: Whether to print training progress
+            metric_mode: When to measure loss/accuracy ('fused' or 'pre_update')
+            batch_size: Optional mini-batch size (None for full-batch training)
+            shuffle: Whether to shuffle the samples before every mini-batch epoch
+            profiler: Optional FitProfiler accumulating the time of every training
+                phase and running its per-epoch callbacks
             
         Returns:
             Self for method chaining
         """
+        if metric_mode not in ('fused', 'pre_update'):
+            raise ValueError(f"Unknown metric mode: {metric_mode}")
+        
+        X = np.asarray(X, dtype=self.dtype)
+        y = np.asarray(y, dtype=self.dtype)
+        
+        if batch_size is not None:
+            if batch_size < 1:
+                raise ValueError(f"batch_size must be positive, got {batch_size}")
+            return self._fit_batches(lambda: self._iterate_minibatches(X, y, batch_size, shuffle),
+                                     epochs, verbose, profiler)
+        
+        # Profiling is guarded by explicit checks, so that it costs nothing when disabled
+        if profiler is not None:
+            profiler.start()
+        workspace = self._get_workspace(len(X))
+        activations, _ = self.forward_propagation(X, workspace)
+        if profiler is not None:
+            profiler.lap('forward')
+        
         for epoch in range(epochs):
-            # Forward propagation
-            activations, weighted_inputs = self.forward_propagation(X)
+            converged = False
+            if metric_mode == 'pre_update':
+                loss, accuracy = self._output_metrics(activations[-1], y, workspace)
+                if profiler is not None:
+                    profiler.lap('metrics')
+                converged = self._record_epoch(epoch, epochs, loss, accuracy, verbose)
+                if profiler is not None:
+                    profiler.lap('history')
+            
+            if not converged:
+                # Backward propagation
+                self._compute_gradients(X, y, activations, workspace)
+                if profiler is not None:
+                    profiler.lap('backward')
+                self._apply_gradients(workspace)
+                if profiler is not None:
+                    profiler.lap('update')
+                
+                # Forward propagation for the next update (and fused metrics)
+                if metric_mode == 'fused' or epoch < epochs - 1:
+                    activations, _ = self.forward_propagation(X, workspace)
+                    if profiler is not None:
+                        profiler.lap('forward')
+                
+                if metric_mode == 'fused':
+                    loss, accuracy = self._output_metrics(activations[-1], y, workspace)
+                    if profiler is not None:
+                        profiler.lap('metrics')
+                    converged = self._record_epoch(epoch, epochs, loss, accuracy, verbose)
+                    if profiler is not None:
+                        profiler.lap('history')
             
-            # Backward propagation
-            self.backward_propagation(X, y, activations, weighted_inputs)
+            if profiler is not None:
+                profiler.end_epoch(self, epoch)
+            if converged:
+                break
+        
+        return self
+    
+    def fit_stream(self, batches: Iterable[Tuple[np.ndarray, np.ndarray]],
+                   epochs: int = 1, verbose: bool = False,
+                   batch_size: Optional[int] = None,
+                   shuffle: bool = False,
+                   profiler: Optional[FitProfiler] = None) -> 'MultiLayerPerceptron':
+        """
+        Train on a stream of (X_batch, y_batch) chunks in bounded memory.
+        
+        Only one chunk is held at a time, so the stream can describe a dataset far
+        larger than memory (e.g. a generator reading from disk). Each chunk yields
+        one update, or several when it is split further into ``batch_size`` pieces.
+        Metrics and throughput are recorded per pass as in mini-batch ``fit``.
+        
+        Args:
+            batches: Iterable of (X_batch, y_batch) chunks. For more than one epoch
+                it must be re-iterable (e.g. a list or an object whose ``__iter__``
+                restarts the stream), not a one-shot iterator.
+            epochs: Number of passes over the stream
+            verbose: Whether to print training progress
+            batch_size: Optional size to split each chunk into
+            shuffle: Whether to shuffle samples within each chunk
+            profiler: Optional FitProfiler (see fit); reading the stream is
+                charged to the 'data' phase
+            
+        Returns:
+            Self for method chaining
+        """
+        if epochs > 1 and iter(batches) is batches:
+            raise ValueError("Training for several epochs needs a re-iterable stream, "
+                             "not a one-shot iterator")
+        
+        def chunks() -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+            for X_chunk, y_chunk in batches:
+                if batch_size is None and not shuffle:
+                    yield X_chunk, y_chunk
+                else:
+                    yield from self._iterate_minibatches(X_chunk, y_chunk,
+                                                         batch_size or len(X_chunk), shuffle)
+        
+        return self._fit_batches(chunks, epochs, verbose, profiler)
+    
+    def _iterate_minibatches(self, X: np.ndarray, y: np.ndarray,
+                             batch_size: int, shuffle: bool) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Yield mini-batches of X and y, in an order drawn from self.rng when shuffling."""
+        n_samples = len(X)
+        order = self.rng.permutation(n_samples) if shuffle else None
+        
+        for start in range(0, n_samples, batch_size):
+            if order is None:
+                yield X[start:start + batch_size], y[start:start + batch_size]
+            else:
+                indices = order[start:start + batch_size]
+                yield X[indices], y[indices]
+    
+    def _fit_batches(self, make_batches: Callable[[], Iterable[Tuple[np.ndarray, np.ndarray]]],
+                     epochs: int, verbose: bool,
+                     profiler: Optional[FitProfiler] = None) -> 'MultiLayerPerceptron':
+        """Run epochs of mini-batch updates, drawing a fresh batch iterator per epoch."""
+        if profiler is not None:
+            profiler.start()
+        for epoch in range(epochs):
+            start_time = time.perf_counter()
             
-            # Calculate metrics
-            loss = self.compute_loss(X, y)
-            predictions = self.predict(X)
-            accuracy = np.mean(predictions == y)
+            total_loss = 0.0
+            total_correct = 0.0
+            n_samples = 0
+            for X_batch, y_batch in make_batches():
+                # Drawing the batch (shuffling, reading a stream) is charged to 'data'
+                X_batch = np.asarray(X_batch, dtype=self.dtype)
+                y_batch = np.asarray(y_batch, dtype=self.dtype)
+                workspace = self._get_workspace(len(X_batch))
+                if profiler is not None:
+                    profiler.lap('data')
+                activations, _ = self.forward_propagation(X_batch, workspace)
+                if profiler is not None:
+                    profiler.lap('forward')
+                loss, accuracy = self._output_metrics(activations[-1], y_batch, workspace)
+                if profiler is not None:
+                    profiler.lap('metrics')
+                self._compute_gradients(X_batch, y_batch, activations, workspace)
+                if profiler is not None:
+                    profiler.lap('backward')
+                self._apply_gradients(workspace)
+                if profiler is not None:
+                    profiler.lap('update')
+                
+                total_loss += loss * len(X_batch)
+                total_correct += accuracy * len(X_batch)
+                n_samples += len(X_batch)
             
-            # Store history
-            self.history['loss'].append(loss)
-            self.history['accuracy'].append(accuracy)
+            if n_samples == 0:
+                raise ValueError("No training samples were provided")
             
-            if verbose and (epoch % 100 == 0 or epoch == epochs - 1):
-                print(f"Epoch {epoch:4d}: Loss = {loss:.4f}, Accuracy = {accuracy:.2%}")
+            elapsed = time.perf_counter() - start_time
+            samples_per_sec = n_samples / elapsed if elapsed > 0 else float('inf')
             
-            # Early stopping if perfect accuracy
-            if accuracy == 1.0 and loss < 0.01:
-                if verbose:
-                    print(f"Converged at epoch {epoch}")
+            converged = self._record_epoch(epoch, epochs, total_loss / n_samples,
+                                           total_correct / n_samples, verbose,
+                                           samples_per_sec=samples_per_sec)
+            if profiler is not None:
+                profiler.lap('history')
+                profiler.end_epoch(self, epoch)
+            if converged:
                 break
         
         return self
     
+    def _random_source(self):
+        """Generator for weight initialization (the global state for unseeded models)."""
+        return np.random if self._init_random is None else self._init_random
+    
     def reset(self) -> None:
         """Reset the network to initial random state."""
-        self.weights = []
-        self.biases = []
+        weights = []
+        biases = []
         
         for i in range(self.n_layers - 1):
-            w = np.random.randn(self.layer_sizes[i], self.layer_sizes[i+1]) * np.sqrt(2.0 / self.layer_sizes[i])
-            b = np.zeros((1, self.layer_sizes[i+1]))
-            self.weights.append(w)
-            self.biases.append(b)
-        
-        self.history = {
-            'loss': [],
-            'accuracy': []
+            w = self._random_source().randn(self.layer_sizes[i], self.layer_sizes[i+1]) * np.sqrt(2.0 / self.layer_sizes[i])
+            w = w.astype(self.dtype, copy=False)
+            b = np.zeros((1, self.layer_sizes[i+1]), dtype=self.dtype)
+            weights.append(w)
+            biases.append(b)
+        
+        self._store_parameters(weights, biases)
+        self.optimizer.reset()
+        
+        self.history = self._new_history()
+    
+    def _new_history(self):
+        """Empty training history, in the configured format."""
+        if self.history_template is None:
+            return {
+                'loss': [],
+                'accuracy': []
+            }
+        return self.history_template.empty()
+
+
+class CompiledMLP:
+    """
+    Frozen inference-only snapshot of a MultiLayerPerceptron.
+    
+    Holds contiguous, read-only copies of the parameters (weights in the
+    (fan_in, fan_out) layout used by X @ W, biases as flat rows) and predicts
+    with the same two-buffer pass as MultiLayerPerceptron.predict_batch.
+    """
+    
+    # The in-place activations only depend on the sigmoid clip
+    _sigmoid_into = MultiLayerPerceptron._sigmoid_into
+    _tanh_into = MultiLayerPerceptron._tanh_into
+    _relu_into = MultiLayerPerceptron._relu_into
+    
+    def __init__(self, model: MultiLayerPerceptron):
+        """
+        Compile a trained model.
+        
+        Args:
+            model: Model whose current parameters are frozen
+        """
+        def frozen(array: np.ndarray) -> np.ndarray:
+            array = np.array(array, dtype=model.dtype, order='C')
+            array.flags.writeable = False
+            return array
+        
+        state = {
+            'layer_sizes': tuple(model.layer_sizes),
+            'activation_name': model.activation_name,
+            'dtype': model.dtype,
+            '_sigmoid_clip': model._sigmoid_clip,
+            'weights': tuple(frozen(w) for w in model.weights),
+            'biases': tuple(frozen(b.reshape(-1)) for b in model.biases),
         }
+        self.__dict__.update(state)
+        
+        activations = {'sigmoid': self._sigmoid_into, 'tanh': self._tanh_into,
+                       'relu': self._relu_into}
+        self.__dict__['_activation_into'] = activations[model.activation_name]
+    
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError("CompiledMLP is immutable")
+    
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop('_activation_into')
+        return state
+    
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self.__dict__['_activation_into'] = getattr(self, f"_{state['activation_name']}_into")
+    
+    def predict_proba(self, X: np.ndarray, chunk_size: Optional[int] = None,
+                      max_memory: Optional[int] = None) -> np.ndarray:
+        """
+        Predict probabilities for input data.
+        
+        Args:
+            X: Input data of shape (n_samples, n_features)
+            chunk_size: Maximum number of samples evaluated at once (default: all)
+            max_memory: Optional cap in bytes on the size of the scratch buffers
+            
+        Returns:
+            Predicted probabilities of shape (n_samples,)
+        """
+        X = np.asarray(X, dtype=self.dtype)
+        rows = _inference_chunk_size(list(self.layer_sizes), len(X), self.dtype,
+                                     chunk_size, max_memory)
+        probabilities = np.empty(len(X), dtype=self.dtype)
+        _predict_proba_into(X, self.weights, self.biases, self._activation_into,
+                            self._sigmoid_into, probabilities, rows)
+        return probabilities
+    
+    def predict(self, X: np.ndarray, chunk_size: Optional[int] = None,
+                max_memory: Optional[int] = None) -> np.ndarray:
+        """
+        Make binary predictions for input data.
+        
+        Args:
+            X: Input data of shape (n_samples, n_features)
+            chunk_size: Maximum number of samples evaluated at once (default: all)
+            max_memory: Optional cap in bytes on the size of the scratch buffers
+            
+        Returns:
+            Binary predictions of shape (n_samples,)
+        """
+        return (self.predict_proba(X, chunk_size, max_memory) > 0.5).astype(int)
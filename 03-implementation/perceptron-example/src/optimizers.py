@@ -0,0 +1,312 @@
+"""
+Gradient-Based Optimizers and Learning-Rate Schedules
+
+Implements the update rules used to train the multi-layer perceptron: plain
+gradient descent, momentum (Polyak, 1964), Nesterov momentum (Sutskever et al., 2013),
+RMSProp (Tieleman & Hinton, 2012) and Adam (Kingma & Ba, 2015).
+
+Every optimizer updates the parameters in place. Its state (velocities, moment
+estimates) lives in one flat buffer per state variable with views shaped like
+the parameters, and updates are written with ``out=`` ufunc calls into a scratch
+buffer, so a training step does not allocate new arrays.
+"""
+
+import math
+import numpy as np
+from typing import Dict, List, Optional, Union
+
+
+class LearningRateSchedule:
+    """Base class for learning-rate schedules (constant learning rate)."""
+
+    def __call__(self, learning_rate: float, step: int) -> float:
+        """
+        Compute the learning rate for an update.
+
+        Args:
+            learning_rate: Base learning rate of the optimizer
+            step: Number of updates performed so far
+
+        Returns:
+            Learning rate to use for this update
+        """
+        return learning_rate
+
+
+class StepDecay(LearningRateSchedule):
+    """Multiply the learning rate by ``factor`` every ``step_size`` updates."""
+
+    def __init__(self, step_size: int, factor: float = 0.5):
+        self.step_size = step_size
+        self.factor = factor
+
+    def __call__(self, learning_rate: float, step: int) -> float:
+        return learning_rate * self.factor ** (step // self.step_size)
+
+
+class ExponentialDecay(LearningRateSchedule):
+    """Decay the learning rate as lr * decay_rate**step."""
+
+    def __init__(self, decay_rate: float):
+        self.decay_rate = decay_rate
+
+    def __call__(self, learning_rate: float, step: int) -> float:
+        return learning_rate * self.decay_rate ** step
+
+
+class InverseTimeDecay(LearningRateSchedule):
+    """Decay the learning rate as lr / (1 + decay * step)."""
+
+    def __init__(self, decay: float):
+        self.decay = decay
+
+    def __call__(self, learning_rate: float, step: int) -> float:
+        return learning_rate / (1 + self.decay * step)
+
+
+class CosineDecay(LearningRateSchedule):
+    """Anneal the learning rate along a half cosine to ``min_factor * lr`` over ``total_steps``."""
+
+    def __init__(self, total_steps: int, min_factor: float = 0.0):
+        self.total_steps = total_steps
+        self.min_factor = min_factor
+
+    def __call__(self, learning_rate: float, step: int) -> float:
+        progress = min(step, self.total_steps) / self.total_steps
+        cosine = 0.5 * (1 + math.cos(math.pi * progress))
+        return learning_rate * (self.min_factor + (1 - self.min_factor) * cosine)
+
+
+def _zeros_like_flat(params: List[np.ndarray]) -> List[np.ndarray]:
+    """Allocate one zeroed flat buffer and return views of it shaped like params."""
+    flat = np.zeros(sum(p.size for p in params), dtype=params[0].dtype)
+    views = []
+    offset = 0
+    for p in params:
+        views.append(flat[offset:offset + p.size].reshape(p.shape))
+        offset += p.size
+    return views
+
+
+class Optimizer:
+    """
+    Base class for optimizers.
+
+    Subclasses list their state variables in ``state_names`` and implement
+    ``_update`` for a single parameter array.
+    """
+
+    state_names: tuple = ()
+
+    def __init__(self, learning_rate: float = 0.01,
+                 schedule: Optional[LearningRateSchedule] = None):
+        """
+        Initialize the optimizer.
+
+        Args:
+            learning_rate: Base learning rate
+            schedule: Optional learning-rate schedule, evaluated per update
+        """
+        self.learning_rate = learning_rate
+        self.schedule = schedule or LearningRateSchedule()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all accumulated state."""
+        self.iterations = 0
+        self.state: Dict[str, List[np.ndarray]] = {}
+        self._scratch: Optional[List[np.ndarray]] = None
+
+    @property
+    def current_learning_rate(self) -> float:
+        """Learning rate the next update will use."""
+        return self.schedule(self.learning_rate, self.iterations)
+
+    def step(self, params: List[np.ndarray], grads: List[np.ndarray],
+             divisors: Optional[List[Union[np.ndarray, float]]] = None) -> None:
+        """
+        Update the parameters in place.
+
+        Args:
+            params: Parameter arrays (updated in place)
+            grads: Gradients of the loss, shaped like params
+            divisors: Optional divisors of the gradients (arrays broadcastable to
+                grads, or scalars), e.g. the batch size for gradients passed as
+                sums over a batch; grads are divided by them in place
+        """
+        if not self.state and self.state_names:
+            self.state = {name: _zeros_like_flat(params) for name in self.state_names}
+        if self._scratch is None or self._scratch[0].shape != params[0].shape:
+            self._scratch = _zeros_like_flat(params)
+
+        learning_rate = self.current_learning_rate
+        self.iterations += 1
+
+        for i, (param, grad) in enumerate(zip(params, grads)):
+            state = {name: arrays[i] for name, arrays in self.state.items()}
+            if divisors is None:
+                self._update(param, grad, state, self._scratch[i], learning_rate)
+            else:
+                self._update_divided(param, grad, divisors[i], state, self._scratch[i],
+                                     learning_rate)
+
+    def _update(self, param: np.ndarray, grad: np.ndarray, state: Dict[str, np.ndarray],
+                scratch: np.ndarray, learning_rate: float) -> None:
+        raise NotImplementedError
+
+    def _update_divided(self, param: np.ndarray, grad: np.ndarray,
+                        divisor: Union[np.ndarray, float], state: Dict[str, np.ndarray],
+                        scratch: np.ndarray, learning_rate: float) -> None:
+        np.divide(grad, divisor, out=grad)
+        self._update(param, grad, state, scratch, learning_rate)
+
+
+class SGD(Optimizer):
+    """Plain gradient descent: p -= lr * g."""
+
+    def _update(self, param, grad, state, scratch, learning_rate):
+        np.multiply(grad, learning_rate, out=scratch)
+        param -= scratch
+
+    def _update_divided(self, param, grad, divisor, state, scratch, learning_rate):
+        # The learning rate is applied before the divisor, so that a gradient
+        # passed as a batch sum updates by lr * sum / m in the order of the
+        # original implementation
+        np.multiply(grad, learning_rate, out=scratch)
+        scratch /= divisor
+        param -= scratch
+        np.divide(grad, divisor, out=grad)
+
+
+class Momentum(Optimizer):
+    """Gradient descent with classical momentum: v = mu*v - lr*g; p += v."""
+
+    state_names = ('velocity',)
+
+    def __init__(self, learning_rate: float = 0.01, momentum: float = 0.9,
+                 schedule: Optional[LearningRateSchedule] = None):
+        self.momentum = momentum
+        super().__init__(learning_rate, schedule)
+
+    def _update(self, param, grad, state, scratch, learning_rate):
+        velocity = state['velocity']
+        velocity *= self.momentum
+        np.multiply(grad, learning_rate, out=scratch)
+        velocity -= scratch
+        param += velocity
+
+
+class Nesterov(Momentum):
+    """
+    Nesterov accelerated gradient in its look-ahead form:
+    v = mu*v - lr*g; p += mu*v - lr*g.
+    """
+
+    def _update(self, param, grad, state, scratch, learning_rate):
+        velocity = state['velocity']
+        velocity *= self.momentum
+        np.multiply(grad, learning_rate, out=scratch)
+        velocity -= scratch
+        param -= scratch
+        np.multiply(velocity, self.momentum, out=scratch)
+        param += scratch
+
+
+class RMSProp(Optimizer):
+    """RMSProp: s = rho*s + (1-rho)*g**2; p -= lr * g / (sqrt(s) + eps)."""
+
+    state_names = ('square_avg',)
+
+    def __init__(self, learning_rate: float = 0.01, rho: float = 0.9, epsilon: float = 1e-8,
+                 schedule: Optional[LearningRateSchedule] = None):
+        self.rho = rho
+        self.epsilon = epsilon
+        super().__init__(learning_rate, schedule)
+
+    def _update(self, param, grad, state, scratch, learning_rate):
+        square_avg = state['square_avg']
+        square_avg *= self.rho
+        np.multiply(grad, grad, out=scratch)
+        scratch *= 1 - self.rho
+        square_avg += scratch
+
+        np.sqrt(square_avg, out=scratch)
+        scratch += self.epsilon
+        np.divide(grad, scratch, out=scratch)
+        scratch *= learning_rate
+        param -= scratch
+
+
+class Adam(Optimizer):
+    """
+    Adam with bias-corrected moment estimates:
+    m = b1*m + (1-b1)*g; v = b2*v + (1-b2)*g**2;
+    p -= lr * sqrt(1-b2**t) / (1-b1**t) * m / (sqrt(v) + eps).
+    """
+
+    state_names = ('first_moment', 'second_moment')
+
+    def __init__(self, learning_rate: float = 0.01, beta1: float = 0.9, beta2: float = 0.999,
+                 epsilon: float = 1e-8, schedule: Optional[LearningRateSchedule] = None):
+        self.beta1 = beta1
+        self.beta2 = beta2
+        self.epsilon = epsilon
+        super().__init__(learning_rate, schedule)
+
+    def step(self, params: List[np.ndarray], grads: List[np.ndarray],
+             divisors: Optional[List[Union[np.ndarray, float]]] = None) -> None:
+        # Bias correction depends on the (1-based) number of the upcoming update
+        t = self.iterations + 1
+        self._correction = math.sqrt(1 - self.beta2 ** t) / (1 - self.beta1 ** t)
+        super().step(params, grads, divisors)
+
+    def _update(self, param, grad, state, scratch, learning_rate):
+        first_moment = state['first_moment']
+        second_moment = state['second_moment']
+
+        first_moment *= self.beta1
+        np.multiply(grad, 1 - self.beta1, out=scratch)
+        first_moment += scratch
+
+        second_moment *= self.beta2
+        np.multiply(grad, grad, out=scratch)
+        scratch *= 1 - self.beta2
+        second_moment += scratch
+
+        np.sqrt(second_moment, out=scratch)
+        scratch += self.epsilon
+        np.divide(first_moment, scratch, out=scratch)
+        scratch *= learning_rate * self._correction
+        param -= scratch
+
+
+def make_optimizer(optimizer: Union[str, Optimizer], learning_rate: float = 0.01,
+                   **kwargs) -> Optimizer:
+    """
+    Create an optimizer from its name.
+
+    Args:
+        optimizer: Optimizer name ('sgd', 'momentum', 'nesterov', 'rmsprop', 'adam')
+            or an Optimizer instance, which is returned unchanged
+        learning_rate: Base learning rate for a named optimizer
+        **kwargs: Additional optimizer parameters (e.g. momentum, schedule)
+
+    Returns:
+        Optimizer instance
+    """
+    if isinstance(optimizer, Optimizer):
+        return optimizer
+
+    name = optimizer.lower()
+    if name == 'sgd':
+        return SGD(learning_rate, **kwargs)
+    elif name == 'momentum':
+        return Momentum(learning_rate, **kwargs)
+    elif name == 'nesterov':
+        return Nesterov(learning_rate, **kwargs)
+    elif name == 'rmsprop':
+        return RMSProp(learning_rate, **kwargs)
+    elif name == 'adam':
+        return Adam(learning_rate, **kwargs)
+    else:
+        raise ValueError(f"Unknown optimizer: {optimizer}")
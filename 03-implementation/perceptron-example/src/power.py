@@ -0,0 +1,197 @@
+"""
+Simulation-Based Power Analysis
+
+Estimates how many seeds an experiment needs from pilot results. Virtual
+experiments of every candidate size are drawn from the pilot accuracies (a
+bootstrap of each group), the planned test is evaluated on all of them at once
+with vectorized numpy, and the fraction of virtual experiments that reject the
+null hypothesis is the power at that size.
+
+The pilot distribution stands in for the true one, so small pilots give rough
+power curves; the estimates describe the configurations that were piloted.
+"""
+
+import numpy as np
+from typing import Any, Dict, Iterable, Optional, Sequence, Union
+
+
+Pilot = Union[Dict[str, Any], Sequence[float], np.ndarray]
+
+
+def _accuracies(pilot: Pilot) -> np.ndarray:
+    """Per-run accuracies of a run_experiment result or a plain sequence."""
+    if isinstance(pilot, dict):
+        pilot = pilot['accuracies']
+    values = np.asarray(pilot, dtype=float)
+    if values.ndim != 1 or len(values) < 2:
+        raise ValueError("A pilot needs at least two runs")
+    return values
+
+
+def _t_test_p_values(difference: np.ndarray, standard_error: np.ndarray, df: np.ndarray,
+                     alternative: str) -> np.ndarray:
+    """
+    p-values of t statistics, vectorized over virtual experiments.
+
+    A zero standard error (e.g. every run at 100% accuracy) decides the test by
+    the sign of the difference alone.
+    """
+    # Imported here so that worker processes running experiments skip scipy
+    from scipy.special import stdtr
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = difference / standard_error
+        if alternative == 'greater':
+            p = stdtr(df, -t)
+        elif alternative == 'less':
+            p = stdtr(df, t)
+        else:
+            p = 2 * stdtr(df, -np.abs(t))
+
+    degenerate = standard_error == 0
+    if np.any(degenerate):
+        d = difference[degenerate]
+        if alternative == 'greater':
+            decided = d > 0
+        elif alternative == 'less':
+            decided = d < 0
+        else:
+            decided = d != 0
+        p[degenerate] = np.where(decided, 0.0, 1.0)
+    return p
+
+
+def simulate_power(pilot: Pilot,
+                   reference: Optional[Pilot] = None,
+                   n_runs: Iterable[int] = range(2, 41),
+                   threshold: Optional[float] = None,
+                   alternative: str = 'greater',
+                   alpha: float = 0.05,
+                   n_simulations: int = 4000,
+                   chunk_size: int = 4000,
+                   random_seed: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Power of a planned experiment at several numbers of runs.
+
+    With a reference pilot, each virtual experiment runs n seeds of both
+    configurations and applies Welch's t-test to the difference of their mean
+    accuracies; otherwise it applies a one-sample t-test of the mean accuracy
+    against threshold (e.g. "mean accuracy > 0.9").
+
+    Args:
+        pilot: run_experiment result (or accuracies) of the configuration tested
+        reference: Optional pilot of the configuration it is compared with
+        n_runs: Candidate numbers of runs (per configuration, at least 2)
+        threshold: Accuracy tested against when there is no reference
+        alternative: 'greater', 'less' or 'two-sided' (for the pilot's mean
+            relative to the reference's, or to the threshold)
+        alpha: Significance level of the planned test
+        n_simulations: Number of virtual experiments per candidate size
+        chunk_size: Number of virtual experiments drawn at a time
+        random_seed: Seed of the simulation generator
+
+    Returns:
+        Dictionary with the candidate 'n_runs' and the estimated 'power' of each
+    """
+    if alternative not in ('greater', 'less', 'two-sided'):
+        raise ValueError(f"Unknown alternative: {alternative}")
+    if (reference is None) == (threshold is None):
+        raise ValueError("Give either a reference pilot or a threshold")
+
+    groups = [_accuracies(pilot)]
+    if reference is not None:
+        groups.append(_accuracies(reference))
+    sizes = np.array(sorted(set(n_runs)), dtype=int)
+    if sizes[0] < 2:
+        raise ValueError("Every candidate needs at least two runs")
+
+    rng = np.random.default_rng(random_seed)
+    power = np.empty(len(sizes))
+    for i, n in enumerate(sizes):
+        rejected = 0
+        for start in range(0, n_simulations, chunk_size):
+            size = min(chunk_size, n_simulations - start)
+            # One row per virtual experiment, drawn as a single index matrix
+            means, variances = [], []
+            for group in groups:
+                runs = group[rng.integers(0, len(group), (size, n))]
+                means.append(runs.mean(axis=1))
+                variances.append(runs.var(axis=1, ddof=1) / n)
+
+            if reference is None:
+                difference = means[0] - threshold
+                standard_error = np.sqrt(variances[0])
+                df = np.full(size, n - 1.0)
+            else:
+                difference = means[0] - means[1]
+                standard_error = np.sqrt(variances[0] + variances[1])
+                # Welch-Satterthwaite degrees of freedom
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    df = (variances[0] + variances[1]) ** 2 / (
+                        (variances[0] ** 2 + variances[1] ** 2) / (n - 1))
+            p = _t_test_p_values(difference, standard_error, df, alternative)
+            rejected += np.count_nonzero(p < alpha)
+        power[i] = rejected / n_simulations
+
+    return {'n_runs': sizes, 'power': power}
+
+
+def plan_sample_size(pilot: Pilot,
+                     reference: Optional[Pilot] = None,
+                     target_power: float = 0.8,
+                     max_runs: int = 100,
+                     threshold: Optional[float] = None,
+                     alternative: str = 'greater',
+                     alpha: float = 0.05,
+                     n_simulations: int = 4000,
+                     random_seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Recommend the smallest number of runs reaching a target power.
+
+    Candidate sizes are searched by bisection between 2 and max_runs (power
+    grows with the number of runs), so only a handful of sizes are simulated.
+
+    Args:
+        pilot: run_experiment result (or accuracies) of the configuration tested
+        reference: Optional pilot of the configuration it is compared with
+        target_power: Required probability of rejecting the null hypothesis
+        max_runs: Largest number of runs considered
+        threshold: Accuracy tested against when there is no reference
+        alternative: 'greater', 'less' or 'two-sided'
+        alpha: Significance level of the planned test
+        n_simulations: Number of virtual experiments per candidate size
+        random_seed: Seed of the simulation generator
+
+    Returns:
+        Dictionary with the recommended 'n_runs' (None if even max_runs falls
+        short), its estimated 'power', and the 'power_curve' of every size
+        simulated during the search
+    """
+    curve = {}
+
+    def power_at(n: int) -> float:
+        if n not in curve:
+            # The same seed for every size gives a smoother (monotone) curve
+            curve[n] = float(simulate_power(pilot, reference, [n], threshold, alternative,
+                                            alpha, n_simulations,
+                                            random_seed=random_seed)['power'][0])
+        return curve[n]
+
+    if power_at(max_runs) < target_power:
+        recommended = None
+    else:
+        low, high = 2, max_runs
+        while low < high:
+            middle = (low + high) // 2
+            if power_at(middle) >= target_power:
+                high = middle
+            else:
+                low = middle + 1
+        recommended = low
+
+    return {
+        'n_runs': recommended,
+        'power': curve[recommended] if recommended is not None else curve[max_runs],
+        'target_power': target_power,
+        'power_curve': dict(sorted(curve.items()))
+    }
@@ -0,0 +1,109 @@
+"""
+Per-Phase Training Profiler
+
+Passing a FitProfiler to ``fit`` accumulates the time spent in each phase of
+training (forward pass, backward pass, parameter update, metric computation and
+history recording), measured with ``time.perf_counter_ns``, and calls the
+registered callbacks after every epoch. Without a profiler, fit only pays for
+a few ``is None`` checks per epoch.
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+PHASES = ('data', 'forward', 'backward', 'update', 'metrics', 'history')
+
+# Called after every epoch with the model, the epoch index and the nanoseconds
+# spent in each phase during that epoch
+EpochCallback = Callable[[object, int, Dict[str, int]], None]
+
+
+class FitProfiler:
+    """
+    Accumulates per-phase training times over one or more calls of fit.
+
+    Each phase is timed as a lap: the time since the end of the previous phase
+    is charged to the phase that just ended, so the phases of an epoch add up
+    to its whole duration. The time spent in callbacks is not charged to any
+    phase.
+    """
+
+    def __init__(self, callbacks: Iterable[EpochCallback] = ()):
+        """
+        Create a profiler.
+
+        Args:
+            callbacks: Functions called after every epoch (see add_callback)
+        """
+        self.callbacks: List[EpochCallback] = list(callbacks)
+        self.totals_ns: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.n_epochs = 0
+        self._epoch_ns: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self._mark = 0
+
+    def add_callback(self, callback: EpochCallback) -> None:
+        """
+        Register a function called after every epoch.
+
+        Args:
+            callback: Called as callback(model, epoch, phase_ns), where phase_ns
+                maps each phase to the nanoseconds it took during the epoch
+        """
+        self.callbacks.append(callback)
+
+    def start(self) -> None:
+        """Start timing the first phase of an epoch."""
+        self._mark = time.perf_counter_ns()
+
+    def lap(self, phase: str) -> None:
+        """Charge the time since the previous lap (or start) to phase."""
+        now = time.perf_counter_ns()
+        self._epoch_ns[phase] = self._epoch_ns.get(phase, 0) + now - self._mark
+        self._mark = now
+
+    def end_epoch(self, model: object, epoch: int) -> None:
+        """Add the epoch to the totals, run the callbacks and restart the timer."""
+        for phase, ns in self._epoch_ns.items():
+            self.totals_ns[phase] = self.totals_ns.get(phase, 0) + ns
+        self.n_epochs += 1
+        epoch_ns = self._epoch_ns
+        self._epoch_ns = dict.fromkeys(PHASES, 0)
+        for callback in self.callbacks:
+            callback(model, epoch, epoch_ns)
+        self.start()
+
+    def reset(self) -> None:
+        """Clear the accumulated times (the callbacks are kept)."""
+        self.totals_ns = dict.fromkeys(PHASES, 0)
+        self._epoch_ns = dict.fromkeys(PHASES, 0)
+        self.n_epochs = 0
+
+    @property
+    def total_ns(self) -> int:
+        """Time spent in all phases together."""
+        return sum(self.totals_ns.values())
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Accumulated time of every phase that was timed.
+
+        Returns:
+            Mapping of phase names to their total 'seconds', their 'fraction' of
+            the profiled time and their mean 'per_epoch_us'
+        """
+        total = self.total_ns or 1
+        epochs = self.n_epochs or 1
+        return {phase: {'seconds': ns / 1e9, 'fraction': ns / total,
+                        'per_epoch_us': ns / 1e3 / epochs}
+                for phase, ns in self.totals_ns.items() if ns}
+
+    def report(self, title: Optional[str] = None) -> str:
+        """Format the summary as a table, one phase per line."""
+        lines = [title] if title else []
+        lines.append(f"{'phase':<10} {'seconds':>10} {'share':>7} {'us/epoch':>10}")
+        for phase, stats in self.summary().items():
+            lines.append(f"{phase:<10} {stats['seconds']:>10.4f} {stats['fraction']:>7.1%} "
+                         f"{stats['per_epoch_us']:>10.1f}")
+        lines.append(f"{'total':<10} {self.total_ns / 1e9:>10.4f} over {self.n_epochs} epochs")
+        return '\n'.join(lines)
@@ -0,0 +1,243 @@
+"""
+Vectorized Resampling Statistics
+
+Bootstrap confidence intervals (percentile and BCa) and permutation tests for
+comparing experimental results, such as the accuracies of two architectures
+over random seeds. All resamples of a chunk are drawn as one index matrix and
+the statistic is evaluated on the whole matrix at once, so the cost is a few
+numpy operations per chunk rather than a Python loop per resample; the chunk
+size bounds the memory used.
+
+Statistics are vectorized functions of one array per sample, reducing along
+``axis`` (one row per resample), e.g. ``difference_of_means(x, y, axis=-1)``.
+"""
+
+import itertools
+import math
+import numpy as np
+from typing import Callable, Dict, Iterator, Optional, Sequence
+
+
+Statistic = Callable[..., np.ndarray]
+
+
+def mean(x: np.ndarray, axis: int = -1) -> np.ndarray:
+    """Mean of one sample."""
+    return np.mean(x, axis=axis)
+
+
+def difference_of_means(x: np.ndarray, y: np.ndarray, axis: int = -1) -> np.ndarray:
+    """Mean of the first sample minus mean of the second."""
+    return np.mean(x, axis=axis) - np.mean(y, axis=axis)
+
+
+def _chunk_sizes(n_resamples: int, chunk_size: int) -> Iterator[int]:
+    for start in range(0, n_resamples, chunk_size):
+        yield min(chunk_size, n_resamples - start)
+
+
+def bootstrap_distribution(samples: Sequence[np.ndarray],
+                           statistic: Statistic = difference_of_means,
+                           n_resamples: int = 10000,
+                           chunk_size: int = 10000,
+                           random_seed: Optional[int] = None) -> np.ndarray:
+    """
+    Bootstrap distribution of a statistic.
+
+    Every sample is resampled with replacement independently of the others
+    (so two groups keep their sizes).
+
+    Args:
+        samples: One 1-D array per group
+        statistic: Vectorized statistic of the samples (see module docstring)
+        n_resamples: Number of bootstrap resamples
+        chunk_size: Number of resamples drawn per index matrix
+        random_seed: Seed of the resampling generator
+
+    Returns:
+        The statistic of every resample, shape (n_resamples,)
+    """
+    samples = [np.asarray(sample, dtype=float) for sample in samples]
+    rng = np.random.default_rng(random_seed)
+    distribution = np.empty(n_resamples)
+    start = 0
+    for size in _chunk_sizes(n_resamples, chunk_size):
+        resampled = [sample[rng.integers(0, len(sample), (size, len(sample)))]
+                     for sample in samples]
+        distribution[start:start + size] = statistic(*resampled, axis=-1)
+        start += size
+    return distribution
+
+
+def _jackknife(samples: Sequence[np.ndarray], statistic: Statistic) -> np.ndarray:
+    """Leave-one-out values of the statistic, for every observation of every sample."""
+    values = []
+    for k, sample in enumerate(samples):
+        n = len(sample)
+        # Row i holds every index but i
+        leave_one_out = np.arange(1, n)[np.newaxis, :] - np.tri(n, n - 1, -1, dtype=np.intp)
+        others = [np.broadcast_to(other, (n, len(other))) for other in samples]
+        others[k] = sample[leave_one_out]
+        values.append(statistic(*others, axis=-1))
+    return np.concatenate(values)
+
+
+def bootstrap_ci(samples: Sequence[np.ndarray],
+                 statistic: Statistic = difference_of_means,
+                 confidence: float = 0.95,
+                 method: str = 'bca',
+                 n_resamples: int = 10000,
+                 chunk_size: int = 10000,
+                 random_seed: Optional[int] = None) -> Dict[str, float]:
+    """
+    Bootstrap confidence interval of a statistic.
+
+    Args:
+        samples: One 1-D array per group (e.g. [mlp_accuracies, slp_accuracies])
+        statistic: Vectorized statistic of the samples (see module docstring)
+        confidence: Confidence level of the interval
+        method: 'percentile', or 'bca' (bias-corrected and accelerated, which
+            adjusts the percentiles for the bias and skewness of the distribution)
+        n_resamples: Number of bootstrap resamples
+        chunk_size: Number of resamples drawn per index matrix
+        random_seed: Seed of the resampling generator
+
+    Returns:
+        Dictionary with the 'estimate', the interval bounds 'low' and 'high', and
+        the bootstrap 'standard_error'
+    """
+    if method not in ('percentile', 'bca'):
+        raise ValueError(f"Unknown bootstrap interval method: {method}")
+    samples = [np.asarray(sample, dtype=float) for sample in samples]
+    estimate = float(statistic(*samples, axis=-1))
+    distribution = bootstrap_distribution(samples, statistic, n_resamples, chunk_size,
+                                          random_seed)
+
+    alpha = (1 - confidence) / 2
+    levels = np.array([alpha, 1 - alpha])
+    if method == 'bca':
+        # Imported here so that worker processes running experiments skip scipy
+        from scipy.special import ndtr, ndtri
+
+        bias = ndtri(np.count_nonzero(distribution < estimate) / n_resamples)
+        jackknife = _jackknife(samples, statistic)
+        deviations = jackknife.mean() - jackknife
+        denominator = 6 * np.sum(deviations ** 2) ** 1.5
+        acceleration = np.sum(deviations ** 3) / denominator if denominator > 0 else 0.0
+
+        z = ndtri(levels)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            adjusted = ndtr(bias + (bias + z) / (1 - acceleration * (bias + z)))
+        # A degenerate distribution (e.g. every resample equal) keeps the
+        # percentile interval
+        if np.all(np.isfinite(adjusted)):
+            levels = adjusted
+
+    low, high = np.quantile(distribution, levels)
+    return {'estimate': estimate, 'low': float(low), 'high': float(high),
+            'standard_error': float(np.std(distribution, ddof=1)),
+            'confidence': confidence, 'method': method, 'n_resamples': n_resamples}
+
+
+def _exact_partitions(n_total: int, n_first: int,
+                      chunk_size: int) -> Iterator[np.ndarray]:
+    """
+    Yield every split of n_total observations into groups of n_first and the rest.
+
+    Each row of a yielded index matrix lists the first group's indices, then
+    the second group's.
+    """
+    combinations = itertools.combinations(range(n_total), n_first)
+    while True:
+        chunk = np.fromiter(itertools.chain.from_iterable(
+            itertools.islice(combinations, chunk_size)), dtype=np.intp)
+        if not len(chunk):
+            return
+        rows = chunk.reshape(-1, n_first)
+        in_first = np.zeros((len(rows), n_total), dtype=bool)
+        in_first[np.arange(len(rows))[:, np.newaxis], rows] = True
+        # A stable sort of the membership puts the first group's indices in front
+        yield np.argsort(~in_first, axis=1, kind='stable')
+
+
+def _random_partitions(n_total: int, n_first: int, n_resamples: int,
+                       chunk_size: int, rng: np.random.Generator) -> Iterator[np.ndarray]:
+    """Yield index matrices of random splits, laid out as in _exact_partitions."""
+    for size in _chunk_sizes(n_resamples, chunk_size):
+        # The indices of the n_first smallest of n_total uniform keys form a
+        # uniformly random subset (no full sort of each row is needed)
+        keys = rng.random((size, n_total))
+        yield np.argpartition(keys, n_first - 1, axis=1)
+
+
+def permutation_test(x: np.ndarray, y: np.ndarray,
+                     statistic: Statistic = difference_of_means,
+                     alternative: str = 'two-sided',
+                     n_resamples: int = 100000,
+                     exact: Optional[bool] = None,
+                     chunk_size: int = 10000,
+                     random_seed: Optional[int] = None) -> Dict[str, float]:
+    """
+    Two-sample permutation test.
+
+    The null distribution is the statistic over reassignments of the pooled
+    observations to two groups of the original sizes: all of them (exact test)
+    or n_resamples random ones (Monte Carlo test, whose p-value counts the
+    observed assignment so that it is never zero).
+
+    Args:
+        x: First sample
+        y: Second sample
+        statistic: Vectorized statistic of the two samples
+        alternative: 'two-sided', 'greater' or 'less' (direction of the
+            statistic under the alternative hypothesis)
+        n_resamples: Number of random reassignments for the Monte Carlo test
+        exact: Enumerate every reassignment; by default only when there are
+            no more than n_resamples of them
+        chunk_size: Number of reassignments evaluated per block
+        random_seed: Seed of the resampling generator
+
+    Returns:
+        Dictionary with the observed 'statistic', the 'p_value', whether the
+        test was 'exact' and the number of reassignments evaluated
+    """
+    if alternative not in ('two-sided', 'greater', 'less'):
+        raise ValueError(f"Unknown alternative: {alternative}")
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    pooled = np.concatenate([x, y])
+    n_total, n_first = len(pooled), len(x)
+    observed = float(statistic(x, y, axis=-1))
+
+    n_partitions = math.comb(n_total, n_first)
+    if exact is None:
+        exact = n_partitions <= n_resamples
+    if exact:
+        partitions = _exact_partitions(n_total, n_first, chunk_size)
+    else:
+        partitions = _random_partitions(n_total, n_first, n_resamples, chunk_size,
+                                        np.random.default_rng(random_seed))
+
+    # Values within rounding of the observed statistic count as ties
+    tolerance = 1e-12 * max(abs(observed), 1.0)
+    n_greater = 0
+    n_less = 0
+    evaluated = 0
+    for order in partitions:
+        reassigned = pooled[order]
+        null = statistic(reassigned[:, :n_first], reassigned[:, n_first:], axis=-1)
+        n_greater += np.count_nonzero(null >= observed - tolerance)
+        n_less += np.count_nonzero(null <= observed + tolerance)
+        evaluated += len(order)
+
+    def tail_probability(count: int) -> float:
+        return count / evaluated if exact else (count + 1) / (evaluated + 1)
+
+    if alternative == 'greater':
+        p_value = tail_probability(n_greater)
+    elif alternative == 'less':
+        p_value = tail_probability(n_less)
+    else:
+        p_value = min(1.0, 2 * min(tail_probability(n_greater), tail_probability(n_less)))
+    return {'statistic': observed, 'p_value': float(p_value), 'exact': bool(exact),
+            'n_resamples': evaluated, 'alternative': alternative}
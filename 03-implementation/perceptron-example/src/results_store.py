@@ -0,0 +1,191 @@
+"""
+Columnar Results Store
+
+Saves the output of one or more ``run_experiment`` calls as a directory of
+``.npy`` columns plus a small JSON manifest. Per-run scalars become typed
+arrays and every training-history series becomes one ragged float32 array
+with offsets, so reading a column is a memory map rather than a parse of the
+whole experiment.
+"""
+
+import json
+import os
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional
+
+from .serialization import to_json
+
+
+FORMAT_VERSION = 1
+MANIFEST = 'manifest.json'
+
+
+class RaggedArray:
+    """
+    Variable-length rows stored as one flat array and row offsets.
+
+    Row i is ``values[offsets[i]:offsets[i + 1]]`` (a view, so memory-mapped
+    values are only read when a row is used).
+    """
+
+    def __init__(self, values: np.ndarray, offsets: np.ndarray):
+        self.values = values
+        self.offsets = offsets
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Any], dtype: type = np.float32) -> 'RaggedArray':
+        """Pack a sequence of rows (lists or arrays) into a ragged array."""
+        rows = [np.asarray(row, dtype=dtype) for row in rows]
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=offsets[1:])
+        if rows:
+            values = np.concatenate(rows)
+        else:
+            values = np.empty(0, dtype=dtype)
+        return cls(values, offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> np.ndarray:
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(f"Row {i} out of range for {len(self)} rows")
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class HistoryColumns:
+    """
+    Training histories of a group of runs, stored column by column.
+
+    Indexing returns the history dictionary of one run, as produced by
+    ``fit``; ``series[name]`` gives the whole ragged column of one metric.
+    """
+
+    def __init__(self, series: Dict[str, RaggedArray], constants: List[Dict[str, Any]]):
+        self.series = series
+        self.constants = constants
+
+    def __len__(self) -> int:
+        return len(self.constants)
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        history = {name: column[i] for name, column in self.series.items()}
+        history.update(self.constants[i])
+        return history
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+def _is_run_group(value: Any) -> bool:
+    """Whether value is a run_experiment result (rather than a plain summary)."""
+    return isinstance(value, dict) and 'accuracies' in value and 'histories' in value
+
+
+def _column_file(group: str, name: str) -> str:
+    return f"{group}.{name}.npy"
+
+
+def save_results(path: str, results: Dict[str, Any]) -> None:
+    """
+    Save experiment results in columnar form.
+
+    Entries of results that are run_experiment outputs are stored as columns;
+    any other entry (e.g. a statistical test summary) goes into the manifest.
+    The manifest is written last, so a directory without one is incomplete.
+
+    Args:
+        path: Directory to write (created if missing)
+        results: Mapping of group names to run_experiment results or summaries
+    """
+    os.makedirs(path, exist_ok=True)
+    manifest = {'version': FORMAT_VERSION, 'groups': {}, 'extra': {}}
+
+    for group, value in results.items():
+        if not _is_run_group(value):
+            manifest['extra'][group] = value
+            continue
+
+        columns = []
+        fields = {}
+        for name, column in value.items():
+            if name == 'histories':
+                continue
+            if isinstance(column, list):
+                np.save(os.path.join(path, _column_file(group, name)), np.asarray(column))
+                columns.append(name)
+            else:
+                fields[name] = column
+
+        # Numeric series become ragged columns; per-run constants such as the
+        # update rule of a single-layer perceptron stay in the manifest
+        histories = value['histories']
+        series = sorted({name for history in histories for name, v in history.items()
+                         if isinstance(v, (list, np.ndarray))})
+        constants = [{name: v for name, v in history.items() if name not in series}
+                     for history in histories]
+        for name in series:
+            ragged = RaggedArray.from_rows(history.get(name, []) for history in histories)
+            np.save(os.path.join(path, _column_file(group, f'histories.{name}.values')),
+                    ragged.values)
+            np.save(os.path.join(path, _column_file(group, f'histories.{name}.offsets')),
+                    ragged.offsets)
+
+        manifest['groups'][group] = {
+            'columns': columns,
+            'history_series': series,
+            'history_constants': constants,
+            'fields': fields
+        }
+
+    tmp_path = os.path.join(path, MANIFEST + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, default=to_json)
+    os.replace(tmp_path, os.path.join(path, MANIFEST))
+
+
+def load_results(path: str, columns: Optional[List[str]] = None,
+                 mmap: bool = True) -> Dict[str, Any]:
+    """
+    Load results written by save_results.
+
+    Args:
+        path: Directory written by save_results
+        columns: Names of the per-run columns to load (e.g. ``['accuracies']``
+            or ``['histories']``); all columns are loaded if None. Manifest
+            fields such as ``statistics`` are always included.
+        mmap: Whether to memory-map the column files instead of reading them
+
+    Returns:
+        Dictionary shaped like the saved results, with arrays in place of
+        per-run lists and HistoryColumns in place of the histories
+    """
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported results format version: {manifest.get('version')}")
+
+    mmap_mode = 'r' if mmap else None
+
+    def load(group: str, name: str) -> np.ndarray:
+        return np.load(os.path.join(path, _column_file(group, name)), mmap_mode=mmap_mode)
+
+    results = dict(manifest['extra'])
+    for group, layout in manifest['groups'].items():
+        data = dict(layout['fields'])
+        for name in layout['columns']:
+            if columns is None or name in columns:
+                data[name] = load(group, name)
+        if columns is None or 'histories' in columns:
+            series = {name: RaggedArray(load(group, f'histories.{name}.values'),
+                                        load(group, f'histories.{name}.offsets'))
+                      for name in layout['history_series']}
+            data['histories'] = HistoryColumns(series, layout['history_constants'])
+        results[group] = data
+
+    return results
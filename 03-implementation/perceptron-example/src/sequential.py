@@ -0,0 +1,103 @@
+"""
+Sequential Testing of Seed Sweeps
+
+A SequentialTest lets ``run_experiment`` train seeds in batches and stop as
+soon as a hypothesis about the mean of a metric (e.g. "mean accuracy > 0.9")
+is settled. At each look the repeated confidence interval of the mean is
+compared with the threshold; the interval level is Bonferroni-adjusted for the
+number of planned looks, so stopping at any look keeps the overall error rate
+below alpha (a conservative group-sequential boundary).
+
+Runs that all reach the same value (every seed stuck at 50%, or every seed at
+100%) have no sample variance, so a t interval would collapse to a point. Their
+interval instead bounds the probability that a further run differs, with the
+exact binomial bound for zero such runs out of n, and lets a differing run take
+any value in the metric's range.
+"""
+
+import numpy as np
+from typing import Any, Dict, List, Sequence, Tuple
+
+
+class SequentialTest:
+    """
+    Group-sequential test of the mean of a per-run metric against a threshold.
+
+    The sweep stops with 'supported' once the whole interval lies on the
+    hypothesised side of the threshold, or with 'rejected' once it lies
+    entirely on the other side.
+    """
+
+    def __init__(self, threshold: float, alternative: str = 'greater',
+                 metric: str = 'accuracy', alpha: float = 0.05,
+                 batch_size: int = 4, min_runs: int = 4,
+                 metric_range: Tuple[float, float] = (0.0, 1.0)):
+        """
+        Configure the test.
+
+        Args:
+            threshold: Value the mean of the metric is compared with
+            alternative: 'greater' (hypothesis: mean > threshold) or 'less'
+            metric: Key of the metric in a run's evaluation metrics
+            alpha: Overall probability of a wrong decision at either boundary
+            batch_size: Number of seeds trained between two looks
+            min_runs: Number of runs before the first look
+            metric_range: Smallest and largest possible values of the metric
+        """
+        if alternative not in ('greater', 'less'):
+            raise ValueError(f"Unknown alternative: {alternative}")
+        if batch_size < 1 or min_runs < 2:
+            raise ValueError("batch_size must be positive and min_runs at least 2")
+        self.threshold = threshold
+        self.alternative = alternative
+        self.metric = metric
+        self.alpha = alpha
+        self.batch_size = batch_size
+        self.min_runs = min_runs
+        self.metric_range = tuple(metric_range)
+
+    def looks(self, n_runs: int) -> List[int]:
+        """Numbers of completed runs at which the test looks, ending at n_runs."""
+        first = min(max(self.min_runs, self.batch_size), n_runs)
+        return list(range(first, n_runs, self.batch_size)) + [n_runs]
+
+    def evaluate(self, values: Sequence[float], n_looks: int) -> Dict[str, Any]:
+        """
+        Apply the stopping boundary to the runs completed so far.
+
+        Args:
+            values: Metric of every completed run
+            n_looks: Number of planned looks (sets the Bonferroni adjustment)
+
+        Returns:
+            Dictionary with the 'decision' ('supported', 'rejected' or None to
+            continue), the interval bounds 'low' and 'high', and the 'mean'
+        """
+        # Imported here so that worker processes running experiments skip scipy
+        from scipy.special import stdtrit
+
+        values = np.asarray(values, dtype=float)
+        n = len(values)
+        mean = float(values.mean())
+        level = 1 - self.alpha / n_looks
+        if np.ptp(values) > 0:
+            half_width = stdtrit(n - 1, (1 + level) / 2) * values.std(ddof=1) / np.sqrt(n)
+            low, high = mean - half_width, mean + half_width
+        else:
+            # Upper bound on the probability of a run different from the others
+            differing = 1 - ((1 - level) / 2) ** (1 / n)
+            smallest, largest = self.metric_range
+            low = mean - differing * (mean - smallest)
+            high = mean + differing * (largest - mean)
+
+        above, below = low > self.threshold, high < self.threshold
+        if self.alternative == 'greater':
+            decision = 'supported' if above else 'rejected' if high <= self.threshold else None
+        else:
+            decision = 'supported' if below else 'rejected' if low >= self.threshold else None
+        return {'decision': decision, 'mean': mean, 'low': float(low), 'high': float(high),
+                'confidence': level}
+
+    def describe(self) -> str:
+        """The hypothesis in words, e.g. 'mean accuracy > 0.9'."""
+        return f"mean {self.metric} {'>' if self.alternative == 'greater' else '<'} {self.threshold}"
@@ -0,0 +1,26 @@
+"""
+JSON Serialization Helpers
+
+Shared by the modules that write run records and results as JSON (the
+experiment journal and the columnar results store).
+"""
+
+import numpy as np
+from typing import Any
+
+
+def to_json(value: Any) -> Any:
+    """
+    JSON encoder fallback for numpy values, for use as ``json.dump(..., default=to_json)``.
+
+    Args:
+        value: Object the json module cannot serialize by itself
+
+    Returns:
+        The equivalent Python list or scalar
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -8,6 +8,9 @@ It can only learn linearly separable functions.
 import numpy as np
 from typing import Tuple, Optional
 
+from .history import TrainingHistory, record_epoch
+from .profiling import FitProfiler
+
 
 class SingleLayerPerceptron:
     """
@@ -17,7 +20,9 @@ class SingleLayerPerceptron:
     As proven by Minsky & Papert (1969), this can only learn linearly separable functions.
     """
     
-    def __init__(self, input_size: int = 2, learning_rate: float = 0.1, random_seed: Optional[int] = None):
+    def __init__(self, input_size: int = 2, learning_rate: float = 0.1, random_seed: Optional[int] = None,
+                 update_rule: str = 'batch', dtype: type = np.float64,
+                 history: Optional[TrainingHistory] = None):
         """
         Initialize the single-layer perceptron.
         
@@ -25,25 +30,38 @@ class SingleLayerPerceptron:
             input_size: Number of input features
             learning_rate: Learning rate for weight updates (η in the paper)
             random_seed: Random seed for reproducibility
+            update_rule: 'batch' (one update per epoch from all errors) or
+                'online' (Rosenblatt's rule, updating after every sample)
+            dtype: Floating point type of the weights and of the training arithmetic
+            history: Recorder configuring which epochs and fields are kept (see
+                TrainingHistory); None keeps every epoch in lists
         """
+        if update_rule not in ('batch', 'online'):
+            raise ValueError(f"Unknown update rule: {update_rule}")
+        
         self.input_size = input_size
         self.learning_rate = learning_rate
+        self.update_rule = update_rule
+        self.history_template = history
+        self.dtype = np.dtype(dtype)
+        if not np.issubdtype(self.dtype, np.floating):
+            raise ValueError(f"dtype must be a floating point type, got {self.dtype}")
         
         if random_seed is not None:
             np.random.seed(random_seed)
         
+        # A seeded model draws its weights from its own legacy generator, which
+        # produces the same values as the seeded global state but is not disturbed
+        # by models created concurrently in other threads
+        self._init_random = np.random.RandomState(random_seed) if random_seed is not None else None
+        
         # Initialize weights and bias with small random values
         # Following Rosenblatt's initialization strategy
-        self.weights = np.random.randn(input_size) * 0.1
-        self.bias = np.random.randn() * 0.1
+        self.weights = (self._random_source().randn(input_size) * 0.1).astype(self.dtype)
+        self.bias = self.dtype.type(self._random_source().randn() * 0.1)
         
         # Track training history
-        self.history = {
-            'loss': [],
-            'accuracy': [],
-            'weights': [],
-            'bias': []
-        }
+        self.history = self._new_history()
     
     def step_activation(self, x: np.ndarray) -> np.ndarray:
         """
@@ -74,7 +92,7 @@ class SingleLayerPerceptron:
             Binary predictions of shape (n_samples,)
         """
         # Compute weighted sum: w·x + b
-        linear_output = np.dot(X, self.weights) + self.bias
+        linear_output = np.dot(np.asarray(X, dtype=self.dtype), self.weights) + self.bias
         
         # Apply step activation
         predictions = self.step_activation(linear_output)
@@ -83,12 +101,17 @@ class SingleLayerPerceptron:
     
     def train_step(self, X: np.ndarray, y: np.ndarray) -> float:
         """
-        Perform one training step on a batch of data.
+        Perform one training step (one pass) over a batch of data.
         
         Implements the perceptron learning rule:
         w_new = w_old + η(target - output)x
         b_new = b_old + η(target - output)
         
+        With the 'batch' rule every output is computed from the weights at the
+        start of the step and the summed update is applied as one matrix product
+        (w += η Xᵀ·errors). With the 'online' rule each output is recomputed after
+        the previous sample's update, as in Rosenblatt's original algorithm.
+        
         Args:
             X: Input data of shape (n_samples, n_features)
             y: Target labels of shape (n_samples,)
@@ -96,20 +119,68 @@ class SingleLayerPerceptron:
         Returns:
             Mean loss for this batch
         """
-        predictions = self.predict(X)
-        errors = y - predictions
+        X = np.asarray(X, dtype=self.dtype)
+        y = np.asarray(y, dtype=self.dtype)
         
-        # Update weights and bias for each sample
-        for i in range(len(X)):
-            self.weights += self.learning_rate * errors[i] * X[i]
-            self.bias += self.learning_rate * errors[i]
+        if self.update_rule == 'online':
+            return self._train_step_online(X, y)
+        return self._train_step_batch(X, y)
+    
+    def _train_step_batch(self, X: np.ndarray, y: np.ndarray,
+                          profiler: Optional[FitProfiler] = None) -> float:
+        """The 'batch' rule, timing its phases when a profiler is given."""
+        # Boolean outputs keep the errors in the dtype of the targets
+        fired = np.dot(X, self.weights) + self.bias > 0
+        if profiler is not None:
+            profiler.lap('forward')
+        errors = y - fired
+        if profiler is not None:
+            profiler.lap('backward')
+        
+        # Python-float products of dtype scalars are float64 under NumPy 1.x
+        # promotion, so the scalar bias is cast back explicitly
+        self.weights += self.learning_rate * np.dot(X.T, errors)
+        self.bias = self.dtype.type(self.bias + self.learning_rate * np.sum(errors))
+        if profiler is not None:
+            profiler.lap('update')
         
         # Calculate loss (mean squared error)
         loss = np.mean(errors ** 2)
+        if profiler is not None:
+            profiler.lap('metrics')
         
         return loss
     
-    def fit(self, X: np.ndarray, y: np.ndarray, epochs: int = 100, verbose: bool = False) -> 'SingleLayerPerceptron':
+    def _train_step_online(self, X: np.ndarray, y: np.ndarray) -> float:
+        """
+        Rosenblatt's online rule: predict and update one sample at a time.
+        
+        The scaled inputs η·x are computed once per pass, so the per-sample work is
+        a dot product and an in-place add of a row view, without temporary arrays.
+        """
+        weights = self.weights
+        bias = self.bias
+        learning_rate = self.dtype.type(self.learning_rate)
+        scaled_X = learning_rate * X
+        squared_error = 0.0
+        
+        for i in range(len(X)):
+            error = y[i] - (np.dot(X[i], weights) + bias > 0)
+            if error > 0:
+                weights += scaled_X[i]
+                bias += learning_rate
+            elif error < 0:
+                weights -= scaled_X[i]
+                bias -= learning_rate
+            squared_error += error * error
+        
+        self.bias = bias
+        
+        # Calculate loss (mean squared error)
+        return squared_error / len(X)
+    
+    def fit(self, X: np.ndarray, y: np.ndarray, epochs: int = 100, verbose: bool = False,
+            profiler: Optional[FitProfiler] = None) -> 'SingleLayerPerceptron':
         """
         Train the perceptron on the given data.
         
@@ -118,26 +189,44 @@ class SingleLayerPerceptron:
             y: Target labels of shape (n_samples,)
             epochs: Number of training epochs
             verbose: Whether to print training progress
+            profiler: Optional FitProfiler accumulating the time of every training
+                phase and running its per-epoch callbacks. The online rule
+                interleaves its phases sample by sample, so its whole pass is
+                charged to 'update'.
             
         Returns:
             Self for method chaining
         """
+        X = np.asarray(X, dtype=self.dtype)
+        y = np.asarray(y, dtype=self.dtype)
+        
+        if profiler is not None:
+            profiler.start()
         for epoch in range(epochs):
             # Perform training step
-            loss = self.train_step(X, y)
+            if profiler is None:
+                loss = self.train_step(X, y)
+            elif self.update_rule == 'online':
+                loss = self._train_step_online(X, y)
+                profiler.lap('update')
+            else:
+                loss = self._train_step_batch(X, y, profiler)
             
             # Calculate accuracy
             predictions = self.predict(X)
             accuracy = np.mean(predictions == y)
+            if profiler is not None:
+                profiler.lap('metrics')
             
             # Store history
-            self.history['loss'].append(loss)
-            self.history['accuracy'].append(accuracy)
-            self.history['weights'].append(self.weights.copy())
-            self.history['bias'].append(self.bias.copy())
+            record_epoch(self.history, loss=loss, accuracy=accuracy,
+                         weights=self.weights, bias=self.bias)
             
             if verbose and (epoch % 10 == 0 or epoch == epochs - 1):
                 print(f"Epoch {epoch:3d}: Loss = {loss:.4f}, Accuracy = {accuracy:.2%}")
+            if profiler is not None:
+                profiler.lap('history')
+                profiler.end_epoch(self, epoch)
             
             # Early stopping if perfect accuracy achieved
             if accuracy == 1.0:
@@ -159,13 +248,26 @@ class SingleLayerPerceptron:
         """
         return self.weights, self.bias
     
+    def _random_source(self):
+        """Generator for weight initialization (the global state for unseeded models)."""
+        return np.random if self._init_random is None else self._init_random
+    
     def reset(self) -> None:
         """Reset the perceptron to initial random state."""
-        self.weights = np.random.randn(self.input_size) * 0.1
-        self.bias = np.random.randn() * 0.1
-        self.history = {
-            'loss': [],
-            'accuracy': [],
-            'weights': [],
-            'bias': []
-        }
+        self.weights = (self._random_source().randn(self.input_size) * 0.1).astype(self.dtype)
+        self.bias = self.dtype.type(self._random_source().randn() * 0.1)
+        self.history = self._new_history()
+    
+    def _new_history(self):
+        """Empty training history, in the configured format."""
+        if self.history_template is None:
+            return {
+                'loss': [],
+                'accuracy': [],
+                'weights': [],
+                'bias': [],
+                'update_rule': self.update_rule
+            }
+        history = self.history_template.empty()
+        history['update_rule'] = self.update_rule
+        return history
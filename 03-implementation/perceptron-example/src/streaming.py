@@ -0,0 +1,177 @@
+"""
+Streaming Metric Aggregation
+
+Summaries of a metric that are updated one value at a time in constant memory,
+so that a sweep can be summarised without keeping every run: Welford's
+algorithm for the mean and variance, and the P² algorithm (Jain & Chlamtac,
+1985) for quantiles, which tracks five markers per quantile instead of the
+values themselves.
+
+Quantiles of short streams (up to ``exact_size`` values) are computed exactly
+from the values seen so far; P² only answers once the stream outgrows them.
+"""
+
+import math
+import numpy as np
+from typing import Dict, Iterable, List, Optional
+
+
+class P2Quantile:
+    """
+    P² estimate of one quantile of a stream.
+
+    Five markers hold the minimum, the maximum, the quantile and two points
+    halfway to it; after every value their positions are moved towards their
+    desired positions and their heights adjusted with a piecewise-parabolic
+    interpolation.
+    """
+
+    def __init__(self, q: float):
+        """
+        Create an estimator.
+
+        Args:
+            q: Quantile to estimate, between 0 and 1 (0.5 for the median)
+        """
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be between 0 and 1, got {q}")
+        self.q = q
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0, 2 * q, 4 * q, 2 + 2 * q, 4]
+        self._increments = [0, q / 2, q, (1 + q) / 2, 1]
+
+    def update(self, value: float) -> None:
+        """Add a value to the stream."""
+        value = float(value)
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        positions = self._positions
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            offset = self._desired[i] - positions[i]
+            if ((offset >= 1 and positions[i + 1] - positions[i] > 1)
+                    or (offset <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (
+                        positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        """Height of marker i moved by step, from the parabola through its neighbours."""
+        h, n = self._heights, self._positions
+        return h[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (h[i] - h[i - 1]) / (n[i] - n[i - 1]))
+
+    @property
+    def value(self) -> float:
+        """Current estimate of the quantile (exact for up to five values)."""
+        if not self.count:
+            return math.nan
+        if self.count <= 5:
+            return float(np.quantile(self._heights, self.q))
+        return self._heights[2]
+
+
+class RunningStatistics:
+    """
+    Count, mean, variance, extremes and quantiles of a stream of values.
+
+    The mean and variance follow Welford's update, which stays accurate where
+    the textbook sum-of-squares formula cancels catastrophically.
+    """
+
+    def __init__(self, quantiles: Iterable[float] = (0.5,), exact_size: int = 1000):
+        """
+        Create an empty summary.
+
+        Args:
+            quantiles: Quantiles to track (e.g. 0.5 for the median)
+            exact_size: Number of values kept for exact quantiles; longer
+                streams fall back to the P² estimates
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.exact_size = exact_size
+        self._values: Optional[List[float]] = []
+        self._quantiles: Dict[float, P2Quantile] = {q: P2Quantile(q) for q in quantiles}
+
+    def update(self, value: float) -> None:
+        """Add a value to the stream."""
+        value = float(value)
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        for estimator in self._quantiles.values():
+            estimator.update(value)
+        if self._values is not None:
+            if self.count <= self.exact_size:
+                self._values.append(value)
+            else:
+                self._values = None
+
+    def variance(self, ddof: int = 0) -> float:
+        """Variance of the values (population variance by default, as np.var)."""
+        if self.count <= ddof:
+            return math.nan
+        return self._m2 / (self.count - ddof)
+
+    def std(self, ddof: int = 0) -> float:
+        """Standard deviation of the values (population by default, as np.std)."""
+        return math.sqrt(self.variance(ddof))
+
+    def quantile(self, q: float) -> float:
+        """
+        Quantile of the values.
+
+        Args:
+            q: One of the tracked quantiles, or any quantile while the values
+                are still kept
+
+        Returns:
+            The exact quantile while at most exact_size values were seen,
+            otherwise the P² estimate
+        """
+        if self._values is not None:
+            return float(np.quantile(self._values, q)) if self._values else math.nan
+        if q not in self._quantiles:
+            raise KeyError(f"Quantile {q} is not tracked")
+        return self._quantiles[q].value
+
+    def summary(self) -> Dict[str, float]:
+        """Mean, standard deviation, extremes and median, as reported by run_experiment."""
+        summary = {'mean': self.mean if self.count else math.nan, 'std': self.std(),
+                   'min': self.min, 'max': self.max}
+        if 0.5 in self._quantiles:
+            summary['median'] = self.quantile(0.5)
+        return summary
@@ -8,13 +8,37 @@ import pytest
 import numpy as np
 import sys
 import os
+import itertools
+import pickle
+import subprocess
+import tracemalloc
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from src.single_layer_perceptron import SingleLayerPerceptron
-from src.multi_layer_perceptron import MultiLayerPerceptron
-from src.data_utils import generate_logic_gate_data
+from src.multi_layer_perceptron import CompiledMLP, MultiLayerPerceptron, TrainingWorkspace
+from src.ensemble import MLPEnsemble, average_parameters, predict_proba_stacked
+from src.optimizers import (SGD, Momentum, Nesterov, RMSProp, Adam, StepDecay,
+                            ExponentialDecay, InverseTimeDecay, CosineDecay, make_optimizer)
+from src.data_utils import (generate_logic_gate_data, generate_boolean_data, generate_parity_data,
+                            iter_boolean_data, decision_mesh, predict_decision_grids)
+from src.evaluation import evaluate_model, run_experiment, statistical_hypothesis_test
+from src.cache import ResultCache
+from src.journal import ExperimentJournal
+from src.animation import animate_training, boundary_frames
+from src.results_store import RaggedArray, load_results, save_results
+from src.history import TrainingHistory
+from src.profiling import FitProfiler
+from src.power import plan_sample_size, simulate_power
+from src.sequential import SequentialTest
+from src.streaming import P2Quantile, RunningStatistics
+from src.comparisons import (adjust_p_values, compare_configurations, friedman_test,
+                             kruskal_wallis_test, pairwise_tests)
+from src.resampling import (bootstrap_ci, bootstrap_distribution, difference_of_means, mean,
+                            permutation_test)
+from src.benchmark import compare_to_baseline, load_baseline, run_benchmarks, save_baseline
 
 
 class TestSingleLayerPerceptron:
@@ -84,6 +108,63 @@ class TestSingleLayerPerceptron:
         assert len(slp.history['accuracy']) == 10
         assert len(slp.history['weights']) == 10
         assert len(slp.history['bias']) == 10
+    
+    def test_batch_update_rule(self):
+        """Test that the batch rule applies the summed perceptron update."""
+        X, y = generate_logic_gate_data('OR')
+        slp = SingleLayerPerceptron(random_seed=42, update_rule='batch')
+        weights, bias = slp.weights.copy(), slp.bias
+        errors = y - slp.predict(X)
+        
+        slp.train_step(X, y)
+        
+        np.testing.assert_allclose(slp.weights, weights + 0.1 * X.T @ errors)
+        np.testing.assert_allclose(slp.bias, bias + 0.1 * errors.sum())
+        assert slp.history['update_rule'] == 'batch'
+    
+    def test_online_update_rule(self):
+        """Test that the online rule recomputes the output after every update."""
+        X, y = generate_logic_gate_data('AND')
+        slp = SingleLayerPerceptron(random_seed=42, update_rule='online')
+        weights, bias = slp.weights.copy(), float(slp.bias)
+        
+        squared_error = 0.0
+        for x_i, y_i in zip(X, y):
+            error = y_i - float(x_i @ weights + bias > 0)
+            weights += 0.1 * error * x_i
+            bias += 0.1 * error
+            squared_error += error ** 2
+        
+        loss = slp.train_step(X, y)
+        
+        np.testing.assert_allclose(slp.weights, weights)
+        np.testing.assert_allclose(slp.bias, bias)
+        assert loss == squared_error / len(X)
+        assert slp.history['update_rule'] == 'online'
+        
+        slp.fit(X, y, epochs=100)
+        assert np.mean(slp.predict(X) == y) == 1.0
+    
+    def test_unknown_update_rule(self):
+        """Test that an unknown update rule is rejected."""
+        with pytest.raises(ValueError):
+            SingleLayerPerceptron(update_rule='unknown')
+
+    
+    def test_float32_dtype(self):
+        """Test that a float32 perceptron keeps float32 parameters through training."""
+        X, y = generate_logic_gate_data('AND', dtype=np.float32)
+        assert X.dtype == y.dtype == np.float32
+        
+        for rule in ['batch', 'online']:
+            slp = SingleLayerPerceptron(random_seed=42, update_rule=rule, dtype=np.float32)
+            slp.fit(X, y, epochs=100)
+            assert slp.weights.dtype == np.float32
+            assert isinstance(slp.bias, np.float32)
+            assert slp.history['accuracy'][-1] == 1.0
+        
+        with pytest.raises(ValueError):
+            SingleLayerPerceptron(dtype=int)
 
 
 class TestMultiLayerPerceptron:
@@ -202,6 +283,1115 @@ class TestMultiLayerPerceptron:
         # History should be cleared
         assert len(mlp.history['loss']) == 0
         assert len(mlp.history['accuracy']) == 0
+    
+    def test_fused_metrics_match_recomputed(self):
+        """Test that fused metrics describe the weights after each update."""
+        X, y = generate_logic_gate_data('XOR')
+        mlp = MultiLayerPerceptron([2, 2, 1], random_seed=42)
+        mlp.fit(X, y, epochs=25, metric_mode='fused')
+        
+        assert len(mlp.history['loss']) == 25
+        assert mlp.history['loss'][-1] == mlp.compute_loss(X, y)
+        assert mlp.history['accuracy'][-1] == np.mean(mlp.predict(X) == y)
+    
+    def test_pre_update_metrics(self):
+        """Test that pre-update metrics lag the weights by one update."""
+        X, y = generate_logic_gate_data('XOR')
+        mlp = MultiLayerPerceptron([2, 2, 1], random_seed=42)
+        initial_loss = mlp.compute_loss(X, y)
+        mlp.fit(X, y, epochs=5, metric_mode='pre_update')
+        
+        assert len(mlp.history['loss']) == 5
+        assert mlp.history['loss'][0] == initial_loss
+        
+        with pytest.raises(ValueError):
+            mlp.fit(X, y, epochs=1, metric_mode='unknown')
+    
+    def test_minibatch_training(self):
+        """Test mini-batch training with per-model shuffling."""
+        X, y = generate_logic_gate_data('XOR')
+        mlp1 = MultiLayerPerceptron([2, 4, 1], random_seed=3).fit(X, y, epochs=3000, batch_size=2)
+        mlp2 = MultiLayerPerceptron([2, 4, 1], random_seed=3).fit(X, y, epochs=3000, batch_size=2)
+        
+        assert np.mean(mlp1.predict(X) == y) == 1.0
+        assert mlp1.history['loss'] == mlp2.history['loss']
+        assert len(mlp1.history['samples_per_sec']) == len(mlp1.history['loss'])
+        
+        with pytest.raises(ValueError):
+            mlp1.fit(X, y, batch_size=0)
+    
+    def test_fit_stream(self):
+        """Test training from a stream of chunks."""
+        rng = np.random.default_rng(0)
+        
+        def stream():
+            for _ in range(20):
+                X_chunk = rng.uniform(-1, 1, size=(500, 2))
+                yield X_chunk, (X_chunk[:, 0] + X_chunk[:, 1] > 0).astype(float)
+        
+        mlp = MultiLayerPerceptron([2, 4, 1], learning_rate=1.0, random_seed=42)
+        mlp.fit_stream(stream(), batch_size=50)
+        
+        assert len(mlp.history['loss']) == 1
+        assert mlp.history['accuracy'][0] > 0.8
+        assert mlp.history['samples_per_sec'][0] > 0
+        
+        # A one-shot iterator cannot be replayed for several epochs
+        with pytest.raises(ValueError):
+            mlp.fit_stream(stream(), epochs=2)
+        
+        X, y = generate_logic_gate_data('AND')
+        mlp.fit_stream([(X[:2], y[:2]), (X[2:], y[2:])], epochs=3)
+        assert len(mlp.history['loss']) == 4
+
+    
+    @pytest.mark.parametrize("optimizer", ['sgd', 'adam'])
+    def test_flat_params_match_separate_arrays(self, optimizer):
+        """Test that flat parameter storage trains exactly like per-layer arrays."""
+        X, y = generate_logic_gate_data('XOR')
+        separate = MultiLayerPerceptron([2, 4, 1], random_seed=42, optimizer=optimizer)
+        flat = MultiLayerPerceptron([2, 4, 1], random_seed=42, optimizer=optimizer,
+                                    flat_params=True)
+        
+        assert all(w.base is flat.params for w in flat.weights + flat.biases)
+        separate.fit(X, y, epochs=300)
+        flat.fit(X, y, epochs=300)
+        
+        assert separate.history['loss'] == flat.history['loss']
+        np.testing.assert_array_equal(separate.get_params(), flat.get_params())
+        assert flat.gradient_norm() == pytest.approx(separate.gradient_norm())
+    
+    def test_param_round_trip(self, tmp_path):
+        """Test getting, setting, saving and pickling flat parameters."""
+        X, y = generate_logic_gate_data('XOR')
+        mlp = MultiLayerPerceptron([2, 3, 1], random_seed=1, flat_params=True)
+        mlp.fit(X, y, epochs=50)
+        assert mlp.get_params().shape == (2 * 3 + 3 + 3 * 1 + 1,)
+        
+        path = tmp_path / 'params.npy'
+        mlp.save_params(path)
+        other = MultiLayerPerceptron([2, 3, 1], random_seed=2)
+        other.load_params(path)
+        np.testing.assert_array_equal(other.predict_proba(X), mlp.predict_proba(X))
+        
+        restored = pickle.loads(pickle.dumps(mlp))
+        restored.set_params(np.zeros_like(mlp.params))
+        assert not restored.weights[0].any()
+        assert mlp.weights[0].any()
+        
+        with pytest.raises(ValueError):
+            mlp.set_params(np.zeros(3))
+        
+        averaged = average_parameters([mlp, other])
+        np.testing.assert_allclose(averaged, mlp.get_params())
+
+    
+    def test_float32_dtype(self):
+        """Test that float32 flows through training and prediction without upcasts."""
+        X, y = generate_logic_gate_data('XOR')
+        mlp64 = MultiLayerPerceptron([2, 4, 1], random_seed=42, optimizer='adam',
+                                     learning_rate=0.05)
+        mlp32 = MultiLayerPerceptron([2, 4, 1], random_seed=42, optimizer='adam',
+                                     learning_rate=0.05, dtype=np.float32)
+        
+        # Same initial network; float64 inputs are converted
+        np.testing.assert_allclose(mlp32.weights[0], mlp64.weights[0], rtol=1e-6)
+        mlp64.fit(X, y, epochs=1000)
+        mlp32.fit(X, y, epochs=1000)
+        
+        assert all(p.dtype == np.float32 for p in mlp32.parameters())
+        assert mlp32.optimizer.state['first_moment'][0].dtype == np.float32
+        assert mlp32.predict_proba(X).dtype == np.float32
+        assert mlp32.history['loss'][-1].dtype == np.float32
+        np.testing.assert_array_equal(mlp32.predict(X), y)
+        np.testing.assert_allclose(mlp32.history['loss'], mlp64.history['loss'][:len(mlp32.history['loss'])],
+                                   rtol=1e-2, atol=1e-4)
+        
+        # The sigmoid clip must stay finite in float32
+        with np.errstate(over='raise'):
+            out = mlp32._sigmoid(np.array([-1e4, 1e4], dtype=np.float32))
+        np.testing.assert_allclose(out, [0, 1], atol=1e-30)
+
+    
+    @pytest.mark.parametrize("activation", ['sigmoid', 'tanh', 'relu'])
+    def test_predict_batch(self, activation):
+        """Test the inference-only pass against forward propagation."""
+        X, y = generate_logic_gate_data('XOR')
+        mlp = MultiLayerPerceptron([2, 8, 4, 1], activation=activation, random_seed=42)
+        mlp.fit(X, y, epochs=200)
+        grid = np.random.default_rng(0).uniform(-1, 2, size=(5000, 2))
+        
+        expected = mlp.forward_propagation(grid)[0][-1].flatten()
+        np.testing.assert_array_equal(mlp.predict_proba(grid), expected)
+        np.testing.assert_allclose(mlp.predict_batch(grid, chunk_size=333), expected, rtol=1e-12)
+        np.testing.assert_allclose(mlp.predict_batch(grid, max_memory=4096), expected, rtol=1e-12)
+        
+        with pytest.raises(ValueError):
+            mlp.predict_batch(grid, chunk_size=0)
+        with pytest.raises(ValueError):
+            mlp.predict_batch(grid, max_memory=8)
+    
+    def test_compile(self):
+        """Test that a compiled model is a frozen snapshot."""
+        X, y = generate_logic_gate_data('XOR')
+        mlp = MultiLayerPerceptron([2, 4, 1], random_seed=42)
+        mlp.fit(X, y, epochs=100)
+        
+        compiled = mlp.compile()
+        assert isinstance(compiled, CompiledMLP)
+        np.testing.assert_array_equal(compiled.predict_proba(X), mlp.predict_proba(X))
+        restored = pickle.loads(pickle.dumps(compiled))
+        np.testing.assert_array_equal(restored.predict(X), mlp.predict(X))
+        
+        before = compiled.predict_proba(X)
+        mlp.fit(X, y, epochs=100)
+        np.testing.assert_array_equal(compiled.predict_proba(X), before)
+        
+        assert all(w.flags.c_contiguous and not w.flags.writeable for w in compiled.weights)
+        with pytest.raises(AttributeError):
+            compiled.weights = None
+        with pytest.raises(ValueError):
+            compiled.weights[0][0, 0] = 1.0
+    
+    @pytest.mark.parametrize("layer_sizes,activation,seed,epochs,losses", [
+        ([2, 4, 1], 'sigmoid', 42, 200,
+         ['0x1.6d1562644e910p-1', '0x1.613652f20d112p-1', '0x1.5c02a89ee2adcp-1']),
+        ([2, 8, 4, 1], 'tanh', 7, 159,
+         ['0x1.742ae4ab12ce3p-1', '0x1.1983a3246e2eep-5', '0x1.45b9e8a0d3160p-7']),
+        ([2, 3, 1], 'relu', 1, 200,
+         ['0x1.4690282d96ee2p-1', '0x1.3b9b0f8b3420ap-4', '0x1.a253479b43b98p-6']),
+    ])
+    def test_history_matches_original_implementation(self, layer_sizes, activation, seed,
+                                                     epochs, losses):
+        """Test that training reproduces the losses of the original implementation bit for bit."""
+        X, y = generate_logic_gate_data('XOR')
+        mlp = MultiLayerPerceptron(layer_sizes, activation=activation, random_seed=seed)
+        mlp.fit(X, y, epochs=200)
+        loss = mlp.history['loss']
+        # Recorded with the original per-epoch np.mean updates (exact float values)
+        assert len(loss) == epochs
+        assert [float(loss[i]).hex() for i in (0, epochs // 2, -1)] == losses
+
+    @pytest.mark.parametrize("layer_sizes,activation,seed,learning_rate,losses", [
+        ([2, 4, 1], 'sigmoid', 42, 0.3,
+         ['0x1.747000346c338p-1', '0x1.4acbe27e762cfp-1', '0x1.1f79b8684dbd9p-1']),
+        ([2, 8, 4, 1], 'tanh', 7, 0.1,
+         ['0x1.b2b7bffdf7124p-1', '0x1.ba0f19cb0a840p-3', '0x1.b6106dc263287p-5']),
+    ])
+    def test_history_matches_original_learning_rate_order(self, layer_sizes, activation, seed,
+                                                          learning_rate, losses):
+        """Test that SGD applies lr * sum / m in the original order for any lr and batch size."""
+        X, y = generate_logic_gate_data('XOR')
+        # Six samples, so that dividing by the batch size rounds
+        X, y = np.vstack([X, X[:2]]), np.append(y, y[:2])
+        mlp = MultiLayerPerceptron(layer_sizes, activation=activation, random_seed=seed,
+                                   learning_rate=learning_rate)
+        mlp.fit(X, y, epochs=300)
+        loss = mlp.history['loss']
+        # Recorded with the original per-epoch updates (exact float values)
+        assert [float(loss[i]).hex() for i in (0, 150, -1)] == losses
+
+        ensemble = MLPEnsemble(layer_sizes, [seed], activation=activation,
+                               learning_rate=learning_rate)
+        ensemble.fit(X, y, epochs=300)
+        assert ensemble.members[0].history == mlp.history
+
+
+class TestTrainingWorkspace:
+    """Tests for preallocated propagation buffers."""
+    
+    @pytest.mark.parametrize("activation", ['sigmoid', 'tanh', 'relu'])
+    def test_derivatives_from_cached_activations(self, activation):
+        """Test that derivatives computed from activations match the reference ones."""
+        mlp = MultiLayerPerceptron([2, 2, 1], activation=activation)
+        x = np.linspace(-3, 3, 13)
+        out = np.empty_like(x)
+        
+        mlp._derivative_from_output(mlp.activation(x), out)
+        np.testing.assert_allclose(out, mlp.activation_derivative(x), atol=1e-12)
+    
+    def test_workspace_is_reused(self):
+        """Test that forward passes write into the workspace buffers."""
+        mlp = MultiLayerPerceptron([2, 4, 1], random_seed=42)
+        X, y = generate_logic_gate_data('XOR')
+        workspace = TrainingWorkspace(mlp.layer_sizes, 8)
+        
+        activations, _ = mlp.forward_propagation(X, workspace)
+        assert np.shares_memory(activations[-1], workspace.activations[-1])
+        np.testing.assert_array_equal(activations[-1].ravel(), mlp.predict_proba(X))
+        
+        with pytest.raises(ValueError):
+            mlp.forward_propagation(np.zeros((9, 2)), workspace)
+    
+    @pytest.mark.parametrize("activation,optimizer", [
+        ('sigmoid', 'sgd'),
+        ('tanh', 'adam'),
+        ('relu', 'nesterov'),
+    ])
+    def test_steady_state_training_does_not_allocate(self, activation, optimizer):
+        """Test that a training epoch allocates no arrays once the workspace exists."""
+        rng = np.random.default_rng(0)
+        X = rng.normal(size=(4096, 2))
+        y = (X[:, 0] * X[:, 1] > 0).astype(float)
+        mlp = MultiLayerPerceptron([2, 16, 8, 1], activation=activation, optimizer=optimizer,
+                                   random_seed=42)
+        workspace = mlp._get_workspace(len(X))
+        
+        def epoch():
+            activations, weighted_inputs = mlp.forward_propagation(X, workspace)
+            mlp._output_metrics(activations[-1], y, workspace)
+            mlp.backward_propagation(X, y, activations, weighted_inputs, workspace)
+        
+        epoch()
+        epoch()
+        tracemalloc.start()
+        try:
+            baseline, _ = tracemalloc.get_traced_memory()
+            for _ in range(10):
+                epoch()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        
+        # Any array temporary would need at least 4096 * 8 bytes; only a few
+        # short-lived Python scalars and views are allowed
+        assert peak - baseline < 4096
+        assert current - baseline < 4096
+
+
+class TestOptimizers:
+    """Tests for optimizers and learning-rate schedules."""
+    
+    def test_sgd_step(self):
+        """Test the plain gradient descent update."""
+        param = np.array([1.0, -2.0])
+        SGD(0.1).step([param], [np.array([0.5, -1.0])])
+        np.testing.assert_allclose(param, [0.95, -1.9])
+    
+    def test_momentum_accumulates_velocity(self):
+        """Test that momentum reuses the previous update direction."""
+        param = np.zeros(1)
+        optimizer = Momentum(0.1, momentum=0.9)
+        optimizer.step([param], [np.ones(1)])
+        optimizer.step([param], [np.ones(1)])
+        np.testing.assert_allclose(param, [-0.1 - 0.19])
+        np.testing.assert_allclose(optimizer.state['velocity'][0], [-0.19])
+    
+    def test_adam_first_step(self):
+        """Test that Adam's bias-corrected first step has magnitude lr."""
+        param = np.zeros(3)
+        Adam(0.01).step([param], [np.array([0.001, -5.0, 20.0])])
+        np.testing.assert_allclose(param, [-0.01, 0.01, -0.01], rtol=1e-3)
+    
+    @pytest.mark.parametrize("optimizer", [SGD(0.1), Momentum(0.1), Nesterov(0.1),
+                                           RMSProp(0.05), Adam(0.1)])
+    def test_minimizes_quadratic(self, optimizer):
+        """Test that every optimizer descends a simple quadratic bowl."""
+        params = [np.array([[3.0, -2.0]]), np.array([[1.5]])]
+        for _ in range(300):
+            optimizer.step(params, [2 * p for p in params])
+        assert all(np.abs(p).max() < 0.1 for p in params)
+    
+    def test_schedules(self):
+        """Test the learning-rate schedules."""
+        assert StepDecay(10, factor=0.5)(1.0, 25) == 0.25
+        assert ExponentialDecay(0.9)(1.0, 2) == pytest.approx(0.81)
+        assert InverseTimeDecay(1.0)(1.0, 3) == 0.25
+        assert CosineDecay(100)(1.0, 100) == pytest.approx(0.0)
+        
+        optimizer = SGD(1.0, schedule=StepDecay(1, factor=0.5))
+        param = np.zeros(1)
+        for _ in range(3):
+            optimizer.step([param], [np.ones(1)])
+        np.testing.assert_allclose(param, [-1.75])
+    
+    def test_make_optimizer(self):
+        """Test optimizer construction by name."""
+        assert isinstance(make_optimizer('nesterov', 0.1), Nesterov)
+        assert make_optimizer('adam', 0.1, beta1=0.8).beta1 == 0.8
+        with pytest.raises(ValueError):
+            make_optimizer('unknown')
+    
+    def test_optimizer_instance_is_copied(self):
+        """Test that one optimizer instance can configure several models."""
+        X, y = generate_logic_gate_data('XOR')
+        optimizer = Adam(0.05)
+        mlp1 = MultiLayerPerceptron([2, 4, 1], optimizer=optimizer, random_seed=1)
+        mlp2 = MultiLayerPerceptron([2, 4, 1], optimizer=optimizer, random_seed=1)
+        mlp1.fit(X, y, epochs=50)
+        mlp2.fit(X, y, epochs=50)
+        
+        assert optimizer.iterations == 0
+        assert mlp1.history == mlp2.history
+        
+        mlp1.reset()
+        assert mlp1.optimizer.iterations == 0 and not mlp1.optimizer.state
+    
+    def test_momentum_converges_faster_on_xor(self):
+        """Test that momentum reaches the stopping criterion in fewer epochs than SGD."""
+        X, y = generate_logic_gate_data('XOR')
+        epochs = {}
+        for optimizer in ['sgd', 'momentum']:
+            mlp = MultiLayerPerceptron([2, 4, 1], learning_rate=0.5, optimizer=optimizer,
+                                       random_seed=42)
+            mlp.fit(X, y, epochs=2000)
+            assert np.mean(mlp.predict(X) == y) == 1.0
+            epochs[optimizer] = len(mlp.history['loss'])
+        
+        assert epochs['momentum'] < epochs['sgd'] / 2
+
+
+class TestMLPEnsemble:
+    """Tests for vectorized seed-ensemble training."""
+    
+    @pytest.mark.parametrize("layer_sizes,activation,learning_rate,optimizer", [
+        ([2, 2, 1], 'sigmoid', 0.5, 'sgd'),
+        ([2, 4, 3, 1], 'tanh', 0.3, 'sgd'),
+        ([2, 3, 1], 'sigmoid', 0.05, 'adam'),
+    ])
+    def test_matches_sequential_training(self, layer_sizes, activation, learning_rate, optimizer):
+        """Test that ensemble members are bit-for-bit identical to sequential models."""
+        X, y = generate_logic_gate_data('XOR')
+        seeds = list(range(42, 50))
+        params = dict(activation=activation, learning_rate=learning_rate, optimizer=optimizer)
+        
+        ensemble = MLPEnsemble(layer_sizes, seeds, **params)
+        ensemble.fit(X, y, epochs=1500)
+        
+        for seed, member in zip(seeds, ensemble.members):
+            mlp = MultiLayerPerceptron(layer_sizes, random_seed=seed, **params)
+            mlp.fit(X, y, epochs=1500)
+            
+            assert member.history == mlp.history
+            for w1, w2 in zip(member.weights + member.biases, mlp.weights + mlp.biases):
+                assert np.array_equal(w1, w2)
+    
+    def test_predict_shape(self):
+        """Test that predictions are returned per member."""
+        X, y = generate_logic_gate_data('AND')
+        ensemble = MLPEnsemble([2, 3, 1], [1, 2, 3])
+        assert ensemble.predict(X).shape == (3, 4)
+    
+    def test_batched_run_experiment(self):
+        """Test that batched run_experiment reproduces the sequential results."""
+        X, y = generate_logic_gate_data('XOR')
+        kwargs = dict(model_class=MultiLayerPerceptron,
+                      model_params={'layer_sizes': [2, 2, 1]},
+                      X_train=X, y_train=y, X_test=X, y_test=y,
+                      training_params={'epochs': 500}, n_runs=4)
+        
+        sequential = run_experiment(**kwargs)
+        batched = run_experiment(batched=True, **kwargs)
+        
+        assert batched['accuracies'] == sequential['accuracies']
+        assert batched['final_epochs'] == sequential['final_epochs']
+        
+        with pytest.raises(ValueError):
+            run_experiment(**dict(kwargs, model_class=SingleLayerPerceptron,
+                                  model_params={}), batched=True)
+
+
+class TestRunExperiment:
+    """Tests for experiment execution."""
+    
+    @staticmethod
+    def _experiment_kwargs():
+        X, y = generate_logic_gate_data('XOR')
+        return dict(model_class=MultiLayerPerceptron,
+                    model_params={'layer_sizes': [2, 2, 1]},
+                    X_train=X, y_train=y, X_test=X, y_test=y,
+                    training_params={'epochs': 300}, n_runs=4)
+    
+    def test_process_pool_matches_serial(self):
+        """Test that parallel runs return the serial results in seed order."""
+        kwargs = self._experiment_kwargs()
+        serial = run_experiment(**kwargs)
+        parallel = run_experiment(n_jobs=2, **kwargs)
+        
+        assert parallel['accuracies'] == serial['accuracies']
+        assert parallel['final_epochs'] == serial['final_epochs']
+        assert parallel['histories'] == serial['histories']
+        assert parallel['statistics']['accuracy'] == serial['statistics']['accuracy']
+    
+    def test_custom_executor(self):
+        """Test that runs can be submitted to a caller-supplied executor."""
+        kwargs = self._experiment_kwargs()
+        serial = run_experiment(**kwargs)
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            unbatched = run_experiment(executor=executor, **kwargs)
+            batched = run_experiment(executor=executor, batched=True, **kwargs)
+        
+        assert unbatched['histories'] == serial['histories']
+        assert batched['histories'] == serial['histories']
+        
+        class InlineExecutor(Executor):
+            """Runs every task on submission (no worker count attribute)."""
+            def submit(self, fn, *args, **kwargs):
+                future = Future()
+                future.set_result(fn(*args, **kwargs))
+                return future
+        
+        inline = run_experiment(executor=InlineExecutor(), n_jobs=2, batched=True, **kwargs)
+        assert inline['histories'] == serial['histories']
+    
+    def test_invalid_n_jobs(self):
+        """Test that a non-positive worker count is rejected."""
+        with pytest.raises(ValueError):
+            run_experiment(n_jobs=0, **self._experiment_kwargs())
+    
+    def test_result_cache(self, tmp_path):
+        """Test that cached runs are reused and only changed runs are retrained."""
+        X, y = generate_logic_gate_data('XOR')
+        cache = ResultCache(str(tmp_path))
+        params = dict(model_class=MultiLayerPerceptron,
+                      model_params={'layer_sizes': [2, 2, 1]},
+                      X_train=X, y_train=y, X_test=X, y_test=y,
+                      training_params={'epochs': 50})
+        
+        first = run_experiment(**params, n_runs=3, cache=cache)
+        assert (cache.hits, cache.misses, len(cache)) == (0, 3, 3)
+        
+        second = run_experiment(**params, n_runs=4, cache=cache)
+        assert (cache.hits, cache.misses, len(cache)) == (3, 4, 4)
+        assert second['accuracies'][:3] == first['accuracies']
+        assert second['training_times'][:3] == first['training_times']
+        assert second['histories'][:3] == first['histories']
+        
+        params['training_params'] = {'epochs': 60}
+        run_experiment(**params, n_runs=1, cache=cache)
+        assert cache.misses == 5
+
+    def test_result_cache_key_covers_dependencies(self, tmp_path, monkeypatch):
+        """Test that changing a module the model depends on invalidates its entries."""
+        package = tmp_path / 'cached_models'
+        package.mkdir()
+        (package / '__init__.py').write_text('')
+        (package / 'model.py').write_text('from .helper import scale\n\nclass Model:\n    pass\n')
+        (package / 'helper.py').write_text('def scale(x):\n    return x\n')
+        monkeypatch.syspath_prepend(str(tmp_path))
+        from cached_models.model import Model
+
+        X, y = generate_logic_gate_data('AND')
+        cache = ResultCache(str(tmp_path / 'cache'))
+        key = cache.key(Model, {}, X, y, X, y, {}, 0)
+        assert cache.key(Model, {}, X, y, X, y, {}, 0) == key
+        (package / 'helper.py').write_text('def scale(x):\n    return 2 * x\n')
+        assert cache.key(Model, {}, X, y, X, y, {}, 0) != key
+
+    def test_result_cache_eviction(self, tmp_path):
+        """Test least-recently-used eviction."""
+        cache = ResultCache(str(tmp_path), max_entries=2)
+        for i, key in enumerate(['a', 'b']):
+            cache.put(key, {'value': i})
+            os.utime(tmp_path / f'{key}.pkl', ns=(i, i))
+        
+        assert cache.get('a') == {'value': 0}  # 'b' is now least recently used
+        cache.put('c', {'value': 2})
+        assert cache.get('b') is None
+        assert cache.get('a') is not None and cache.get('c') is not None
+
+    def test_result_cache_tracks_entries(self, tmp_path):
+        """Test that overwrites and entries removed by other processes keep the limits exact."""
+        cache = ResultCache(str(tmp_path), max_entries=2)
+        cache.put('a', {'value': 0})
+        cache.put('a', {'value': 1})
+        cache.put('b', {'value': 2})
+        assert len(cache) == 2
+
+        os.unlink(tmp_path / 'a.pkl')
+        assert cache.get('a') is None
+        cache.put('c', {'value': 3})
+        cache.put('d', {'value': 4})
+        assert len(cache) == 2 and cache.get('d') == {'value': 4}
+
+    
+    def test_journal_resume(self, tmp_path):
+        """Test that a journal resumes after a crash that truncated its last entry."""
+        X, y = generate_logic_gate_data('XOR')
+        path = str(tmp_path / 'exp.jsonl')
+        params = dict(model_class=MultiLayerPerceptron,
+                      model_params={'layer_sizes': [2, 2, 1]},
+                      X_train=X, y_train=y, X_test=X, y_test=y,
+                      training_params={'epochs': 50}, n_runs=3)
+        
+        first = run_experiment(**params, cache=ExperimentJournal(path, 'exp'))
+        with open(path, 'rb+') as f:
+            f.truncate(os.path.getsize(path) - 10)
+        
+        journal = ExperimentJournal(path, 'exp')
+        assert len(journal) == 2
+        resumed = run_experiment(**params, cache=journal)
+        assert (journal.hits, journal.misses) == (2, 1)
+        assert resumed['accuracies'] == first['accuracies']
+        np.testing.assert_allclose(resumed['histories'][0]['loss'], first['histories'][0]['loss'])
+        
+        assert len(ExperimentJournal(path, 'exp')) == 3
+        assert len(ExperimentJournal(path, 'exp', fresh=True)) == 0
+    
+    def test_fresh_journal_retrains(self, tmp_path):
+        """Test that a fresh journal retrains runs stored in the shared cache."""
+        X, y = generate_logic_gate_data('AND')
+        path = str(tmp_path / 'exp.jsonl')
+        params = dict(model_class=SingleLayerPerceptron, model_params={},
+                      X_train=X, y_train=y, X_test=X, y_test=y,
+                      training_params={'epochs': 5}, n_runs=3)
+        cache = ResultCache(str(tmp_path / 'cache'))
+        run_experiment(**params, cache=ExperimentJournal(path, 'exp', cache=cache))
+        
+        resumed = ExperimentJournal(str(tmp_path / 'other.jsonl'), 'exp', cache=cache)
+        run_experiment(**params, cache=resumed)
+        assert (resumed.hits, resumed.misses) == (3, 0)
+        
+        fresh = ExperimentJournal(path, 'exp', cache=cache, fresh=True)
+        run_experiment(**params, cache=fresh)
+        assert (fresh.hits, fresh.misses) == (0, 3)
+        assert len(fresh) == 3
+
+    
+    def test_columnar_results_store(self, tmp_path):
+        """Test that results survive a round trip through the columnar store."""
+        X, y = generate_logic_gate_data('XOR')
+        params = dict(X_train=X, y_train=y, X_test=X, y_test=y, n_runs=3)
+        results = {
+            'slp': run_experiment(SingleLayerPerceptron, {}, training_params={'epochs': 20},
+                                  **params),
+            'mlp': run_experiment(MultiLayerPerceptron, {'layer_sizes': [2, 2, 1]},
+                                  training_params={'epochs': 30}, **params),
+            'statistical_test': {'p_value': np.float64(0.01), 'significant': True}
+        }
+        path = str(tmp_path / 'exp')
+        save_results(path, results)
+        
+        loaded = load_results(path)
+        assert loaded['statistical_test'] == {'p_value': 0.01, 'significant': True}
+        for group in ['slp', 'mlp']:
+            assert isinstance(loaded[group]['accuracies'], np.memmap)
+            np.testing.assert_array_equal(loaded[group]['accuracies'], results[group]['accuracies'])
+            assert loaded[group]['converged'].dtype == bool
+            assert loaded[group]['statistics']['convergence_rate'] == \
+                results[group]['statistics']['convergence_rate']
+            for saved, history in zip(results[group]['histories'], loaded[group]['histories']):
+                assert history['loss'].dtype == np.float32
+                np.testing.assert_allclose(history['loss'], saved['loss'], rtol=1e-6)
+        assert loaded['slp']['histories'][0]['update_rule'] == 'batch'
+        assert loaded['slp']['histories'][0]['weights'].shape[1] == 2
+        
+        partial = load_results(path, columns=['accuracies'])
+        assert 'histories' not in partial['mlp'] and 'training_times' not in partial['mlp']
+        
+        ragged = RaggedArray.from_rows([[1, 2], [], [3]])
+        assert [list(row) for row in ragged] == [[1, 2], [], [3]]
+
+
+class TestBooleanData:
+    """Tests for the n-input Boolean-function dataset generators."""
+    
+    def test_logic_gates(self):
+        """Test the truth tables of the named 2-input gates."""
+        expected = {'AND': [0, 0, 0, 1], 'OR': [0, 1, 1, 1], 'XOR': [0, 1, 1, 0],
+                    'NAND': [1, 1, 1, 0], 'NOR': [1, 0, 0, 0]}
+        for gate, outputs in expected.items():
+            X, y = generate_logic_gate_data(gate)
+            assert X.tolist() == [[0, 0], [0, 1], [1, 0], [1, 1]]
+            assert y.tolist() == outputs
+        
+        with pytest.raises(ValueError):
+            generate_logic_gate_data('IMPLIES')
+    
+    @pytest.mark.parametrize("n_inputs", [1, 3, 4, 9, 17])
+    def test_parity(self, n_inputs):
+        """Test that rows enumerate all inputs in binary order with their parity."""
+        X, y = generate_parity_data(n_inputs, dtype=np.float32)
+        assert X.shape == (2 ** n_inputs, n_inputs) and X.dtype == y.dtype == np.float32
+        np.testing.assert_array_equal(X @ 2.0 ** np.arange(n_inputs - 1, -1, -1),
+                                      np.arange(2 ** n_inputs))
+        np.testing.assert_array_equal(y, X.sum(axis=1) % 2)
+    
+    def test_function_index(self):
+        """Test that bit r of a function index is the output of row r."""
+        X, y = generate_boolean_data(2, 6)
+        np.testing.assert_array_equal(y, generate_logic_gate_data('XOR')[1])
+        
+        function_index = int(np.random.default_rng(0).integers(0, 2 ** 62)) << 2
+        _, y = generate_boolean_data(6, function_index)
+        assert int(''.join(str(int(v)) for v in y[::-1]), 2) == function_index
+        
+        with pytest.raises(ValueError):
+            generate_boolean_data(2, 16)
+    
+    def test_chunks_match_full_dataset(self):
+        """Test that chunked generation reproduces the noisy, replicated dataset."""
+        options = dict(replicas=3, noise_std=0.1, flip_probability=0.2, random_seed=7)
+        X, y = generate_boolean_data(5, 'parity', **options)
+        chunks = list(iter_boolean_data(5, 'parity', chunk_size=7, **options))
+        
+        assert len(X) == 3 * 32 and max(len(c[0]) for c in chunks) == 7
+        np.testing.assert_array_equal(np.concatenate([c[0] for c in chunks]), X)
+        np.testing.assert_array_equal(np.concatenate([c[1] for c in chunks]), y)
+        
+        clean_X, clean_y = generate_boolean_data(5, 'parity', replicas=3)
+        assert 0 < np.mean(y != clean_y) < 0.5
+        assert np.abs(X - clean_X).max() < 1.0
+
+
+
+class TestDecisionBoundaries:
+    """Tests for decision-boundary evaluation and animation."""
+    
+    def test_decision_grids(self):
+        """Test that batched mesh predictions match each model's own predictions."""
+        X, y = generate_logic_gate_data('XOR')
+        mlps = [MultiLayerPerceptron([2, 3, 1], random_seed=seed).fit(X, y, epochs=200)
+                for seed in range(4)]
+        slps = [SingleLayerPerceptron(random_seed=seed).fit(X, y, epochs=20) for seed in range(3)]
+        xx, yy, grid = decision_mesh()
+        assert xx.shape == (200, 200) and decision_mesh() is decision_mesh()
+        assert not grid.flags.writeable
+        
+        np.testing.assert_array_equal(predict_proba_stacked(mlps, grid, chunk_size=1000),
+                                      np.stack([mlp.predict_proba(grid) for mlp in mlps]))
+        for models in [mlps, slps, [mlps[0], slps[0]], [CompiledMLP(mlps[1])]]:
+            Z = predict_decision_grids(models, chunk_size=3000)
+            expected = np.stack([model.predict(grid).reshape(xx.shape) for model in models])
+            np.testing.assert_array_equal(Z, expected)
+        
+        with pytest.raises(ValueError):
+            predict_proba_stacked([mlps[0], MultiLayerPerceptron([2, 4, 1])], grid)
+
+    
+    def test_training_animation(self, tmp_path):
+        """Test that animation frames follow the recorded weight snapshots."""
+        X, y = generate_logic_gate_data('AND')
+        slp = SingleLayerPerceptron(random_seed=1, learning_rate=0.01).fit(X, y, epochs=50)
+        n_epochs = len(slp.history['weights'])
+        xx, _, grid = decision_mesh()
+        
+        frames = list(boundary_frames(np.array(slp.history['weights']),
+                                      np.array(slp.history['bias']), frames_per_batch=4))
+        assert len(frames) == n_epochs
+        for epoch in [0, n_epochs - 1]:
+            snapshot = SingleLayerPerceptron()
+            snapshot.weights = slp.history['weights'][epoch]
+            snapshot.bias = slp.history['bias'][epoch]
+            np.testing.assert_array_equal(frames[epoch], snapshot.predict(grid).reshape(xx.shape))
+        
+        n_frames = animate_training(slp, X, y, str(tmp_path / 'frames'), stride=5, dpi=40)
+        assert n_frames == len(range(0, n_epochs, 5)) + ((n_epochs - 1) % 5 != 0)
+        assert len(os.listdir(tmp_path / 'frames')) == n_frames
+
+
+class TestTrainingHistory:
+    """Tests for compact, opt-in training history recording."""
+    
+    def test_recording(self):
+        """Test growth, strides (always ending at the last epoch), fields and summaries."""
+        losses = np.linspace(1, 0, 10)
+        full = TrainingHistory(capacity=2)
+        strided = TrainingHistory(stride=4, fields=['loss'])
+        summary = TrainingHistory(summary_only=True)
+        for epoch, loss in enumerate(losses):
+            for history in (full, strided, summary):
+                history.record(loss=loss, weights=np.full(2, epoch, dtype=np.float32))
+        
+        np.testing.assert_array_equal(full['loss'], losses)
+        assert full['weights'].shape == (10, 2) and full['weights'].dtype == np.float32
+        np.testing.assert_array_equal(strided['epochs'], [0, 4, 8, 9])
+        np.testing.assert_array_equal(strided['loss'], losses[[0, 4, 8, 9]])
+        assert 'weights' not in strided
+        np.testing.assert_array_equal(summary['epochs'], [9])
+        np.testing.assert_array_equal(summary['weights'], [[9, 9]])
+        assert summary.n_epochs == 10
+    
+    def test_models_and_run_experiment(self):
+        """Test that models fill a TrainingHistory with the values of the list history."""
+        X, y = generate_logic_gate_data('XOR')
+        reference = MultiLayerPerceptron([2, 4, 1], random_seed=3).fit(X, y, epochs=300)
+        compact = MultiLayerPerceptron([2, 4, 1], random_seed=3,
+                                       history=TrainingHistory(stride=7)).fit(X, y, epochs=300)
+        epochs = compact.history['epochs']
+        assert epochs[-1] == len(reference.history['loss']) - 1
+        np.testing.assert_array_equal(compact.history['loss'],
+                                      np.array(reference.history['loss'])[epochs])
+        
+        slp = SingleLayerPerceptron(random_seed=0, history=TrainingHistory()).fit(X, y, epochs=5)
+        assert slp.history['update_rule'] == 'batch' and slp.history['weights'].shape == (5, 2)
+        slp.reset()
+        assert slp.history.n_epochs == 0 and isinstance(slp.history, TrainingHistory)
+        
+        results = run_experiment(MultiLayerPerceptron,
+                                 {'layer_sizes': [2, 4, 1],
+                                  'history': TrainingHistory(summary_only=True)},
+                                 X, y, X, y, {'epochs': 200}, n_runs=3, batched=True)
+        expected = run_experiment(MultiLayerPerceptron, {'layer_sizes': [2, 4, 1]},
+                                  X, y, X, y, {'epochs': 200}, n_runs=3)
+        assert results['final_epochs'] == expected['final_epochs']
+        for history, full in zip(results['histories'], expected['histories']):
+            np.testing.assert_array_equal(history['epochs'], [len(full['loss']) - 1])
+            np.testing.assert_array_equal(history['loss'], full['loss'][-1:])
+
+
+class TestBenchmark:
+    """Tests for the benchmark harness."""
+    
+    def test_timing_and_baseline_comparison(self, tmp_path):
+        """Test calibrated timings, baseline storage and regression detection."""
+        calls = []
+        suite = {'fast': lambda: (lambda: calls.append(1)),
+                 'slow': lambda: (lambda: sum(range(20000)))}
+        results = run_benchmarks(suite, pattern='fast|slow', repeat=3, min_time=0.002)
+        assert set(results) == {'fast', 'slow'}
+        assert results['fast']['number'] > 1
+        # Calibration doubles the calls (1 + 2 + ... + number) up to the first repeat
+        number = results['fast']['number']
+        assert len(calls) == (2 * number - 1) + 2 * number
+        assert 0 < results['fast']['min'] <= results['fast']['median']
+        
+        path = str(tmp_path / 'baseline.json')
+        save_baseline(path, {'fast': results['fast']})
+        save_baseline(path, {'slow': results['slow']})
+        baseline = load_baseline(path)
+        assert baseline == results
+        
+        slower = {'fast': {'min': 2 * baseline['fast']['min']},
+                  'slow': {'min': 1.1 * baseline['slow']['min']},
+                  'new': {'min': 1.0}}
+        regressions = compare_to_baseline(slower, baseline, threshold=1.25)
+        assert [name for name, *_ in regressions] == ['fast']
+        assert regressions[0][3] == pytest.approx(2.0)
+
+
+class TestFitProfiler:
+    """Tests for per-phase training time instrumentation."""
+    
+    @pytest.mark.parametrize("fit_params", [
+        {'metric_mode': 'fused'}, {'metric_mode': 'pre_update'}, {'batch_size': 2}])
+    def test_mlp_phases_and_callbacks(self, fit_params):
+        """Test that profiling times every phase without changing training."""
+        X, y = generate_logic_gate_data('XOR')
+        epochs_seen = []
+        profiler = FitProfiler()
+        profiler.add_callback(lambda model, epoch, phase_ns: epochs_seen.append(
+            (model, epoch, sum(phase_ns.values()))))
+        
+        profiled = MultiLayerPerceptron([2, 4, 1], random_seed=5).fit(
+            X, y, epochs=3000, profiler=profiler, **fit_params)
+        plain = MultiLayerPerceptron([2, 4, 1], random_seed=5).fit(X, y, epochs=3000, **fit_params)
+        
+        np.testing.assert_array_equal(profiled.weights[0], plain.weights[0])
+        n_epochs = len(plain.history['loss'])
+        assert profiler.n_epochs == n_epochs
+        assert [epoch for _, epoch, _ in epochs_seen] == list(range(n_epochs))
+        assert all(model is profiled and ns > 0 for model, _, ns in epochs_seen)
+        expected = {'forward', 'backward', 'update', 'metrics', 'history'}
+        if 'batch_size' in fit_params:
+            expected.add('data')
+        assert set(profiler.summary()) == expected
+        assert profiler.total_ns == sum(ns for _, _, ns in epochs_seen)
+        assert sum(s['fraction'] for s in profiler.summary().values()) == pytest.approx(1.0)
+    
+    def test_slp_phases(self):
+        """Test the single-layer phases for both update rules."""
+        X, y = generate_logic_gate_data('AND')
+        profiler = FitProfiler()
+        SingleLayerPerceptron(random_seed=0).fit(X, y, epochs=20, profiler=profiler)
+        assert set(profiler.summary()) == {'forward', 'backward', 'update', 'metrics', 'history'}
+        
+        profiler.reset()
+        slp = SingleLayerPerceptron(random_seed=0, update_rule='online')
+        slp.fit(X, y, epochs=20, profiler=profiler)
+        assert set(profiler.summary()) == {'update', 'metrics', 'history'}
+        assert profiler.n_epochs == len(slp.history['loss'])
+        assert 'update' in profiler.report()
+
+
+class TestResampling:
+    """Tests for the vectorized bootstrap and permutation engine."""
+    
+    def test_exact_permutation_test(self):
+        """Test the exact p-values against a loop over every reassignment."""
+        rng = np.random.default_rng(0)
+        x, y = rng.normal(0.5, 1, 6), rng.normal(0, 1, 5)
+        pooled = np.concatenate([x, y])
+        observed = x.mean() - y.mean()
+        null = []
+        for first in itertools.combinations(range(11), 6):
+            second = [i for i in range(11) if i not in first]
+            null.append(pooled[list(first)].mean() - pooled[second].mean())
+        null = np.array(null)
+        
+        greater = permutation_test(x, y, alternative='greater', chunk_size=50)
+        assert greater['exact'] and greater['n_resamples'] == len(null)
+        assert greater['p_value'] == pytest.approx(np.mean(null >= observed - 1e-12))
+        less = permutation_test(x, y, alternative='less')
+        assert less['p_value'] == pytest.approx(np.mean(null <= observed + 1e-12))
+        both = permutation_test(x, y)
+        assert both['p_value'] == pytest.approx(2 * min(greater['p_value'], less['p_value']))
+        
+        monte_carlo = permutation_test(x, y, alternative='greater', exact=False,
+                                       n_resamples=20000, random_seed=1)
+        assert not monte_carlo['exact']
+        assert monte_carlo['p_value'] == pytest.approx(greater['p_value'], abs=0.01)
+    
+    def test_bootstrap_intervals(self):
+        """Test chunking, interval methods and degenerate samples."""
+        rng = np.random.default_rng(1)
+        x, y = rng.uniform(0.8, 1.0, 15), rng.uniform(0.3, 0.6, 12)
+        np.testing.assert_array_equal(
+            bootstrap_distribution([x], mean, n_resamples=1000, chunk_size=7, random_seed=3),
+            bootstrap_distribution([x], mean, n_resamples=1000, random_seed=3))
+        
+        from scipy import stats
+        reference = stats.bootstrap((x, y), difference_of_means, n_resamples=20000,
+                                    method='BCa', random_state=0).confidence_interval
+        for method in ('bca', 'percentile'):
+            ci = bootstrap_ci([x, y], method=method, n_resamples=20000, random_seed=0)
+            assert ci['low'] < ci['estimate'] < ci['high']
+            assert ci['low'] == pytest.approx(reference.low, abs=0.01)
+            assert ci['high'] == pytest.approx(reference.high, abs=0.01)
+        
+        # Every single-layer run stuck at the same accuracy
+        constant = bootstrap_ci([np.full(10, 0.5)], mean, n_resamples=500)
+        assert constant['low'] == constant['high'] == 0.5
+
+
+class TestPowerAnalysis:
+    """Tests for simulation-based power analysis and sample-size planning."""
+    
+    def test_power_matches_t_distribution(self):
+        """Test simulated power against the noncentral t power of a normal pilot."""
+        from scipy import stats
+        rng = np.random.default_rng(0)
+        a, b = rng.normal(0.6, 0.1, 5000), rng.normal(0.5, 0.1, 5000)
+        curve = simulate_power(a, b, n_runs=[5, 10, 20], n_simulations=8000, random_seed=0)
+        for n, power in zip(curve['n_runs'], curve['power']):
+            df = 2 * n - 2
+            expected = stats.nct.sf(stats.t.ppf(0.95, df), df, np.sqrt(n / 2))
+            assert power == pytest.approx(expected, abs=0.03)
+    
+    def test_plan_sample_size(self):
+        """Test that the plan is the smallest simulated size reaching the target."""
+        X, y = generate_logic_gate_data('XOR')
+        pilot = {'accuracies': [1.0, 0.75, 1.0, 1.0, 0.75, 1.0, 1.0, 1.0]}
+        plan = plan_sample_size(pilot, threshold=0.8, target_power=0.8, random_seed=0)
+        n, curve = plan['n_runs'], plan['power_curve']
+        assert 2 < n < 100 and curve[n] >= 0.8 > curve[n - 1]
+        
+        # Decided outcomes (no variance) need the minimum number of runs
+        slp = run_experiment(SingleLayerPerceptron, {}, X, y, X, y, {'epochs': 20}, n_runs=3)
+        decided = plan_sample_size(np.ones(5), slp, random_seed=0)
+        assert decided['n_runs'] == 2 and decided['power'] == 1.0
+        assert plan_sample_size(slp, threshold=0.9)['n_runs'] is None
+        
+        with pytest.raises(ValueError):
+            simulate_power(pilot, np.ones(3), threshold=0.9)
+
+
+class TestSequentialTesting:
+    """Tests for stopping seed sweeps early with a sequential test."""
+    
+    def test_looks(self):
+        """Test that looks follow the batches and always end at the planned runs."""
+        assert SequentialTest(0.9, batch_size=4).looks(10) == [4, 8, 10]
+        assert SequentialTest(0.9, batch_size=2, min_runs=5).looks(8) == [5, 7, 8]
+        assert SequentialTest(0.9).looks(3) == [3]
+        with pytest.raises(ValueError):
+            SequentialTest(0.9, alternative='two-sided')
+    
+    def test_identical_runs(self):
+        """Test the interval of runs without variance."""
+        test = SequentialTest(0.9, batch_size=4)
+        # A few perfect runs do not yet rule out occasional failures
+        assert test.evaluate(np.ones(4), n_looks=5)['decision'] is None
+        stuck = test.evaluate(np.full(8, 0.5), n_looks=5)
+        assert stuck['decision'] == 'rejected' and 0.5 < stuck['high'] < 0.9
+        less = SequentialTest(0.9, alternative='less').evaluate(np.full(8, 0.5), n_looks=5)
+        assert less['decision'] == 'supported'
+    
+    def test_sweep_stops_early(self):
+        """Test that a sweep stops once the hypothesis is settled."""
+        X, y = generate_logic_gate_data('XOR')
+        test = SequentialTest(0.9, batch_size=4)
+        slp = run_experiment(SingleLayerPerceptron, {}, X, y, X, y, {'epochs': 20},
+                             n_runs=20, sequential=test)
+        record = slp['sequential']
+        assert record['decision'] == 'rejected' and record['stopped_early']
+        assert record['looks'][-1] == len(slp['accuracies']) < 20
+        assert len(record['intervals']) == len(record['looks'])
+        assert 'rejected after' in record['reason']
+        
+        # Matches the first runs of the full sweep
+        full = run_experiment(SingleLayerPerceptron, {}, X, y, X, y, {'epochs': 20}, n_runs=20)
+        assert slp['accuracies'] == full['accuracies'][:len(slp['accuracies'])]
+    
+    def test_sweep_without_decision(self):
+        """Test that an unsettled sweep completes every planned run."""
+        X, y = generate_logic_gate_data('XOR')
+        mlp = run_experiment(MultiLayerPerceptron, {'layer_sizes': [2, 4, 1]}, X, y, X, y,
+                             {'epochs': 3000}, n_runs=8, batched=True,
+                             sequential=SequentialTest(0.9, batch_size=4))
+        record = mlp['sequential']
+        assert record['decision'] is None and not record['stopped_early']
+        assert len(mlp['accuracies']) == record['planned_runs'] == 8
+        assert 'without a decision' in record['reason']
+
+
+class TestMultipleComparisons:
+    """Tests for the all-pairs comparison of configuration sweeps."""
+    
+    def test_pairwise_tests_match_scipy(self):
+        """Test every pair against scipy's two-sample tests."""
+        from scipy import stats
+        rng = np.random.default_rng(0)
+        matrix = rng.choice([0.5, 0.75, 1.0], size=(12, 5), p=[0.2, 0.3, 0.5])
+        paired = pairwise_tests(matrix)
+        welch = pairwise_tests(matrix, paired=False)
+        assert len(paired['first']) == 10
+        for pair, (i, j) in enumerate(zip(paired['first'], paired['second'])):
+            a, b = matrix[:, i], matrix[:, j]
+            assert paired['p_value'][pair] == pytest.approx(stats.ttest_rel(a, b).pvalue)
+            assert welch['p_value'][pair] == pytest.approx(
+                stats.ttest_ind(a, b, equal_var=False).pvalue)
+            u = stats.mannwhitneyu(a, b).statistic
+            assert paired['cliffs_delta'][pair] == pytest.approx(2 * u / len(a) ** 2 - 1)
+            reference = statistical_hypothesis_test(a, b)
+            assert paired['cohens_d'][pair] == pytest.approx(reference['cohens_d'])
+        
+        # Identical runs are decided by the sign of the difference
+        decided = pairwise_tests(np.array([[1.0, 0.5, 1.0]] * 4))
+        assert decided['p_value'].tolist() == [0.0, 1.0, 0.0]
+    
+    def test_omnibus_tests_match_scipy(self):
+        """Test the tie-corrected rank tests against scipy."""
+        from scipy import stats
+        rng = np.random.default_rng(1)
+        matrix = rng.choice([0.5, 0.75, 1.0], size=(10, 6))
+        friedman = friedman_test(matrix)
+        expected = stats.friedmanchisquare(*matrix.T)
+        assert friedman['statistic'] == pytest.approx(expected.statistic)
+        assert friedman['p_value'] == pytest.approx(expected.pvalue)
+        kruskal = kruskal_wallis_test(matrix)
+        expected = stats.kruskal(*matrix.T)
+        assert kruskal['statistic'] == pytest.approx(expected.statistic)
+        assert kruskal['p_value'] == pytest.approx(expected.pvalue)
+        assert friedman_test(np.ones((5, 3)))['p_value'] == 1.0
+    
+    def test_adjust_p_values(self):
+        """Test the Holm and Benjamini-Hochberg corrections on a known example."""
+        p = np.array([0.04, 0.01, 0.03, 0.005])
+        np.testing.assert_allclose(adjust_p_values(p, 'holm'), [0.06, 0.03, 0.06, 0.02])
+        np.testing.assert_allclose(adjust_p_values(p, 'bh'), [0.04, 0.02, 0.04, 0.02])
+        np.testing.assert_allclose(adjust_p_values(p, 'bonferroni'), [0.16, 0.04, 0.12, 0.02])
+        with pytest.raises(ValueError):
+            adjust_p_values(p, 'sidak')
+    
+    def test_compare_configurations(self):
+        """Test the comparison of run_experiment results."""
+        results = {
+            'slp': {'accuracies': [0.5, 0.5, 0.75, 0.5, 0.5, 0.5]},
+            'small': {'accuracies': [0.75, 1.0, 0.75, 1.0, 0.5, 1.0]},
+            'large': {'accuracies': [1.0, 1.0, 1.0, 1.0, 1.0, 1.0]}
+        }
+        comparison = compare_configurations(results, correction='bh')
+        pairwise = comparison['pairwise']
+        assert comparison['omnibus']['test'] == 'friedman'
+        assert pairwise['names'] == [('slp', 'small'), ('slp', 'large'), ('small', 'large')]
+        assert np.all(pairwise['p_adjusted'] >= pairwise['p_value'])
+        assert pairwise['significant'][1] and pairwise['mean_diff'][1] < 0
+        assert compare_configurations(results, paired=False)['omnibus']['test'] == 'kruskal-wallis'
+        
+        with pytest.raises(ValueError):
+            compare_configurations({'a': {'accuracies': [1.0]}, 'b': {'accuracies': [1.0, 0.5]}})
+
+
+class TestStreamingStatistics:
+    """Tests for constant-memory aggregation of metrics."""
+    
+    def test_running_statistics(self):
+        """Test Welford's mean and variance against numpy, including a large offset."""
+        values = 1e9 + np.random.default_rng(0).random(2000)
+        stats = RunningStatistics(exact_size=100)
+        for value in values:
+            stats.update(value)
+        assert stats.count == 2000
+        assert stats.mean == pytest.approx(np.mean(values), rel=1e-15)
+        assert stats.std() == pytest.approx(np.std(values), rel=1e-6)
+        assert stats.std(ddof=1) == pytest.approx(np.std(values, ddof=1), rel=1e-6)
+        assert (stats.min, stats.max) == (values.min(), values.max())
+        # Past exact_size the median is the P² estimate
+        assert stats.quantile(0.5) == pytest.approx(np.median(values), abs=0.02)
+        with pytest.raises(KeyError):
+            stats.quantile(0.9)
+    
+    def test_exact_quantiles_of_short_streams(self):
+        """Test that short streams report numpy's quantiles."""
+        values = [0.5, 1.0, 0.75, 1.0, 1.0, 0.5, 1.0]
+        stats = RunningStatistics()
+        for value in values:
+            stats.update(value)
+        assert stats.summary()['median'] == np.median(values)
+        assert stats.quantile(0.25) == np.quantile(values, 0.25)
+    
+    def test_p2_quantiles(self):
+        """Test P² estimates of several quantiles of skewed data."""
+        values = np.random.default_rng(1).exponential(size=20000)
+        for q in (0.1, 0.5, 0.9):
+            estimator = P2Quantile(q)
+            for value in values:
+                estimator.update(value)
+            assert estimator.value == pytest.approx(np.quantile(values, q), rel=0.02)
+    
+    def test_evaluate_model_confusion_counts(self):
+        """Test confusion counts against boolean masks, in one pass and in chunks."""
+        rng = np.random.default_rng(2)
+        X = rng.integers(0, 2, (1000, 2)).astype(float)
+        y = rng.integers(0, 2, 1000)
+        model = SingleLayerPerceptron(random_seed=0)
+        model.fit(X, y, epochs=5)
+        predictions = model.predict(X)
+        metrics = evaluate_model(model, X, y)
+        assert metrics['true_positives'] == np.sum((predictions == 1) & (y == 1))
+        assert metrics['false_positives'] == np.sum((predictions == 1) & (y == 0))
+        assert metrics['false_negatives'] == np.sum((predictions == 0) & (y == 1))
+        assert metrics['accuracy'] == np.mean(predictions == y)
+        assert evaluate_model(model, X, y, chunk_size=64) == metrics
+        
+        for labels in (np.where(y == 1, 2, 0), y - 1, y + 0.5):
+            with pytest.raises(ValueError, match="binary"):
+                evaluate_model(model, X, labels)
+    
+    def test_run_experiment_without_runs(self):
+        """Test that a streamed sweep reports the statistics of a full one."""
+        X, y = generate_logic_gate_data('AND')
+        full = run_experiment(SingleLayerPerceptron, {}, X, y, X, y, {'epochs': 3}, n_runs=12)
+        streamed = run_experiment(SingleLayerPerceptron, {}, X, y, X, y, {'epochs': 3},
+                                  n_runs=12, keep_runs=False)
+        assert streamed['accuracies'] == [] and streamed['histories'] == []
+        assert streamed['statistics']['accuracy'] == pytest.approx(full['statistics']['accuracy'])
+        accuracies = full['accuracies']
+        assert full['statistics']['accuracy']['median'] == np.median(accuracies)
+        assert full['statistics']['accuracy']['std'] == pytest.approx(np.std(accuracies))
+        assert streamed['statistics']['convergence_rate'] == \
+            pytest.approx(full['statistics']['convergence_rate'])
+
+
+class TestPackageImport:
+    """Tests for the import cost of the package."""
+    
+    def test_heavy_dependencies_are_lazy(self):
+        """Test that training and experiments do not import plotting or statistics libraries."""
+        code = (
+            "import sys\n"
+            "from src import SingleLayerPerceptron, MultiLayerPerceptron, run_experiment\n"
+            "from src.data_utils import generate_logic_gate_data\n"
+            "X, y = generate_logic_gate_data('AND')\n"
+            "run_experiment(SingleLayerPerceptron, {}, X, y, X, y, {'epochs': 5}, n_runs=2)\n"
+            "print(sorted(m for m in ('matplotlib', 'seaborn', 'scipy', 'pandas') if m in sys.modules))\n"
+        )
+        root = os.path.join(os.path.dirname(__file__), '..')
+        output = subprocess.run([sys.executable, '-c', code], cwd=root, check=True,
+                                capture_output=True, text=True).stdout
+        assert output.strip() == '[]'
 
 
 if __name__ == "__main__":
@@ -7,7 +7,9 @@ single-layer vs multi-layer perceptrons and the XOR problem.
 
 import sys
 import os
-import json
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import matplotlib.pyplot as plt
 from datetime import datetime
@@ -18,7 +20,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../03-implementat
 from src.single_layer_perceptron import SingleLayerPerceptron
 from src.multi_layer_perceptron import MultiLayerPerceptron
 from src.data_utils import generate_logic_gate_data, visualize_decision_boundary, plot_training_history, plot_comparison_results
-from src.evaluation import evaluate_model, run_experiment, compare_architectures, statistical_hypothesis_test, generate_experiment_report
+from src.evaluation import run_experiment, compare_architectures, statistical_hypothesis_test, generate_experiment_report
+from src.cache import ResultCache
+from src.comparisons import compare_configurations, format_comparison
+from src.journal import ExperimentJournal
+from src.results_store import save_results
 
 
 # Configure matplotlib for better output
@@ -27,12 +33,15 @@ plt.rcParams['figure.dpi'] = 100
 plt.rcParams['savefig.dpi'] = 300
 
 
-def experiment_1_architecture_comparison():
+def experiment_1_architecture_comparison(cache=None):
     """
     Experiment 1: Test Primary Hypothesis
     Compare single-layer vs multi-layer perceptron on XOR.
     
     Hypothesis: Multi-layer networks can learn XOR while single-layer cannot.
+    
+    Args:
+        cache: Optional ResultCache or ExperimentJournal with the runs of previous invocations
     """
     print("=" * 80)
     print("EXPERIMENT 1: Architecture Comparison on XOR")
@@ -51,7 +60,8 @@ def experiment_1_architecture_comparison():
         X_test=X,
         y_test=y,
         training_params={'epochs': 500, 'verbose': False},
-        n_runs=20
+        n_runs=20,
+        cache=cache
     )
     
     # Test multi-layer perceptron
@@ -64,7 +74,9 @@ def experiment_1_architecture_comparison():
         X_test=X,
         y_test=y,
         training_params={'epochs': 2000, 'verbose': False},
-        n_runs=20
+        n_runs=20,
+        batched=True,
+        cache=cache
     )
     
     # Statistical comparison
@@ -117,9 +129,8 @@ Multi-layer perceptrons significantly outperform single-layer perceptrons on XOR
         'statistical_test': stats_test
     }
     
-    with open('results/exp1_data.json', 'w') as f:
-        json.dump({k: v if not isinstance(v, np.ndarray) else v.tolist() 
-                  for k, v in results.items()}, f, indent=2)
+    # Columnar store: per-run scalars and histories are memory-mapped on read
+    save_results('results/exp1_data', results)
     
     print(report)
     
@@ -136,21 +147,24 @@ Multi-layer perceptrons significantly outperform single-layer perceptrons on XOR
     # Create visualizations
     visualize_decision_boundary(slp_viz, X, y, 
                               "Single-Layer Perceptron on XOR",
-                              "results/exp1_slp_boundary.png")
+                              "results/exp1_slp_boundary.png", show=False)
     
     visualize_decision_boundary(mlp_viz, X, y,
                               "Multi-Layer Perceptron on XOR",
-                              "results/exp1_mlp_boundary.png")
+                              "results/exp1_mlp_boundary.png", show=False)
     
     return results
 
 
-def experiment_2_hidden_layer_size():
+def experiment_2_hidden_layer_size(cache=None):
     """
     Experiment 2: Test Architecture Scaling Hypothesis
     Test how hidden layer size affects XOR learning performance.
     
     Hypothesis: Increasing hidden layer size improves performance up to a point.
+    
+    Args:
+        cache: Optional ResultCache or ExperimentJournal with the runs of previous invocations
     """
     print("\n" + "=" * 80)
     print("EXPERIMENT 2: Hidden Layer Size Impact")
@@ -168,7 +182,7 @@ def experiment_2_hidden_layer_size():
     }
     
     print("\nTesting different architectures...")
-    results = compare_architectures(architectures, X, y, n_runs=10)
+    results = compare_architectures(architectures, X, y, n_runs=10, batched=True, cache=cache)
     
     # Extract statistics for analysis
     arch_names = list(results.keys())
@@ -230,8 +244,15 @@ Increasing hidden layer size will improve XOR learning performance up to an opti
     # Find optimal architecture
     optimal_arch = arch_names[np.argmax(mean_accuracies)]
     
+    # Every architecture is trained on the same seeds, so runs are paired by seed
+    comparison = compare_configurations(results, paired=True, correction='holm')
+    
     report += f"""
 
+## Multiple Comparisons (paired by seed, Holm-corrected)
+
+{format_comparison(comparison)}
+
 ## Analysis
 - **Optimal Architecture**: {optimal_arch}
 - **Minimum viable size**: 2 hidden units can solve XOR
@@ -251,10 +272,13 @@ then plateaus. No degradation observed, likely because XOR is too simple to caus
     return results
 
 
-def experiment_3_all_logic_gates():
+def experiment_3_all_logic_gates(cache=None):
     """
     Experiment 3: Comprehensive Logic Gate Test
     Test both architectures on all basic logic gates to validate findings.
+    
+    Args:
+        cache: Optional ResultCache or ExperimentJournal with the runs of previous invocations
     """
     print("\n" + "=" * 80)
     print("EXPERIMENT 3: Comprehensive Logic Gate Comparison")
@@ -272,15 +296,23 @@ def experiment_3_all_logic_gates():
         X, y = generate_logic_gate_data(gate)
         
         # Single-layer perceptron
-        slp = SingleLayerPerceptron(random_seed=42)
-        slp.fit(X, y, epochs=500, verbose=False)
-        slp_acc = evaluate_model(slp, X, y)['accuracy']
+        slp_acc = run_experiment(
+            model_class=SingleLayerPerceptron,
+            model_params={},
+            X_train=X, y_train=y, X_test=X, y_test=y,
+            training_params={'epochs': 500, 'verbose': False},
+            n_runs=1, random_seeds=[42], cache=cache
+        )['accuracies'][0]
         results['single_layer'][gate] = slp_acc
         
         # Multi-layer perceptron
-        mlp = MultiLayerPerceptron([2, 2, 1], random_seed=42)
-        mlp.fit(X, y, epochs=1000, verbose=False)
-        mlp_acc = evaluate_model(mlp, X, y)['accuracy']
+        mlp_acc = run_experiment(
+            model_class=MultiLayerPerceptron,
+            model_params={'layer_sizes': [2, 2, 1]},
+            X_train=X, y_train=y, X_test=X, y_test=y,
+            training_params={'epochs': 1000, 'verbose': False},
+            n_runs=1, random_seeds=[42], cache=cache
+        )['accuracies'][0]
         results['multi_layer'][gate] = mlp_acc
         
         print(f"  Single-Layer: {slp_acc:.2%}, Multi-Layer: {mlp_acc:.2%}")
@@ -332,8 +364,50 @@ limited to linearly separable problems. Multi-layer networks overcome this limit
     return results
 
 
-def main():
+EXPERIMENTS = {
+    'experiment_1': experiment_1_architecture_comparison,
+    'experiment_2': experiment_2_hidden_layer_size,
+    'experiment_3': experiment_3_all_logic_gates
+}
+
+
+def run_journaled_experiment(name, journal_dir, fresh=False):
+    """
+    Run one experiment, journaling every completed run.
+    
+    Runs recorded in the experiment's journal (or in the shared result cache)
+    are reused, so an interrupted experiment resumes where it stopped.
+    
+    Args:
+        name: Key of the experiment in EXPERIMENTS
+        journal_dir: Directory holding one journal file per experiment
+        fresh: Discard the experiment's journal and retrain every run instead of
+            reusing the shared result cache (whose entries are replaced)
+        
+    Returns:
+        Tuple of (experiment results, reused runs, trained runs)
+    """
+    cache = ResultCache('results/cache', max_bytes=256 * 1024 * 1024)
+    journal = ExperimentJournal(os.path.join(journal_dir, f'{name}.jsonl'), name,
+                                cache=cache, fresh=fresh)
+    results = EXPERIMENTS[name](journal)
+    return results, journal.hits, journal.misses
+
+
+def main(argv=None):
     """Run all experiments."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='number of experiments to run concurrently')
+    parser.add_argument('--fresh', action='store_true',
+                        help='retrain every run, ignoring the journals and result cache '
+                             'of previous invocations')
+    parser.add_argument('--journal-dir', default='results/journal',
+                        help='directory of the per-experiment run journals')
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error('--jobs must be at least 1')
+    
     print("\n" + "=" * 80)
     print("PERCEPTRON RESEARCH EXPERIMENTS")
     print(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -343,10 +417,21 @@ def main():
     os.makedirs('experiment-logs', exist_ok=True)
     os.makedirs('results', exist_ok=True)
     
-    # Run experiments
-    exp1_results = experiment_1_architecture_comparison()
-    exp2_results = experiment_2_hidden_layer_size()
-    exp3_results = experiment_3_all_logic_gates()
+    # Run experiments (independent experiments in parallel with --jobs)
+    if args.jobs == 1:
+        outcomes = {name: run_journaled_experiment(name, args.journal_dir, args.fresh)
+                    for name in EXPERIMENTS}
+    else:
+        with ProcessPoolExecutor(max_workers=min(args.jobs, len(EXPERIMENTS)),
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            futures = {name: pool.submit(run_journaled_experiment, name, args.journal_dir,
+                                         args.fresh)
+                       for name in EXPERIMENTS}
+            outcomes = {name: future.result() for name, future in futures.items()}
+    
+    exp1_results, exp2_results, exp3_results = (outcomes[name][0] for name in EXPERIMENTS)
+    reused_runs = sum(outcome[1] for outcome in outcomes.values())
+    trained_runs = sum(outcome[2] for outcome in outcomes.values())
     
     # Save all results
     all_results = {
@@ -393,6 +478,7 @@ functions provide a solution to the XOR problem.
     
     print("\n" + "=" * 80)
     print("EXPERIMENTS COMPLETE")
+    print(f"Runs reused from journals/cache: {reused_runs}, trained: {trained_runs}")
     print("Results saved to experiment-logs/ and results/")
     print("=" * 80)
 
@@ -15,6 +15,13 @@ import seaborn as sns
 from scipy import stats
 from datetime import datetime
 
+# Add implementation directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../03-implementation/perceptron-example'))
+
+from src.results_store import load_results
+from src.resampling import bootstrap_ci, difference_of_means, mean, permutation_test
+from src.power import plan_sample_size, simulate_power
+
 # Configure plotting
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
@@ -26,6 +33,14 @@ def load_experimental_data():
     exp_dir = '../../04-experiments/perceptron-example/results'
     
     try:
+        # Only the per-run columns used by the analysis are memory-mapped
+        return load_results(os.path.join(exp_dir, 'exp1_data'),
+                            columns=['accuracies', 'training_times', 'converged'])
+    except FileNotFoundError:
+        pass
+    
+    try:
+        # Results saved before the columnar store was introduced
         with open(os.path.join(exp_dir, 'exp1_data.json'), 'r') as f:
             exp1_data = json.load(f)
         return exp1_data
@@ -113,12 +128,19 @@ def perform_statistical_tests(data):
     # Mann-Whitney U test (non-parametric alternative)
     u_stat, u_pvalue = stats.mannwhitneyu(mlp_acc, slp_acc, alternative='greater')
     
+    # Permutation test of the mean difference (no distributional assumption;
+    # exact for small samples, Monte Carlo otherwise)
+    permutation = permutation_test(mlp_acc, slp_acc, difference_of_means,
+                                   alternative='greater', n_resamples=100000, random_seed=0)
+    
     # Effect size (Cohen's d)
     pooled_std = np.sqrt((np.var(slp_acc) + np.var(mlp_acc)) / 2)
     cohens_d = (np.mean(mlp_acc) - np.mean(slp_acc)) / pooled_std
     
     print(f"Independent t-test: t={t_stat:.4f}, p={t_pvalue:.6f}")
     print(f"Mann-Whitney U test: U={u_stat:.4f}, p={u_pvalue:.6f}")
+    print(f"Permutation test ({'exact' if permutation['exact'] else 'Monte Carlo'}, "
+          f"{permutation['n_resamples']} reassignments): p={permutation['p_value']:.6f}")
     print(f"Cohen's d (effect size): {cohens_d:.4f}")
     print(f"  → Effect size interpretation: {interpret_cohens_d(cohens_d)}")
     
@@ -137,6 +159,25 @@ def perform_statistical_tests(data):
     print(f"Multi-Layer: [{mlp_ci[0]:.2%}, {mlp_ci[1]:.2%}]")
     print(f"  → CIs do {'NOT ' if slp_ci[1] < mlp_ci[0] else ''}overlap")
     
+    # Bootstrap intervals make no normality assumption, which the bounded,
+    # often tied accuracies violate
+    bootstrap = {
+        'slp': bootstrap_ci([slp_acc], mean, n_resamples=100000, random_seed=0),
+        'mlp': bootstrap_ci([mlp_acc], mean, n_resamples=100000, random_seed=1),
+        'difference': bootstrap_ci([mlp_acc, slp_acc], difference_of_means,
+                                   n_resamples=100000, random_seed=2),
+        'difference_percentile': bootstrap_ci([mlp_acc, slp_acc], difference_of_means,
+                                              method='percentile', n_resamples=100000,
+                                              random_seed=2)
+    }
+    print("Bootstrap (BCa, 100,000 resamples):")
+    print(f"  Single-Layer: [{bootstrap['slp']['low']:.2%}, {bootstrap['slp']['high']:.2%}]")
+    print(f"  Multi-Layer: [{bootstrap['mlp']['low']:.2%}, {bootstrap['mlp']['high']:.2%}]")
+    print(f"  Difference (MLP - SLP): [{bootstrap['difference']['low']:.2%}, "
+          f"{bootstrap['difference']['high']:.2%}] "
+          f"(percentile: [{bootstrap['difference_percentile']['low']:.2%}, "
+          f"{bootstrap['difference_percentile']['high']:.2%}])")
+    
     # 4. Power Analysis
     print("\n4. STATISTICAL POWER ANALYSIS")
     print("-" * 40)
@@ -156,13 +197,34 @@ def perform_statistical_tests(data):
     print(f"Achieved statistical power: {achieved_power:.2%}")
     print(f"  → Power interpretation: {interpret_power(achieved_power)}")
     
+    # Simulated from the observed accuracies rather than a normal approximation,
+    # and used to plan how many seeds the next experiment needs
+    simulated_power = float(simulate_power(mlp_acc, slp_acc, [n], alpha=alpha,
+                                           random_seed=0)['power'][0])
+    plan = plan_sample_size(mlp_acc, slp_acc, target_power=0.8, alpha=alpha, random_seed=0)
+    threshold_plan = plan_sample_size(mlp_acc, threshold=0.9, target_power=0.8, alpha=alpha,
+                                      random_seed=0)
+    print(f"Simulated power (Welch t-test, 4000 virtual experiments): {simulated_power:.2%}")
+    
+    def recommendation(plan):
+        if plan['n_runs'] is None:
+            return "more than 100 runs"
+        return f"{plan['n_runs']} runs (power {plan['power']:.2%})"
+    
+    print(f"Runs per architecture for 80% power, MLP > SLP: {recommendation(plan)}")
+    print(f"Runs for 80% power, MLP mean accuracy > 90%: {recommendation(threshold_plan)}")
+    
     return {
         'normality': {'slp': slp_normality, 'mlp': mlp_normality},
         't_test': {'statistic': t_stat, 'p_value': t_pvalue},
         'mann_whitney': {'statistic': u_stat, 'p_value': u_pvalue},
+        'permutation': permutation,
+        'bootstrap': bootstrap,
         'effect_size': cohens_d,
         'confidence_intervals': {'slp': slp_ci, 'mlp': mlp_ci},
-        'power': achieved_power
+        'power': achieved_power,
+        'simulated_power': simulated_power,
+        'sample_size_plan': {'comparison': plan, 'mlp_above_90': threshold_plan}
     }
 
 
@@ -223,7 +285,7 @@ def create_comprehensive_visualizations(data):
     # 2. Violin plots
     ax2 = plt.subplot(2, 3, 2)
     df = pd.DataFrame({
-        'Accuracy': slp_acc + mlp_acc,
+        'Accuracy': np.concatenate([slp_acc, mlp_acc]),
         'Model': ['Single-Layer'] * len(slp_acc) + ['Multi-Layer'] * len(mlp_acc)
     })
     sns.violinplot(data=df, x='Model', y='Accuracy', ax=ax2, palette=['lightcoral', 'lightgreen'])